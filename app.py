@@ -1,38 +1,670 @@
-import argparse
+import time
 
-import cv2
+_STARTED = time.perf_counter()
 
-from observer.activity import ActivityTracker
-from observer.constants import (
+import argparse  # noqa: E402
+import datetime  # noqa: E402
+from typing import Optional  # noqa: E402
+
+# OpenCV, MediaPipe and the camera/video modules are imported by the commands
+# that use them, so replay, train, report and the tests start in milliseconds.
+from observer.activity import ActivityTracker, format_seconds  # noqa: E402
+from observer.constants import (  # noqa: E402
     ACTIVITY_BY_GESTURE,
     GESTURE_ILY,
     GESTURE_ONE_FINGER,
     GESTURE_OPEN_PALM,
     GESTURE_TWO_FINGERS,
 )
-from observer.gates import GestureHoldGate
-from observer.runtime import HAS_SOLUTIONS, run_with_solutions, run_with_tasks
+from observer.eventlog import EventLog  # noqa: E402
+from observer.filters import LANDMARK_FILTERS, make_landmark_filter  # noqa: E402
+from observer.gates import SMOOTHING_STRATEGIES, GestureHoldGate, make_smoother  # noqa: E402
+from observer.hands import HandRegistry  # noqa: E402
+from observer.history import HistoryStore  # noqa: E402
+from observer.learned import (  # noqa: E402
+    evaluate,
+    load_classifier,
+    load_labeled_recordings,
+    train_classifier,
+)
+from observer.metrics import LatencyMetrics, StartupReport  # noqa: E402
+from observer.recording import LandmarkRecorder, open_recording  # noqa: E402
+from observer.replay import replay_recording  # noqa: E402
+from observer.roi import RoiTracker  # noqa: E402
+from observer.rules import load_rules  # noqa: E402
+from observer.scheduler import InferenceScheduler, SchedulerPolicy  # noqa: E402
+from observer.service import EventService  # noqa: E402
+from observer.sinks import SinkDispatcher, parse_sink  # noqa: E402
 
 
-def main() -> None:
+def _add_smoothing_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--rules",
+        metavar="PATH",
+        help="Gesture rule file (JSON) replacing the built-in gestures and activities.",
+    )
+    parser.add_argument(
+        "--classifier",
+        metavar="PATH",
+        help="Learned gesture model (from the train subcommand) used instead of the rules' "
+        "checks; the rules still map gestures to activities.",
+    )
+    parser.add_argument(
+        "--smoothing",
+        choices=SMOOTHING_STRATEGIES,
+        default="count",
+        help="Gesture vote: fixed-window count, confidence-weighted, or exponentially decayed.",
+    )
+    parser.add_argument(
+        "--smoothing-window",
+        type=_window_size,
+        default=7,
+        metavar="FRAMES",
+        help="Vote window in frames (sets the half-life for --smoothing decay).",
+    )
+    parser.add_argument(
+        "--landmark-filter",
+        choices=LANDMARK_FILTERS,
+        default="none",
+        help="Temporal filter applied to landmarks before classification and the palm check.",
+    )
+    parser.add_argument(
+        "--hold-seconds",
+        type=float,
+        default=1.5,
+        metavar="SECONDS",
+        help="How long a smoothed gesture must hold before it switches the activity.",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser()
     parser.add_argument("--camera-index", type=int, default=0)
+    parser.add_argument(
+        "--cameras",
+        type=int,
+        nargs="+",
+        metavar="INDEX",
+        help="Watch several cameras headlessly, one supervised worker process per index.",
+    )
+    parser.add_argument(
+        "--status-interval",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="With --cameras: how often to print per-camera status and combined totals.",
+    )
     parser.add_argument("--model-path", default="models/hand_landmarker.task")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--threaded",
+        action="store_true",
+        help="Run capture, inference and rendering on separate threads.",
+    )
+    parser.add_argument(
+        "--live-stream",
+        action="store_true",
+        help="Tasks backend only: use LIVE_STREAM mode with asynchronous detection.",
+    )
+    parser.add_argument(
+        "--capture-size",
+        type=_capture_size,
+        metavar="WxH",
+        help="Ask the camera for this resolution, e.g. 640x480 (default: driver default).",
+    )
+    parser.add_argument(
+        "--capture-fps", type=float, metavar="FPS", help="Ask the camera for this frame rate."
+    )
+    parser.add_argument(
+        "--fourcc",
+        metavar="CODE",
+        help="Ask the camera for this pixel format, e.g. MJPG (set before size and rate).",
+    )
+    parser.add_argument(
+        "--capture-buffer",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Frames the camera driver may queue (default 1; not every backend honours it).",
+    )
+    parser.add_argument(
+        "--no-drain",
+        action="store_true",
+        help="Read queued camera frames in order instead of skipping to the newest.",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const="127.0.0.1:8765",
+        metavar="ADDRESS",
+        help="Run headless and serve /snapshot and an /events stream on HOST:PORT or "
+        "unix:PATH (default 127.0.0.1:8765).",
+    )
+    parser.add_argument(
+        "--sink",
+        action="append",
+        default=[],
+        metavar="SPEC",
+        help="Send activity switches and periodic totals to file:PATH, socket:ADDRESS, "
+        "webhook:URL or notify[:COMMAND]; repeatable.",
+    )
+    parser.add_argument(
+        "--tick-seconds",
+        type=float,
+        default=60.0,
+        help="Interval of the running-totals tick events sent to --sink targets.",
+    )
+    parser.add_argument(
+        "--from-recording",
+        metavar="PATH",
+        help="Feed a landmark recording through the live engine at recorded speed instead of "
+        "a camera (headless; combine with --serve, --event-log or --metrics).",
+    )
+    parser.add_argument(
+        "--hands",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Track up to N hands, each with its own gestures, gates and activity timers.",
+    )
+    parser.add_argument(
+        "--roi",
+        action="store_true",
+        help="Crop and downscale around the last detected hand before inference.",
+    )
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Throttle inference when no hand is visible or the activity is steady.",
+    )
+    parser.add_argument(
+        "--probe-hz",
+        type=float,
+        default=2.0,
+        help="Adaptive mode: inference rate while no hand is visible.",
+    )
+    parser.add_argument(
+        "--steady-hz",
+        type=float,
+        default=4.0,
+        help="Adaptive mode: inference rate while nothing would change the activity.",
+    )
+    parser.add_argument(
+        "--steady-after",
+        type=float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Adaptive mode: seconds without a pending switch before dropping to --steady-hz.",
+    )
+    _add_smoothing_arguments(parser)
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Write timestamped landmark frames to a recording file for later replay.",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Record per-stage latency and show p50/p95/p99 on the HUD.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Append periodic latency stats as JSON lines (implies --metrics).",
+    )
+    parser.add_argument(
+        "--event-log",
+        metavar="PATH",
+        help="Append activity switches to a durable JSONL log and restore totals from it.",
+    )
+    parser.add_argument(
+        "--history",
+        metavar="PATH",
+        help="Add sessions to this report store as they close (needs --event-log).",
+    )
+    parser.add_argument("--metrics-interval", type=float, default=10.0, metavar="SECONDS")
+    parser.add_argument(
+        "--latency-alert-ms",
+        type=float,
+        default=None,
+        help="Print an ALERT when end-to-end p95 latency exceeds this value.",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    replay_parser = subparsers.add_parser(
+        "replay", help="Run the gate/activity stack over a landmark recording."
+    )
+    replay_parser.add_argument("recording")
+    _add_smoothing_arguments(replay_parser)
+
+    train_parser = subparsers.add_parser(
+        "train", help="Train a learned gesture classifier from labeled landmark recordings."
+    )
+    train_parser.add_argument(
+        "recordings",
+        nargs="+",
+        metavar="LABEL=PATH",
+        help="A recording holding one gesture, e.g. ILY_SIGN=sessions/ily.obsrec; "
+        "label hands showing no gesture as none.",
+    )
+    train_parser.add_argument("--out", default="models/gestures.npz", help="Model output path.")
+    train_parser.add_argument("--rules", metavar="PATH", help="Rule file defining the gestures.")
+    train_parser.add_argument("--hidden", type=int, default=32, help="Hidden layer width.")
+    train_parser.add_argument("--epochs", type=int, default=60)
+    train_parser.add_argument(
+        "--holdout",
+        type=float,
+        default=0.2,
+        help="Fraction at the end of each recording kept out of training for evaluation.",
+    )
+    train_parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=0.6,
+        help="Report no gesture when the best class scores below this probability.",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "batch", help="Score video files headlessly across a process pool."
+    )
+    batch_parser.add_argument("paths", nargs="+", help="Video files or directories.")
+    batch_parser.add_argument("--out", default="batch_results", help="Output directory.")
+    batch_parser.add_argument("--workers", type=int, default=None)
+    batch_parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=300.0,
+        help="Split long videos into chunks of this length (0 disables chunking).",
+    )
+    batch_parser.add_argument("--model-path", default="models/hand_landmarker.task")
+
+    report_parser = subparsers.add_parser(
+        "report", help="Query activity history by day or hour from the indexed store."
+    )
+    report_parser.add_argument("--history", default="logs/history.sqlite", metavar="PATH")
+    report_parser.add_argument(
+        "--event-log",
+        metavar="PATH",
+        help="Ingest new sessions from this event log before querying.",
+    )
+    report_parser.add_argument("--from", dest="first", metavar="YYYY-MM-DD")
+    report_parser.add_argument("--to", dest="last", metavar="YYYY-MM-DD")
+    report_parser.add_argument("--activity", default=None)
+    report_parser.add_argument("--by", choices=("day", "hour"), default="day")
+    return parser
+
+
+def run_replay(
+    recording_path: str,
+    smoother=None,
+    rules=None,
+    landmark_filter=None,
+    hold_seconds: float = 1.5,
+    classifier=None,
+) -> None:
+    recording = open_recording(recording_path)
+    start = recording.frames["t"][0] if len(recording) else 0.0
+
+    def on_switch(now: float, activity: Optional[str]) -> None:
+        stamp = format_seconds(now - start)
+        print(f"[{stamp}] {'STOPPED' if activity is None else f'ACTIVE: {activity}'}")
+
+    began = time.perf_counter()
+    result = replay_recording(
+        recording,
+        smoother=smoother,
+        hold_gate=GestureHoldGate(hold_seconds),
+        on_switch=on_switch,
+        rules=load_classifier(load_rules(rules), classifier),
+        landmark_filter=landmark_filter,
+    )
+    elapsed = time.perf_counter() - began
+    for activity, seconds in result.totals.items():
+        print(f"{activity}: {format_seconds(seconds)}")
+    print(
+        f"Replayed {result.frames} frames ({format_seconds(result.duration)} recorded) "
+        f"in {elapsed:.3f}s"
+    )
+
+
+def _window_size(value: str) -> int:
+    window = int(value)
+    if window < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1 frame, got {window}")
+    return window
+
+
+def _capture_size(value: str) -> tuple[int, int]:
+    width, sep, height = value.lower().partition("x")
+    if not sep or not width.isdigit() or not height.isdigit():
+        raise ValueError(f"Expected WIDTHxHEIGHT, got {value!r}")
+    return int(width), int(height)
+
+
+def _capture_settings(args: argparse.Namespace):
+    from observer.capture import CaptureSettings
+
+    width, height = args.capture_size or (None, None)
+    return CaptureSettings(
+        width,
+        height,
+        args.capture_fps,
+        args.fourcc,
+        args.capture_buffer,
+        drain=not args.no_drain,
+    )
+
+
+def _labeled_path(value: str) -> tuple[str, str]:
+    label, sep, path = value.partition("=")
+    if not sep or not label or not path:
+        raise ValueError(f"Expected LABEL=PATH, got {value!r}")
+    return label, path
+
+
+def run_train(args: argparse.Namespace) -> None:
+    rules = load_rules(args.rules)
+    labeled = [_labeled_path(value) for value in args.recordings]
+    (points, labels), (test_points, test_labels) = load_labeled_recordings(labeled, args.holdout)
+    began = time.perf_counter()
+    model = train_classifier(
+        points,
+        labels,
+        rules,
+        hidden=args.hidden,
+        epochs=args.epochs,
+        min_confidence=args.min_confidence,
+    )
+    print(f"Trained on {len(points)} hands in {time.perf_counter() - began:.1f}s")
+    model.save(args.out)
+    print(f"Saved {args.out} (classes: {', '.join(model.classes)})")
+    if not test_labels:
+        return
+    for name, classifier in (("learned", model), ("rules", rules)):
+        result = evaluate(classifier, test_points, test_labels)
+        per_label = "  ".join(f"{k}={v:.1%}" for k, v in result["per_label"].items())
+        print(f"{name:<8} accuracy {result['accuracy']:.1%} on {result['frames']} held-out hands")
+        print(f"         {per_label}")
+
 
-    cap = cv2.VideoCapture(args.camera_index)
-    if not cap.isOpened():
-        raise RuntimeError(
-            f"Could not open camera index {args.camera_index}. Try --camera-index 1/2/3."
+def run_batch(args: argparse.Namespace) -> None:
+    from observer.batch import process_videos
+
+    summaries = process_videos(
+        args.paths,
+        args.out,
+        args.model_path,
+        workers=args.workers,
+        chunk_seconds=args.chunk_seconds,
+    )
+    combined: dict[str, float] = {}
+    for summary in summaries.values():
+        for activity, seconds in summary["totals"].items():
+            combined[activity] = combined.get(activity, 0.0) + seconds
+    print(f"Processed {len(summaries)} videos -> {args.out}")
+    for activity, seconds in combined.items():
+        print(f"{activity}: {format_seconds(seconds)}")
+
+
+def run_report(args: argparse.Namespace) -> None:
+    today = datetime.date.today()
+    first = args.first or today.replace(day=1).isoformat()
+    last = args.last or today.isoformat()
+    with HistoryStore(args.history) as store:
+        if args.event_log:
+            added = store.ingest_event_log(args.event_log)
+            print(f"Ingested {added} sessions from {args.event_log}")
+        began = time.perf_counter()
+        if args.by == "hour":
+            rows = store.hourly(f"{first}T00", f"{last}T23", args.activity)
+        else:
+            rows = store.daily(first, last, args.activity)
+        totals = store.totals(first, last)
+        activities = [args.activity] if args.activity else list(totals)
+        longest = {activity: store.longest_session(activity) for activity in activities}
+        streaks = {activity: store.longest_streak(activity) for activity in activities}
+        elapsed = time.perf_counter() - began
+
+    for bucket, activity, seconds in rows:
+        print(f"{bucket}  {activity:<10} {format_seconds(seconds)}")
+    print(f"Totals {first} .. {last}:")
+    for activity in activities:
+        print(f"  {activity}: {format_seconds(totals.get(activity, 0.0))}")
+    for activity in activities:
+        if longest[activity] is not None:
+            start, end = longest[activity]
+            began_at = datetime.datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:%M")
+            print(f"Longest {activity} session: {format_seconds(end - start)} from {began_at}")
+        if streaks[activity] is not None:
+            streak_first, streak_last, days = streaks[activity]
+            print(f"Longest {activity} streak: {days} days ({streak_first} .. {streak_last})")
+    print(f"Query took {elapsed * 1000.0:.1f}ms")
+
+
+def run_cameras(args: argparse.Namespace, capture) -> None:
+    from observer.sources import check_model_file, has_solutions
+    from observer.supervisor import CameraSupervisor
+
+    if not has_solutions():
+        # Fail here with a readable message instead of a restart loop.
+        check_model_file(args.model_path)
+
+    def on_event(camera: int, message: tuple) -> None:
+        kind = message[0]
+        if kind == "switch":
+            current = message[4]
+            state = "STOPPED" if current is None else f"ACTIVE: {current}"
+            print(f"CAMERA {camera} {state}", flush=True)
+        elif kind == "ready":
+            print(f"CAMERA {camera} ready", flush=True)
+        elif kind == "restart":
+            print(f"CAMERA {camera} worker exited ({message[3]}); restarting", flush=True)
+
+    supervisor = CameraSupervisor(
+        args.cameras,
+        args.model_path,
+        rules=args.rules,
+        classifier=args.classifier,
+        smoothing=args.smoothing,
+        smoothing_window=args.smoothing_window,
+        landmark_filter=args.landmark_filter,
+        hold_seconds=args.hold_seconds,
+        capture=capture,
+        on_event=on_event,
+    )
+    supervisor.start()
+    next_status = time.monotonic() + args.status_interval
+    try:
+        while True:
+            supervisor.poll()
+            if time.monotonic() >= next_status:
+                for line in supervisor.status_lines():
+                    print(line, flush=True)
+                next_status += args.status_interval
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+    for activity, seconds in supervisor.totals().items():
+        print(f"{activity}: {format_seconds(seconds)}")
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.command == "replay":
+        run_replay(
+            args.recording,
+            make_smoother(args.smoothing, args.smoothing_window),
+            args.rules,
+            make_landmark_filter(args.landmark_filter),
+            args.hold_seconds,
+            args.classifier,
         )
+        return
+    if args.command == "train":
+        try:
+            run_train(args)
+        except ValueError as exc:
+            parser.error(str(exc))
+        return
+    if args.command == "batch":
+        run_batch(args)
+        return
+    if args.command == "report":
+        run_report(args)
+        return
 
     try:
-        if HAS_SOLUTIONS:
-            run_with_solutions(cap)
-        else:
-            run_with_tasks(cap, args.model_path)
+        capture = _capture_settings(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.cameras:
+        if args.sink:
+            parser.error("--sink follows one activity stream and cannot be used with --cameras")
+        run_cameras(args, capture)
+        return
+    if args.hands < 1:
+        parser.error("--hands must be at least 1")
+    if args.from_recording:
+        for flag, value in (("--roi", args.roi), ("--threaded", args.threaded)):
+            if value:
+                parser.error(f"{flag} needs camera frames and cannot be used with --from-recording")
+    if args.hands > 1:
+        for flag, value in (("--roi", args.roi), ("--record", args.record)):
+            if value:
+                parser.error(f"{flag} follows a single hand and cannot be used with --hands")
+        if args.event_log:
+            parser.error("--event-log records one activity stream and cannot be used with --hands")
+        if args.serve:
+            parser.error("--serve publishes one activity stream and cannot be used with --hands")
+        if args.sink:
+            parser.error("--sink follows one activity stream and cannot be used with --hands")
+    if args.history and not args.event_log:
+        parser.error("--history reads sessions from --event-log; pass both")
+    if args.tick_seconds <= 0:
+        parser.error("--tick-seconds must be positive")
+    for flag, value in (("--probe-hz", args.probe_hz), ("--steady-hz", args.steady_hz)):
+        if value <= 0:
+            parser.error(f"{flag} must be positive")
+    try:
+        sinks = [parse_sink(spec) for spec in args.sink]
+    except (ValueError, OSError) as exc:
+        parser.error(str(exc))
+
+    import cv2
+
+    from observer.capture import open_camera
+    from observer.engine import FrameEngine, RuntimeConfig
+    from observer.sources import RecordingSource, make_source
+
+    startup = StartupReport(_STARTED)
+    startup.mark("imports")
+    service = None
+    if args.serve:
+        try:
+            service = EventService(args.serve)
+        except ValueError as exc:
+            parser.error(str(exc))
+        service.start()
+        print(f"Serving events on {service.url} (GET /snapshot, GET /events)", flush=True)
+    dispatcher = SinkDispatcher(sinks, tick_seconds=args.tick_seconds) if sinks else None
+
+    recorder = LandmarkRecorder(args.record) if args.record else None
+    metrics = None
+    if args.metrics or args.metrics_file:
+        metrics = LatencyMetrics(
+            report_interval=args.metrics_interval,
+            metrics_file=args.metrics_file,
+            alert_ms=args.latency_alert_ms,
+        )
+    event_log = None
+    if args.event_log:
+        event_log = EventLog(args.event_log, history_path=args.history)
+    rules = load_classifier(load_rules(args.rules), args.classifier)
+    roi = RoiTracker() if args.roi else None
+    hands = None
+    if args.hands > 1:
+        hands = HandRegistry(
+            args.hands,
+            rules,
+            smoother_factory=lambda: make_smoother(args.smoothing, args.smoothing_window),
+            hold_seconds=args.hold_seconds,
+            filter_factory=lambda: make_landmark_filter(args.landmark_filter),
+        )
+    scheduler = None
+    if args.adaptive:
+        scheduler = InferenceScheduler(
+            SchedulerPolicy(
+                probe_interval=1.0 / args.probe_hz,
+                steady_interval=1.0 / args.steady_hz,
+                steady_after=args.steady_after,
+            )
+        )
+    if event_log is not None:
+        recovered = event_log.recovered
+        if recovered.dangling is not None:
+            print(f"Recovered unfinished {recovered.dangling} session from {args.event_log}")
+        for activity, seconds in recovered.totals.items():
+            print(f"Restored {activity}: {format_seconds(seconds)}")
+    config = RuntimeConfig(
+        threaded=args.threaded,
+        recorder=recorder,
+        metrics=metrics,
+        event_log=event_log,
+        roi=roi,
+        scheduler=scheduler,
+        smoother=make_smoother(args.smoothing, args.smoothing_window),
+        rules=rules,
+        hands=hands,
+        service=service,
+        landmark_filter=make_landmark_filter(args.landmark_filter),
+        hold_seconds=args.hold_seconds,
+        startup=startup,
+        sinks=dispatcher,
+    )
+    if args.from_recording:
+        engine = FrameEngine(RecordingSource(args.from_recording, realtime=True), config)
+    else:
+        source = make_source(args.model_path, config.max_hands, args.live_stream)
+        engine = FrameEngine(source, config)
+        # The MediaPipe import, model load and warm-up overlap with opening the camera.
+        engine.load(background=True)
+    cap = None
+    try:
+        if not args.from_recording:
+            cap = open_camera(args.camera_index, capture)
+            if not cap.isOpened():
+                raise RuntimeError(
+                    f"Could not open camera index {args.camera_index}. Try --camera-index 1/2/3."
+                )
+            print(cap.describe(), flush=True)
+            startup.mark("camera")
+        engine.run(cap)
+    except KeyboardInterrupt:
+        pass
     finally:
-        cap.release()
+        if service is not None:
+            service.close()
+        if dispatcher is not None:
+            dispatcher.close()
+            # After close, so sinks that timed out are reported as such.
+            print(dispatcher.summary(), flush=True)
+        if event_log is not None:
+            event_log.close()
+            if event_log.error is not None:
+                print(
+                    f"Event log stopped: {event_log.error} ({event_log.lost} switches not written)",
+                    flush=True,
+                )
+            if event_log.history_error is not None:
+                print(f"History not updated: {event_log.history_error}", flush=True)
+        if recorder is not None:
+            recorder.close()
+        if metrics is not None:
+            metrics.close()
+        if cap is not None:
+            cap.release()
         cv2.destroyAllWindows()
 
 
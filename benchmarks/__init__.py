@@ -0,0 +1 @@
+"""Micro-benchmarks for the per-frame hot path."""
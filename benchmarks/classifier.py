@@ -0,0 +1,96 @@
+"""Compare the learned gesture classifier with the rule engine: accuracy and latency.
+
+Usage:
+    python -m benchmarks.classifier
+    python -m benchmarks.classifier --model models/gestures.npz \\
+        --test ILY_SIGN=sessions/ily.obsrec none=sessions/idle.obsrec
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from benchmarks.fixtures import Landmark, labeled_hands
+from observer.learned import LearnedClassifier, evaluate, load_labeled_recordings, train_classifier
+from observer.rules import DEFAULT_RULESET, load_rules
+
+# Hand size relative to the fixtures (palm length 0.25 of the frame width).
+SCALE_BANDS = ((0.5, 0.75), (0.75, 1.0), (1.0, 1.25), (1.25, 1.5))
+
+
+def time_per_frame(detect, frames: list, number: int = 20000) -> float:
+    """Median microseconds per call over three runs."""
+    samples = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for i in range(number):
+            detect(frames[i % len(frames)])
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return sorted(samples)[1]
+
+
+def compare_synthetic(model: Optional[LearnedClassifier] = None, count: int = 1024) -> list[tuple]:
+    """``(band, rules accuracy, learned accuracy)`` per hand-size band on fresh hands."""
+    if model is None:
+        model = train_classifier(*labeled_hands(4096, seed=0))
+    rows = []
+    for low, high in SCALE_BANDS:
+        points, labels = labeled_hands(count, seed=1, scales=(low, high))
+        rules = evaluate(DEFAULT_RULESET, points, labels)["accuracy"]
+        rows.append((f"{low:.2f}-{high:.2f}", rules, evaluate(model, points, labels)["accuracy"]))
+    return rows
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", help="Trained model; by default one is trained on fixtures.")
+    parser.add_argument("--rules", metavar="PATH")
+    parser.add_argument(
+        "--test", nargs="+", metavar="LABEL=PATH", help="Labeled recordings to evaluate on."
+    )
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules)
+    if args.model:
+        model = LearnedClassifier.load(args.model, rules)
+    else:
+        model = train_classifier(*labeled_hands(4096, seed=0), rules)
+
+    if args.test:
+        labeled = [tuple(value.split("=", 1)) for value in args.test]
+        _, (points, labels) = load_labeled_recordings(labeled, holdout=1.0)
+        print(f"{'classifier':<10}{'accuracy':>10}  per label")
+        for name, classifier in (("rules", rules), ("learned", model)):
+            result = evaluate(classifier, points, labels)
+            per_label = "  ".join(f"{k}={v:.1%}" for k, v in result["per_label"].items())
+            print(f"{name:<10}{result['accuracy']:>10.1%}  {per_label}")
+    else:
+        points, labels = labeled_hands(1024, seed=1)
+        print(f"{'hand size':<12}{'rules':>10}{'learned':>10}")
+        for band, rule_accuracy, learned_accuracy in compare_synthetic(model):
+            print(f"{band:<12}{rule_accuracy:>10.1%}{learned_accuracy:>10.1%}")
+
+    frames = [[Landmark(*map(float, p)) for p in hand] for hand in points[:256]]
+    arrays = [np.asarray(hand) for hand in points[:256]]
+    print()
+    print(f"{'latency':<28}{'us/frame':>10}")
+    for name, detect, inputs in (
+        ("rules.detect", rules.detect, frames),
+        ("rules.classify", rules.classify, frames),
+        ("learned.detect", model.detect, frames),
+        ("learned.classify", model.classify, frames),
+        ("learned.classify[array]", model.classify, arrays),
+    ):
+        print(f"{name:<28}{time_per_frame(detect, inputs):>10.1f}")
+    start = time.perf_counter()
+    model.detect_batch(points)
+    batch = (time.perf_counter() - start) / len(points) * 1e6
+    print(f"{'learned.detect_batch':<28}{batch:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import itertools
+
+import numpy as np
+
+from observer.gestures import detect_gesture, landmarks_to_array
+from observer.recording import open_recording
+from observer.synthetic import THUMB_POSITIONS, pose_array
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float, y: float, z: float = 0.0) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+def make_pose(index: bool, middle: bool, ring: bool, pinky: bool, thumb: str) -> list[Landmark]:
+    """Build a synthetic hand with the same geometry as the unit-test fixtures."""
+    return [Landmark(*p) for p in pose_array(index, middle, ring, pinky, thumb).tolist()]
+
+
+def synthetic_frames(count: int = 256, seed: int = 0) -> list[list[Landmark]]:
+    """Every finger/thumb combination with small jitter, cycled to ``count`` frames."""
+    rng = np.random.default_rng(seed)
+    poses = [
+        landmarks_to_array(make_pose(*ups, thumb))
+        for ups in itertools.product((True, False), repeat=4)
+        for thumb in THUMB_POSITIONS
+    ]
+    frames = []
+    for i in range(count):
+        jittered = poses[i % len(poses)] + rng.normal(0.0, 0.005, (21, 3))
+        frames.append([Landmark(*map(float, p)) for p in jittered])
+    return frames
+
+
+def recorded_frames(path: str, count: int = 256) -> list[list[Landmark]]:
+    """Hand-present frames from a landmark recording, evenly sampled."""
+    recording = open_recording(path)
+    hands = recording.frames["landmarks"][recording.frames["present"] == 1]
+    if len(hands) == 0:
+        raise ValueError(f"{path}: recording has no hand-present frames")
+    picks = np.linspace(0, len(hands) - 1, num=min(count, len(hands))).astype(int)
+    return [[Landmark(*map(float, p)) for p in hands[i]] for i in picks]
+
+
+def labeled_hands(
+    count: int = 2048,
+    seed: int = 0,
+    scales: tuple[float, float] = (0.5, 1.5),
+    max_rotation: float = 15.0,
+    jitter: float = 0.004,
+) -> tuple[np.ndarray, list]:
+    """Labeled ``(count, 21, 3)`` hands at varied size, position and tilt.
+
+    Each hand is one of the finger/thumb combinations, scaled about the wrist
+    by a factor drawn from ``scales`` (hand size and distance to the camera),
+    rotated by up to ``max_rotation`` degrees, shifted and jittered. Its label
+    is what the default rules say about the untransformed pose, so rule
+    accuracy drops only where the fixed thresholds stop matching the geometry.
+    """
+    rng = np.random.default_rng(seed)
+    templates = [
+        make_pose(*ups, thumb)
+        for ups in itertools.product((True, False), repeat=4)
+        for thumb in THUMB_POSITIONS
+    ]
+    poses = np.stack([landmarks_to_array(p) for p in templates]).astype(np.float64)
+    names = [detect_gesture(p) for p in templates]
+    picks = rng.integers(0, len(poses), count)
+    scale = rng.uniform(*scales, count)
+    angle = np.radians(rng.uniform(-max_rotation, max_rotation, count))
+    cos, sin = np.cos(angle), np.sin(angle)
+    rotation = np.stack([np.stack([cos, -sin], -1), np.stack([sin, cos], -1)], -2)
+
+    centered = poses[picks] - poses[picks, :1, :]
+    hands = np.empty_like(centered)
+    hands[..., :2] = np.einsum("nij,nkj->nki", rotation, centered[..., :2])
+    hands[..., 2] = centered[..., 2]
+    hands *= scale[:, None, None]
+    wrist = np.stack([rng.uniform(0.35, 0.65, count), rng.uniform(0.7, 0.9, count)], -1)
+    hands[..., :2] += wrist[:, None, :]
+    hands += rng.normal(0.0, 1.0, hands.shape) * (jitter * scale)[:, None, None]
+    return hands.astype(np.float32), [names[i] for i in picks.tolist()]
@@ -0,0 +1,318 @@
+"""Time each per-frame stage in isolation and as a full loop.
+
+Usage:
+    python -m benchmarks.hot_path --out bench.json
+    python -m benchmarks.hot_path --recording sessions/desk.obsrec --compare bench.json
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from benchmarks.fixtures import labeled_hands, recorded_frames, synthetic_frames
+from observer.activity import ActivityTracker
+from observer.capture import CaptureStats
+from observer.constants import GESTURE_ILY, GESTURE_ONE_FINGER, GESTURE_OPEN_PALM
+from observer.engine import FrameEngine
+from observer.filters import KalmanLandmarkFilter, OneEuroFilter, filter_landmarks
+from observer.frames import FramePool
+from observer.gates import (
+    DecayedGestureSmoother,
+    GestureHoldGate,
+    GestureSmoother,
+    WeightedGestureSmoother,
+)
+from observer.gestures import (
+    classify_landmarks,
+    detect_gesture,
+    gesture_checklines,
+    landmarks_to_array,
+    outside_of_hand_showing,
+)
+from observer.hands import HandObservation, HandRegistry
+from observer.learned import train_classifier
+from observer.roi import Point
+from observer.sinks import EventSink, SinkDispatcher
+from observer.sources import SyntheticSource
+from observer.ui import HudRenderer, draw_gesture_debug, draw_hud
+
+
+class _NullSink(EventSink):
+    def write(self, events: list[dict]) -> None:
+        pass
+
+
+class Case:
+    """A benchmark body called once per op with a rotating op index."""
+
+    def __init__(self, name: str, body: Callable[[int], object]) -> None:
+        self.name = name
+        self.body = body
+
+
+def build_cases(frames: list, frame_shape=(720, 1280, 3)) -> list[Case]:
+    arrays = [landmarks_to_array(f) for f in frames]
+    n = len(frames)
+    gestures = [detect_gesture(f) for f in frames]
+    stream = [GESTURE_ILY] * 6 + [None] + [GESTURE_ONE_FINGER] * 6 + [GESTURE_OPEN_PALM]
+    smoother = GestureSmoother()
+    wide_smoother = GestureSmoother(window=61, min_count=44)
+    weighted_smoother = WeightedGestureSmoother()
+    decayed_smoother = DecayedGestureSmoother()
+    hold_gate = GestureHoldGate(1.5)
+    one_euro = OneEuroFilter()
+    kalman = KalmanLandmarkFilter()
+    tracker = ActivityTracker()
+    tracker.apply_gesture(GESTURE_ILY, 0.0)
+    canvas = np.zeros(frame_shape, dtype=np.uint8)
+    debug_lines = gesture_checklines(frames[0])
+    renderer = HudRenderer()
+    camera = np.random.default_rng(0).integers(0, 256, frame_shape, dtype=np.uint8)
+    pool = FramePool()
+    capture_stats = CaptureStats()
+    dispatcher = SinkDispatcher([_NullSink()])
+    # Latency does not depend on how well the model is trained; keep setup short.
+    learned = train_classifier(*labeled_hands(1024), epochs=5)
+
+    def frame_prep_copy(i: int):
+        # Before the pool: mirror the pixels, then convert the mirrored copy for the model.
+        mirrored = cv2.flip(camera, 1)
+        return mirrored, cv2.cvtColor(mirrored, cv2.COLOR_BGR2RGB)
+
+    loop_smoother = GestureSmoother()
+    loop_gate = GestureHoldGate(1.5)
+    loop_tracker = ActivityTracker()
+    loop_hud = HudRenderer()
+
+    def hand_frames(count: int) -> list[list[HandObservation]]:
+        # ``count`` copies of each frame spread across the image, one per person.
+        offsets = [0.8 * (k + 0.5) / count - 0.4 for k in range(count)]
+        return [
+            [
+                HandObservation([Point(lm.x + dx, lm.y, lm.z) for lm in landmarks], "Left")
+                for dx in offsets
+            ]
+            for landmarks in frames
+        ]
+
+    def hands_case(count: int) -> Case:
+        registry = HandRegistry(max_hands=count)
+        observations = hand_frames(count)
+        return Case(
+            f"HandRegistry.update[{count}]",
+            lambda i: registry.update(observations[i % n], i / 30.0),
+        )
+
+    # The engine's own frame path on a camera-free source; switches print, so hold
+    # one pose and keep the clock moving forward across repeats.
+    engine = FrameEngine(SyntheticSource([arrays[0]]))
+    engine_frames = hand_frames(1)
+    engine_ticks = itertools.count()
+
+    def engine_frame(i: int) -> None:
+        engine.process_observations(engine_frames[0], next(engine_ticks) / 30.0)
+
+    def full_loop(i: int) -> None:
+        now = i / 30.0
+        landmarks = frames[i % n]
+        palm_ok = not outside_of_hand_showing(landmarks, "Left")
+        gesture, lines = classify_landmarks(landmarks)
+        stable = loop_smoother.update(gesture)
+        held = loop_gate.update(stable if palm_ok else None, now)
+        loop_tracker.apply_gesture(held, now)
+        loop_hud.draw_hud(canvas, stable, palm_ok, loop_tracker, now)
+        loop_hud.draw_gesture_debug(canvas, lines)
+
+    return [
+        Case("detect_gesture", lambda i: detect_gesture(frames[i % n])),
+        Case("gesture_checklines", lambda i: gesture_checklines(frames[i % n])),
+        Case("classify_landmarks", lambda i: classify_landmarks(frames[i % n])),
+        Case("classify_landmarks[array]", lambda i: classify_landmarks(arrays[i % n])),
+        Case("LearnedClassifier.classify", lambda i: learned.classify(frames[i % n])),
+        Case("LearnedClassifier.detect", lambda i: learned.detect(frames[i % n])),
+        Case("outside_of_hand_showing", lambda i: outside_of_hand_showing(frames[i % n], "Left")),
+        Case("GestureSmoother.update", lambda i: smoother.update(gestures[i % n])),
+        Case("GestureSmoother.update[w=61]", lambda i: wide_smoother.update(gestures[i % n])),
+        Case("WeightedGestureSmoother.update", lambda i: weighted_smoother.update(gestures[i % n], 0.9)),
+        Case("DecayedGestureSmoother.update", lambda i: decayed_smoother.update(gestures[i % n])),
+        Case("OneEuroFilter", lambda i: filter_landmarks(one_euro, frames[i % n], i / 30.0)),
+        Case("KalmanLandmarkFilter", lambda i: filter_landmarks(kalman, frames[i % n], i / 30.0)),
+        Case("GestureHoldGate.update", lambda i: hold_gate.update(stream[i % len(stream)], i / 30.0)),
+        Case("ActivityTracker.snapshot", lambda i: tracker.snapshot(i / 30.0)),
+        Case("SinkDispatcher.publish", lambda i: dispatcher.publish({"type": "switch", "n": i})),
+        Case("frame_prep[copy]", frame_prep_copy),
+        Case(
+            "frame_prep[pool]",
+            lambda i: (pool.release(pool.mirror(camera)), pool.release(pool.to_rgb(camera))),
+        ),
+        Case("CaptureStats.observe", lambda i: capture_stats.observe(camera, 0, 0.0, i / 30.0)),
+        Case("draw_hud", lambda i: draw_hud(canvas, GESTURE_ILY, True, tracker, i / 30.0)),
+        Case("draw_gesture_debug", lambda i: draw_gesture_debug(canvas, debug_lines)),
+        Case(
+            "HudRenderer.draw_hud",
+            lambda i: renderer.draw_hud(canvas, GESTURE_ILY, True, tracker, i / 30.0),
+        ),
+        Case(
+            "HudRenderer.draw_gesture_debug",
+            lambda i: renderer.draw_gesture_debug(canvas, debug_lines),
+        ),
+        hands_case(1),
+        hands_case(2),
+        hands_case(4),
+        Case("full_loop", full_loop),
+        Case("FrameEngine.process_observations", engine_frame),
+    ]
+
+
+def _time_ops(body: Callable[[int], object], number: int) -> int:
+    start = time.perf_counter_ns()
+    for i in range(number):
+        body(i)
+    return time.perf_counter_ns() - start
+
+
+def run_case(case: Case, min_time: float = 0.2, repeats: int = 5) -> dict:
+    # Calibrate so one repeat runs for roughly ``min_time`` seconds.
+    number = 1
+    while True:
+        elapsed = _time_ops(case.body, number)
+        if elapsed >= min_time * 1e9 or number >= 10_000_000:
+            break
+        number *= 10 if elapsed < min_time * 1e8 else 2
+    samples = [_time_ops(case.body, number) / number for _ in range(repeats)]
+
+    blocks_before = sys.getallocatedblocks()
+    _time_ops(case.body, number)
+    retained = (sys.getallocatedblocks() - blocks_before) / number
+
+    tracemalloc.start()
+    try:
+        case.body(0)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        case.body(1)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ns_per_op": statistics.median(samples),
+        "ns_min": min(samples),
+        "ns_stdev": statistics.pstdev(samples),
+        "ops_per_repeat": number,
+        "repeats": repeats,
+        "peak_alloc_bytes": peak - base,
+        "retained_blocks_per_op": retained,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_suite(
+    frames: list,
+    min_time: float = 0.2,
+    repeats: int = 5,
+    only: Optional[list[str]] = None,
+    source: str = "synthetic",
+) -> dict:
+    results = {}
+    for case in build_cases(frames):
+        if only and case.name not in only:
+            continue
+        results[case.name] = run_case(case, min_time=min_time, repeats=repeats)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "frames": len(frames),
+            "source": source,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> list[tuple[str, float, float, float, bool]]:
+    """Return ``(name, baseline_ns, current_ns, ratio, regressed)`` for cases in both runs."""
+    rows = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        ratio = result["ns_per_op"] / before["ns_per_op"]
+        rows.append((name, before["ns_per_op"], result["ns_per_op"], ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def _print_results(report: dict) -> None:
+    print(f"{'case':<32}{'ns/op':>12}{'min':>12}{'peak B':>10}{'blocks/op':>11}")
+    for name, r in report["results"].items():
+        print(
+            f"{name:<32}{r['ns_per_op']:>12.0f}{r['ns_min']:>12.0f}"
+            f"{r['peak_alloc_bytes']:>10d}{r['retained_blocks_per_op']:>11.3f}"
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Compare against a previous JSON run.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (0.10 = 10%%).")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--recording", help="Use hand frames from a landmark recording.")
+    parser.add_argument("--frames", type=int, default=256)
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", metavar="CASE")
+    args = parser.parse_args(argv)
+
+    if args.recording:
+        frames = recorded_frames(args.recording, args.frames)
+        source = args.recording
+    else:
+        frames = synthetic_frames(args.frames)
+        source = "synthetic"
+    report = run_suite(frames, args.min_time, args.repeats, args.only, source)
+    _print_results(report)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        print(f"\nvs {args.compare} (commit {baseline.get('meta', {}).get('commit')})")
+        for name, before, after, ratio, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:<32}{before:>12.0f} -> {after:>10.0f} ns  {ratio - 1.0:+7.1%}{flag}")
+        if args.fail_on_regression and any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
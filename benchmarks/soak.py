@@ -0,0 +1,246 @@
+"""Soak the gate and tracker stack with a long synthetic landmark stream.
+
+Usage:
+    python -m benchmarks.soak --days 3 --fps 30
+    python -m benchmarks.soak --days 0.5 --engine --no-memory
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+from observer.activity import ActivityTracker
+from observer.engine import FrameEngine, RuntimeConfig
+from observer.gates import GestureHoldGate, GestureSmoother
+from observer.replay import replay_frames
+from observer.rules import DEFAULT_RULESET, RuleSet
+from observer.sources import StreamSource
+from observer.synthetic import ExpectedTotals, LandmarkStream
+
+
+class SoakChunk:
+    __slots__ = ("frames", "seconds", "traced_bytes")
+
+    def __init__(self, frames: int, seconds: float, traced_bytes: int) -> None:
+        self.frames = frames
+        self.seconds = seconds
+        self.traced_bytes = traced_bytes
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+
+class SoakReport:
+    """What one soak run measured, chunk by chunk.
+
+    ``totals`` are the tracker's, ``switch_totals`` the same spans counted in
+    whole frames from the switch log (so their difference is the tracker's
+    accumulated rounding) and ``expected`` what the generated segments asked
+    for (see ``ExpectedTotals``).
+    """
+
+    def __init__(self, simulated_seconds: float) -> None:
+        self.simulated_seconds = simulated_seconds
+        self.chunks: list[SoakChunk] = []
+        self.switches = 0
+        self.totals: dict[str, float] = {}
+        self.switch_totals: dict[str, float] = {}
+        self.expected: dict[str, float] = {}
+
+    @property
+    def frames(self) -> int:
+        return sum(chunk.frames for chunk in self.chunks)
+
+    def quarter_fps(self) -> tuple[float, float]:
+        """Median chunk throughput over the first and the last quarter of the run."""
+        quarter = max(1, len(self.chunks) // 4)
+        first = statistics.median(c.fps for c in self.chunks[:quarter])
+        last = statistics.median(c.fps for c in self.chunks[-quarter:])
+        return first, last
+
+    def memory_growth(self) -> int:
+        """Traced bytes gained from the end of the first chunk to the end of the last."""
+        return self.chunks[-1].traced_bytes - self.chunks[0].traced_bytes
+
+    def timer_error(self) -> float:
+        return max(abs(self.totals[k] - self.switch_totals.get(k, 0.0)) for k in self.totals)
+
+    def expected_error(self) -> float:
+        return max(abs(self.totals[k] - self.expected.get(k, 0.0)) for k in self.totals)
+
+    def summary_lines(self) -> list[str]:
+        first, last = self.quarter_fps()
+        wall = sum(chunk.seconds for chunk in self.chunks)
+        lines = [
+            f"SOAK simulated_h={self.simulated_seconds / 3600:.1f} frames={self.frames} "
+            f"switches={self.switches} wall_s={wall:.1f} fps={self.frames / wall:.0f} "
+            f"first_quarter_fps={first:.0f} last_quarter_fps={last:.0f}",
+            f"MEMORY growth_bytes={self.memory_growth()} "
+            f"peak_traced_bytes={max(c.traced_bytes for c in self.chunks)}",
+            f"TIMERS rounding_s={self.timer_error():.2e} vs_segments_s={self.expected_error():.2f}",
+        ]
+        for activity, seconds in self.totals.items():
+            lines.append(
+                f"  {activity:<10} tracked={seconds:>10.1f}s "
+                f"expected={self.expected.get(activity, 0.0):>10.1f}s"
+            )
+        return lines
+
+
+class _SwitchLog:
+    """Activity time in whole frames, from the switches it is told about.
+
+    Frame times are ``start + index / fps``, so counting frames is exact
+    however long the run; the tracker adds up float timestamp differences.
+    """
+
+    def __init__(self, start: float, fps: float) -> None:
+        self.start = start
+        self.fps = fps
+        self.frames: dict[str, int] = {}
+        self.active: Optional[str] = None
+        self.since = 0
+        self.count = 0
+
+    def _index(self, now: float) -> int:
+        return round((now - self.start) * self.fps)
+
+    def __call__(self, now: float, activity: Optional[str]) -> None:
+        index = self._index(now)
+        self.count += 1
+        if self.active is not None:
+            self.frames[self.active] = self.frames.get(self.active, 0) + index - self.since
+        self.active, self.since = activity, index
+
+    def totals(self, now: float) -> dict[str, float]:
+        frames = dict(self.frames)
+        if self.active is not None:
+            frames[self.active] = frames.get(self.active, 0) + self._index(now) - self.since
+        return {activity: count / self.fps for activity, count in frames.items()}
+
+
+def _traced_bytes() -> int:
+    """Traced bytes held outside this module, so the report's own chunks do not count."""
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__)])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def run_soak(
+    stream: LandmarkStream,
+    seconds: float,
+    chunk_seconds: float = 3600.0,
+    engine: bool = False,
+    memory: bool = True,
+    hold_seconds: float = 1.5,
+    rules: RuleSet = DEFAULT_RULESET,
+) -> SoakReport:
+    """Feed ``seconds`` of ``stream`` through one gate stack, ``chunk_seconds`` at a time.
+
+    By default frames go through ``replay_frames`` block by block with shared
+    gates; with ``engine`` each frame goes through ``FrameEngine`` from a
+    ``StreamSource`` instead (converting to observations is then part of the
+    timed work). With ``memory``, ``tracemalloc`` runs throughout and each
+    chunk records the traced size after a collection.
+    """
+    report = SoakReport(seconds)
+    expected = ExpectedTotals(rules)
+    log = _SwitchLog(stream.start + stream.position / stream.fps, stream.fps)
+    if engine:
+        frame_engine = FrameEngine(
+            StreamSource(stream, 0.0), RuntimeConfig(rules=rules, hold_seconds=hold_seconds)
+        )
+        tracker = frame_engine.tracker
+    else:
+        smoother = GestureSmoother()
+        hold_gate = GestureHoldGate(hold_seconds)
+        tracker = ActivityTracker(
+            activity_by_gesture=rules.activity_by_gesture, stop_gestures=rules.stop_gestures
+        )
+    last_segment = None
+    now = stream.start
+    if memory:
+        tracemalloc.start()
+    try:
+        remaining = seconds
+        while remaining > 0:
+            span = min(chunk_seconds, remaining)
+            remaining -= span
+            frames = 0
+            busy = 0.0
+            if engine:
+                source = frame_engine.source
+                source.duration = span
+                with contextlib.redirect_stdout(io.StringIO()):
+                    started = time.perf_counter()
+                    for captured_at, observations in source.frames():
+                        if source.segment is not last_segment:
+                            expected.add(source.segment)
+                            last_segment = source.segment
+                        previous = tracker.last_switch_at
+                        frame_engine.process_observations(observations, captured_at)
+                        if tracker.last_switch_at != previous:
+                            log(captured_at, tracker.active_activity)
+                        frames += 1
+                        now = captured_at
+                    busy = time.perf_counter() - started
+            else:
+                for block, segment in stream.blocks(span):
+                    if segment is not last_segment:
+                        expected.add(segment)
+                        last_segment = segment
+                    started = time.perf_counter()
+                    replay_frames(block, smoother, hold_gate, tracker, log, rules)
+                    busy += time.perf_counter() - started
+                    frames += len(block)
+                    now = float(block["t"][-1])
+                # The last block is a view that keeps its whole segment alive.
+                block = None
+            traced = _traced_bytes() if memory else 0
+            report.chunks.append(SoakChunk(frames, busy, traced))
+    finally:
+        if memory:
+            tracemalloc.stop()
+    report.switches = log.count
+    report.totals = tracker.snapshot(now)
+    report.switch_totals = log.totals(now)
+    report.expected = expected.snapshot(now)
+    return report
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=3.0, help="Simulated run length.")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-hours", type=float, default=1.0)
+    parser.add_argument(
+        "--engine", action="store_true", help="Drive FrameEngine frame by frame instead."
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip tracemalloc (it slows the run)."
+    )
+    args = parser.parse_args(argv)
+
+    stream = LandmarkStream(fps=args.fps, seed=args.seed, start=time.time())
+    report = run_soak(
+        stream,
+        args.days * 86400.0,
+        chunk_seconds=args.chunk_hours * 3600.0,
+        engine=args.engine,
+        memory=not args.no_memory,
+    )
+    for line in report.summary_lines():
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
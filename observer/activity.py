@@ -1,15 +1,57 @@
-from typing import Optional
+import time
+from typing import Callable, Optional
 
 from observer.constants import ACTIVITIES, ACTIVITY_BY_GESTURE, GESTURE_STOP
 
 
+# Called with each event dict; must return quickly (see ``observer.sinks``).
+Listener = Callable[[dict], None]
+
+
 class ActivityTracker:
-    def __init__(self, cooldown_seconds: float = 0.8) -> None:
-        self.totals = {activity: 0.0 for activity in ACTIVITIES}
+    """Activity totals driven by held gestures.
+
+    Listeners added with ``subscribe`` get a ``switch`` event on every
+    activity change and, from ``tick``, a ``tick`` event with the running
+    totals every ``tick_seconds``. ``stop`` ends the running activity when
+    the run ends; its switch is marked ``final``. Events are plain dicts
+    built only while someone listens; listeners run on the caller's thread,
+    so they should hand events off rather than do I/O.
+    """
+
+    def __init__(
+        self,
+        cooldown_seconds: float = 0.8,
+        initial_totals: Optional[dict[str, float]] = None,
+        activity_by_gesture: Optional[dict[str, str]] = None,
+        stop_gestures: tuple = (GESTURE_STOP,),
+        tick_seconds: float = 60.0,
+    ) -> None:
+        self.activity_by_gesture = (
+            ACTIVITY_BY_GESTURE if activity_by_gesture is None else activity_by_gesture
+        )
+        self.stop_gestures = stop_gestures
+        activities = ACTIVITIES if activity_by_gesture is None else activity_by_gesture.values()
+        self.totals = {activity: 0.0 for activity in activities}
+        for activity, seconds in (initial_totals or {}).items():
+            self.totals[activity] = self.totals.get(activity, 0.0) + seconds
         self.active_activity: Optional[str] = None
         self.active_started_at: Optional[float] = None
         self.cooldown_seconds = cooldown_seconds
         self.last_switch_at = -10_000.0
+        self.tick_seconds = tick_seconds
+        self.listeners: list[Listener] = []
+        self._next_tick: Optional[float] = None
+
+    def subscribe(self, listener: Listener) -> None:
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Listener) -> None:
+        self.listeners.remove(listener)
+
+    def _emit(self, event: dict) -> None:
+        for listener in self.listeners:
+            listener(event)
 
     def _close_active(self, now: float) -> None:
         if self.active_activity is None or self.active_started_at is None:
@@ -20,19 +62,67 @@ class ActivityTracker:
     def apply_gesture(self, gesture: Optional[str], now: float) -> bool:
         if gesture is None:
             return False
-        target = None if gesture == GESTURE_STOP else ACTIVITY_BY_GESTURE.get(gesture)
-        if gesture != GESTURE_STOP and target is None:
+        stop = gesture in self.stop_gestures
+        target = None if stop else self.activity_by_gesture.get(gesture)
+        if not stop and target is None:
             return False
         if target == self.active_activity:
             return False
         if now - self.last_switch_at < self.cooldown_seconds:
             return False
+        self._switch(target, now)
+        return True
+
+    @property
+    def active_activities(self) -> tuple:
+        """The running activity as a one-item tuple, like ``HandRegistry``'s per-hand one."""
+        return (self.active_activity,)
+
+    def stop(self, now: float) -> bool:
+        """End the running activity at ``now`` because the run is ending, cooldown or not."""
+        if self.active_activity is None:
+            return False
+        self._switch(None, now, final=True)
+        return True
 
+    def _switch(self, target: Optional[str], now: float, final: bool = False) -> None:
+        previous = self.active_activity
         self._close_active(now)
         self.active_activity = target
         self.active_started_at = now if target is not None else None
         self.last_switch_at = now
-        return True
+        if self.listeners:
+            event = {
+                "type": "switch",
+                "ts": time.time(),
+                "at": now,
+                "from": previous,
+                "to": target,
+                "totals": dict(self.totals),
+            }
+            if final:
+                event["final"] = True
+            self._emit(event)
+
+    def tick(self, now: float) -> None:
+        """Emit a ``tick`` event if ``tick_seconds`` have passed since the last one."""
+        if not self.listeners:
+            return
+        if self._next_tick is None:
+            self._next_tick = now + self.tick_seconds
+            return
+        if now < self._next_tick:
+            return
+        self._next_tick = now + self.tick_seconds
+        self._emit(
+            {
+                "type": "tick",
+                "ts": time.time(),
+                "at": now,
+                "active": self.active_activity,
+                "totals": self.snapshot(now),
+            }
+        )
 
     def snapshot(self, now: float) -> dict[str, float]:
         values = dict(self.totals)
@@ -41,6 +131,24 @@ class ActivityTracker:
         return values
 
 
+class SwitchPrinter:
+    """Tracker listener printing ``ACTIVE: ...``/``STOPPED`` lines for shell users.
+
+    The ``final`` stop at the end of a run is not printed.
+    """
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+
+    def __call__(self, event: dict) -> None:
+        if event["type"] != "switch" or event.get("final"):
+            return
+        if event["to"] is None:
+            print(f"{self.label}STOPPED", flush=True)
+        else:
+            print(f"{self.label}ACTIVE: {event['to']}", flush=True)
+
+
 def format_seconds(seconds: float) -> str:
     total = int(seconds)
     hours = total // 3600
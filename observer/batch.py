@@ -0,0 +1,240 @@
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+from observer.engine import FrameEngine, RuntimeConfig
+from observer.frames import FramePool
+from observer.recording import FRAME_DTYPE, handedness_code
+from observer.replay import ReplayResult
+from observer.sources import RecordingSource, check_model_file, has_solutions, make_source
+
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".mkv", ".m4v", ".webm")
+
+
+class VideoChunk:
+    def __init__(self, path: str, index: int, start_frame: int, end_frame: int, fps: float) -> None:
+        self.path = path
+        self.index = index
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.fps = fps
+
+
+def collect_videos(paths: Iterable[str]) -> list[str]:
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                videos.extend(
+                    os.path.join(root, name)
+                    for name in sorted(files)
+                    if name.lower().endswith(VIDEO_EXTENSIONS)
+                )
+        elif os.path.isfile(path):
+            videos.append(path)
+        else:
+            raise FileNotFoundError(path)
+    return videos
+
+
+def probe_video(path: str) -> tuple[int, float]:
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video {path}")
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    finally:
+        cap.release()
+    return frame_count, fps
+
+
+def plan_chunks(path: str, frame_count: int, fps: float, chunk_seconds: float) -> list[VideoChunk]:
+    if frame_count <= 0:
+        # Unknown length (some containers): one chunk that reads to the end.
+        return [VideoChunk(path, 0, 0, -1, fps)]
+    chunk_frames = max(1, int(chunk_seconds * fps)) if chunk_seconds > 0 else frame_count
+    count = math.ceil(frame_count / chunk_frames)
+    return [
+        VideoChunk(path, i, i * chunk_frames, min(frame_count, (i + 1) * chunk_frames), fps)
+        for i in range(count)
+    ]
+
+
+class _FirstHand:
+    """``detect(rgb, timestamp_ms) -> (landmarks, handedness)`` for a source's first hand."""
+
+    def __init__(self, source) -> None:
+        self.source = source
+        source.open()
+
+    def detect(self, rgb, timestamp_ms: int):
+        observations = self.source.detect(rgb, timestamp_ms)
+        if not observations:
+            return None, None
+        return observations[0].landmarks, observations[0].handedness
+
+
+def make_detector(model_path: str) -> _FirstHand:
+    """A single-hand landmarker with ``detect(rgb, timestamp_ms) -> (landmarks, handedness)``."""
+    return _FirstHand(make_source(model_path))
+
+
+# One landmarker per worker process, created by the pool initializer.
+_detector = None
+# VIDEO-mode timestamps must keep increasing across every chunk a worker sees.
+_clock_ms = 0
+
+
+def _init_worker(model_path: str) -> None:
+    global _detector
+    _detector = make_detector(model_path)
+
+
+def _process_chunk(chunk: VideoChunk) -> tuple[str, int, np.ndarray]:
+    global _clock_ms
+    cap = cv2.VideoCapture(chunk.path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open video {chunk.path}")
+    rows = []
+    frames = FramePool()
+    try:
+        if chunk.start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, chunk.start_frame)
+        index = chunk.start_frame
+        step_ms = max(1, int(round(1000.0 / chunk.fps)))
+        while chunk.end_frame < 0 or index < chunk.end_frame:
+            ok, frame = frames.read(cap)
+            if not ok:
+                break
+            _clock_ms += step_ms
+            rgb = frames.to_rgb(frame)
+            landmarks, handedness = _detector.detect(rgb, _clock_ms)
+            frames.release(rgb)
+            frames.release(frame)
+            row = np.zeros((), dtype=FRAME_DTYPE)
+            row["t"] = index / chunk.fps
+            if landmarks is not None:
+                # Camera orientation, as the model saw it; ``gate_frames`` mirrors.
+                row["present"] = 1
+                row["handedness"] = handedness_code(handedness)
+                row["landmarks"] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+            rows.append(row)
+            index += 1
+    finally:
+        cap.release()
+    return chunk.path, chunk.index, np.array(rows, dtype=FRAME_DTYPE)
+
+
+def gate_frames(frames: np.ndarray, selfie_view: bool = False) -> ReplayResult:
+    """Run landmarked frames through ``FrameEngine`` on their own timestamps.
+
+    Frames are in camera orientation unless ``selfie_view``; the engine mirrors
+    them, classifies, gates and tracks activities exactly as in a live run.
+    """
+    times = frames["t"]
+    result = ReplayResult(
+        len(frames), float(times[0]) if len(times) else 0.0, float(times[-1]) if len(times) else 0.0
+    )
+    engine = FrameEngine(
+        RecordingSource(frames, selfie_view=selfie_view), RuntimeConfig(console=False)
+    )
+
+    def record(event: dict) -> None:
+        # The engine's closing stop is not a gesture switch; replay_frames has none.
+        if event["type"] == "switch" and not event.get("final"):
+            result.switches.append((event["at"], event["to"]))
+
+    engine.tracker.subscribe(record)
+    engine.run()
+    result.totals = engine.tracker.snapshot(result.end_time)
+    return result
+
+
+def summarize(path: str, result: ReplayResult, fps: float) -> dict:
+    return {
+        "video": path,
+        "frames": result.frames,
+        "fps": fps,
+        "duration_seconds": result.duration,
+        "timeline": [
+            {"activity": activity, "start": start, "end": end}
+            for activity, start, end in result.sessions()
+        ],
+        "totals": result.totals,
+    }
+
+
+def _output_path(out_dir: str, video: str, used: set) -> str:
+    stem = os.path.splitext(os.path.basename(video))[0]
+    name = f"{stem}.json"
+    suffix = 1
+    while name in used:
+        suffix += 1
+        name = f"{stem}-{suffix}.json"
+    used.add(name)
+    return os.path.join(out_dir, name)
+
+
+def process_videos(
+    paths: Iterable[str],
+    out_dir: str,
+    model_path: str,
+    workers: Optional[int] = None,
+    chunk_seconds: float = 300.0,
+) -> dict[str, dict]:
+    """Landmark every video headlessly across a process pool and write per-file summaries.
+
+    Chunks are landmarked in parallel; ``gate_frames`` then runs each file's
+    concatenated frames through ``FrameEngine`` in order, so gating state
+    carries across chunks.
+    """
+    if not has_solutions():
+        # Fail here with a readable message instead of a broken worker pool.
+        check_model_file(model_path)
+    videos = collect_videos(paths)
+    os.makedirs(out_dir, exist_ok=True)
+    chunks: dict[str, list[VideoChunk]] = {}
+    for video in videos:
+        frame_count, fps = probe_video(video)
+        chunks[video] = plan_chunks(video, frame_count, fps, chunk_seconds)
+
+    used_names: set = set()
+    outputs = {video: _output_path(out_dir, video, used_names) for video in videos}
+    pending = {video: len(parts) for video, parts in chunks.items()}
+    parts: dict[str, dict[int, np.ndarray]] = {video: {} for video in videos}
+    summaries: dict[str, dict] = {}
+    began = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path,),
+    ) as pool:
+        futures = [pool.submit(_process_chunk, c) for video in videos for c in chunks[video]]
+        for future in as_completed(futures):
+            video, index, frames = future.result()
+            parts[video][index] = frames
+            pending[video] -= 1
+            if pending[video]:
+                continue
+            ordered = [parts.pop(video)[i] for i in range(len(chunks[video]))]
+            frames = np.concatenate(ordered) if ordered else np.zeros(0, dtype=FRAME_DTYPE)
+            summary = summarize(video, gate_frames(frames), chunks[video][0].fps)
+            with open(outputs[video], "w") as f:
+                json.dump(summary, f, indent=2)
+            summaries[video] = summary
+            print(
+                f"{video}: {summary['frames']} frames, "
+                f"{len(summary['timeline'])} sessions "
+                f"({time.perf_counter() - began:.1f}s elapsed)",
+                flush=True,
+            )
+    return summaries
@@ -0,0 +1,307 @@
+import time
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from observer.pipeline import RateMeter
+
+_PROPERTIES = (
+    ("width", cv2.CAP_PROP_FRAME_WIDTH),
+    ("height", cv2.CAP_PROP_FRAME_HEIGHT),
+    ("fps", cv2.CAP_PROP_FPS),
+    ("buffer_size", cv2.CAP_PROP_BUFFERSIZE),
+)
+# A 1/16-scale nearest-neighbour thumbnail is enough to tell a repeated frame from a new one.
+_SAMPLE_STEP = 16
+
+
+def fourcc_text(code: float) -> str:
+    code = int(code)
+    text = "".join(chr((code >> shift) & 0xFF) for shift in (0, 8, 16, 24))
+    return text if text.isprintable() and text.strip() else ""
+
+
+class CaptureSettings:
+    """The camera mode to ask the driver for; ``None`` keeps the driver's default.
+
+    ``buffer_size`` is the number of frames the driver may queue (not every
+    backend honours it). With ``drain``, frames that queued up while the caller
+    was busy are skipped so ``read`` returns the newest one.
+    """
+
+    def __init__(
+        self,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        fps: Optional[float] = None,
+        fourcc: Optional[str] = None,
+        buffer_size: Optional[int] = 1,
+        drain: bool = True,
+        max_drain: int = 8,
+    ) -> None:
+        if fourcc is not None and len(fourcc) != 4:
+            raise ValueError(f"FOURCC must be four characters, got {fourcc!r}")
+        if buffer_size is not None and buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.drain = drain
+        self.max_drain = max_drain
+
+    def requested(self) -> dict:
+        values = {
+            "fourcc": self.fourcc,
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "buffer_size": self.buffer_size,
+        }
+        return {name: value for name, value in values.items() if value is not None}
+
+
+class CaptureStats:
+    """Delivered (unique) frame rate, duplicates, drained frames and read wait."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.duplicates = 0
+        self.drained = 0
+        self.meter = RateMeter()
+        self.wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        # Nearest-neighbour thumbnails of the previous and current frame.
+        self._previous: Optional[np.ndarray] = None
+        self._current: Optional[np.ndarray] = None
+
+    def observe(self, frame: np.ndarray, drained: int, wait_seconds: float, now: float) -> None:
+        self.frames += 1
+        self.drained += drained
+        wait_ms = wait_seconds * 1000.0
+        if self.frames == 1:
+            self.wait_ms = wait_ms
+        else:
+            self.wait_ms += 0.1 * (wait_ms - self.wait_ms)
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        height, width = frame.shape[:2]
+        size = (max(1, width // _SAMPLE_STEP), max(1, height // _SAMPLE_STEP))
+        previous = self._previous
+        if previous is not None and previous.shape != (size[1], size[0]) + frame.shape[2:]:
+            # New camera mode: nothing to compare against.
+            previous = self._previous = self._current = None
+        current = cv2.resize(frame, size, dst=self._current, interpolation=cv2.INTER_NEAREST)
+        if previous is not None and cv2.norm(previous, current, cv2.NORM_INF) == 0:
+            self.duplicates += 1
+            self._current = current
+            return
+        self._previous, self._current = current, previous
+        self.meter.tick(now)
+
+    def hud_lines(self) -> list[str]:
+        return [
+            f"Cam: {self.meter.fps:.1f} fps  dup={self.duplicates} drained={self.drained}"
+            f"  wait={self.wait_ms:.0f}ms"
+        ]
+
+    def summary(self) -> str:
+        return (
+            f"CAPTURE frames={self.frames} unique={self.meter.total} "
+            f"fps={self.meter.fps:.1f} duplicates={self.duplicates} drained={self.drained} "
+            f"wait_ms={self.wait_ms:.1f} max_wait_ms={self.max_wait_ms:.1f}"
+        )
+
+
+class Capture:
+    """A ``cv2.VideoCapture`` wrapper that negotiates the mode and keeps only the newest frame.
+
+    The requested properties are set on construction (FOURCC first, since
+    drivers pick the sizes and rates they offer per format) and ``actual``
+    holds what the driver reports back. ``read`` estimates from the frame rate
+    how many frames arrived since the previous read (carrying the fraction
+    over), grabs that many and retrieves the last. A grab that returns within
+    a quarter frame interval came out of the driver's queue; a slower one
+    waited for a new frame, which is the newest by definition, so draining
+    stops there and the estimate starts again from zero.
+    """
+
+    def __init__(
+        self,
+        cap,
+        settings: Optional[CaptureSettings] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.cap = cap
+        self.settings = settings or CaptureSettings()
+        self.clock = clock
+        self.stats = CaptureStats()
+        self.actual: dict = {}
+        self._last_read: Optional[float] = None
+        self._carry = 0.0
+        if cap.isOpened():
+            self.negotiate()
+
+    def negotiate(self) -> None:
+        cap = self.cap
+        requested = self.settings.requested()
+        if "fourcc" in requested:
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*requested["fourcc"]))
+        for name, prop in _PROPERTIES:
+            if name in requested:
+                cap.set(prop, requested[name])
+        self.actual = {"fourcc": fourcc_text(cap.get(cv2.CAP_PROP_FOURCC))}
+        for name, prop in _PROPERTIES:
+            value = cap.get(prop)
+            self.actual[name] = value if name == "fps" else int(value)
+
+    def describe(self) -> str:
+        actual = self.actual
+        line = (
+            f"CAMERA mode={actual['width']}x{actual['height']}@{actual['fps']:.1f} "
+            f"fourcc={actual['fourcc'] or '-'} buffer={actual['buffer_size']}"
+        )
+        requested = self.settings.requested()
+        if requested:
+            line += " requested=" + ",".join(f"{k}:{v}" for k, v in requested.items())
+        return line
+
+    def _frame_interval(self) -> float:
+        fps = self.actual.get("fps") or self.stats.meter.fps
+        return 1.0 / fps if fps > 0 else 0.0
+
+    def _grab(self, stale_seconds: float) -> tuple[bool, bool]:
+        """``(ok, fresh)``: whether the grab succeeded and had to wait for a new frame."""
+        started = self.clock()
+        ok = self.cap.grab()
+        return ok, self.clock() - started >= stale_seconds
+
+    def read(self, image: Optional[np.ndarray] = None) -> tuple[bool, Optional[np.ndarray]]:
+        started = self.clock()
+        interval = self._frame_interval()
+        backlog = 0
+        if self.settings.drain and interval > 0 and self._last_read is not None:
+            arrived = self._carry + (started - self._last_read) / interval
+            backlog = int(arrived)
+            self._carry = arrived - backlog
+            backlog = min(backlog, self.settings.max_drain)
+        stale_seconds = interval / 4 if interval > 0 else 0.005
+        ok, fresh = self._grab(stale_seconds)
+        drained = 0
+        while ok and not fresh and drained < backlog - 1:
+            ok, fresh = self._grab(stale_seconds)
+            drained += 1
+        if fresh:
+            self._carry = 0.0
+        frame = None
+        if ok:
+            ok, frame = self.cap.retrieve(image)
+        now = self.clock()
+        self._last_read = now
+        if ok:
+            self.stats.observe(frame, drained, now - started, now)
+        return ok, frame
+
+    def isOpened(self) -> bool:  # noqa: N802 - cv2.VideoCapture interface
+        return self.cap.isOpened()
+
+    def get(self, prop: int) -> float:
+        return self.cap.get(prop)
+
+    def release(self) -> None:
+        self.cap.release()
+
+
+def open_camera(index, settings: Optional[CaptureSettings] = None) -> Capture:
+    """Open a camera index (or video path) and negotiate ``settings``."""
+    return Capture(cv2.VideoCapture(index), settings)
+
+
+class SyntheticCamera:
+    """A ``cv2.VideoCapture`` stand-in that behaves like a live driver.
+
+    Frame ``i`` is produced at ``i / fps`` on ``clock`` whether or not anyone
+    reads it. Up to ``buffer_size`` produced frames wait in a queue; once it is
+    full, new frames are dropped, as V4L2 does, so a slow reader falls behind.
+    ``grab`` sleeps until a frame is queued. With ``repeat_every``, every that
+    many frames the content of the previous frame is sent again. Retrieved
+    frames are filled with their content index (mod 256); ``last_index`` is
+    the index of the last grabbed frame.
+    """
+
+    def __init__(
+        self,
+        fps: float = 30.0,
+        size: tuple[int, int] = (64, 48),
+        buffer_size: int = 4,
+        repeat_every: int = 0,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.props = {
+            cv2.CAP_PROP_FRAME_WIDTH: float(size[0]),
+            cv2.CAP_PROP_FRAME_HEIGHT: float(size[1]),
+            cv2.CAP_PROP_FPS: float(fps),
+            cv2.CAP_PROP_BUFFERSIZE: float(buffer_size),
+            cv2.CAP_PROP_FOURCC: float(cv2.VideoWriter_fourcc(*"YUYV")),
+        }
+        self.repeat_every = repeat_every
+        self.clock = clock
+        self.sleep = sleep
+        self.started = clock()
+        self.queue: list[int] = []
+        self.produced = 0
+        self.last_index: Optional[int] = None
+        self.opened = True
+
+    @property
+    def fps(self) -> float:
+        return self.props[cv2.CAP_PROP_FPS]
+
+    def _produce(self) -> None:
+        # The tolerance keeps a frame due exactly now from rounding down.
+        due = int((self.clock() - self.started) * self.fps + 1e-9) + 1
+        capacity = int(self.props[cv2.CAP_PROP_BUFFERSIZE])
+        for index in range(self.produced, due):
+            if len(self.queue) < capacity:
+                self.queue.append(index)
+        self.produced = max(self.produced, due)
+
+    def grab(self) -> bool:
+        self._produce()
+        while not self.queue:
+            self.sleep(max(0.0, self.started + self.produced / self.fps - self.clock()))
+            self._produce()
+        self.last_index = self.queue.pop(0)
+        return True
+
+    def retrieve(self, image: Optional[np.ndarray] = None) -> tuple[bool, np.ndarray]:
+        width = int(self.props[cv2.CAP_PROP_FRAME_WIDTH])
+        height = int(self.props[cv2.CAP_PROP_FRAME_HEIGHT])
+        if image is None or image.shape != (height, width, 3):
+            image = np.empty((height, width, 3), dtype=np.uint8)
+        content = self.last_index
+        if self.repeat_every and content % self.repeat_every == self.repeat_every - 1:
+            content -= 1
+        image.fill(content % 256)
+        return True, image
+
+    def read(self, image: Optional[np.ndarray] = None) -> tuple[bool, np.ndarray]:
+        self.grab()
+        return self.retrieve(image)
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop not in self.props:
+            return False
+        self.props[prop] = float(value)
+        return True
+
+    def get(self, prop: int) -> float:
+        return self.props.get(prop, 0.0)
+
+    def isOpened(self) -> bool:  # noqa: N802 - cv2.VideoCapture interface
+        return self.opened
+
+    def release(self) -> None:
+        self.opened = False
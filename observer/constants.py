@@ -11,3 +11,9 @@ ACTIVITY_BY_GESTURE = {
 }
 
 ACTIVITIES = ("studying", "youtube", "lol")
+
+# HUD names; activities added through rule files fall back to their own name.
+ACTIVITY_LABELS = {"studying": "Studying", "youtube": "YouTube", "lol": "LoL"}
+
+# Handedness labels as reported by MediaPipe, indexed by their compact code.
+HANDEDNESS_LABELS = (None, "Left", "Right")
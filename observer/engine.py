@@ -0,0 +1,608 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import cv2
+
+from observer.activity import ActivityTracker, SwitchPrinter
+from observer.capture import Capture, CaptureStats
+from observer.eventlog import EventLog
+from observer.filters import filter_landmarks
+from observer.frames import FramePool, mirror_handedness, mirror_landmarks
+from observer.gates import GestureHoldGate, GestureSmoother
+from observer.gestures import palm_facing_camera
+from observer.hands import HandObservation, HandRegistry
+from observer.metrics import NULL_CLOCK, LatencyMetrics, StartupReport
+from observer.pipeline import InFlightTracker, PipelineStats, run_pipeline
+from observer.recording import LandmarkRecorder
+from observer.roi import RoiTracker
+from observer.rules import DEFAULT_RULESET, RuleSet
+from observer.scheduler import InferenceScheduler, switch_pending
+from observer.service import EventService
+from observer.sinks import SinkDispatcher
+from observer.sources import LandmarkSource, SourceLoader
+from observer.ui import HudRenderer, draw_hand_labels, draw_landmark_points
+
+
+class FrameState:
+    def __init__(self, frame, captured_at: float, clock=NULL_CLOCK) -> None:
+        # Camera orientation until render mirrors it for display; owned by the state
+        # (a ``FramePool`` buffer) until ``FrameEngine.discard`` or render releases it.
+        self.frame = frame
+        self.captured_at = captured_at
+        self.clock = clock
+        self.gesture: Optional[str] = None
+        self.stable_gesture: Optional[str] = None
+        self.palm_ok = False
+        self.debug_lines: list[str] = []
+        self.status_lines: list[str] = []
+        # Landmarks to draw, in camera orientation (drawn before the mirror).
+        self.hand = None
+        # Multi-hand mode: (hand id, landmarks, stable gesture, activity) per visible hand.
+        self.hands: list[tuple] = []
+
+
+class RuntimeConfig:
+    """Everything that shapes a run apart from the landmark source.
+
+    The defaults match the CLI's. ``rules`` is anything with the ``RuleSet``
+    classification interface (a learned classifier works too). ``headless``
+    skips the window and HUD; without ``console`` nothing is printed (the
+    ``--cameras`` workers report over their queue instead).
+    """
+
+    def __init__(
+        self,
+        threaded: bool = False,
+        recorder: Optional[LandmarkRecorder] = None,
+        metrics: Optional[LatencyMetrics] = None,
+        event_log: Optional[EventLog] = None,
+        roi: Optional[RoiTracker] = None,
+        scheduler: Optional[InferenceScheduler] = None,
+        smoother=None,
+        rules: RuleSet = DEFAULT_RULESET,
+        hands: Optional[HandRegistry] = None,
+        service: Optional[EventService] = None,
+        landmark_filter=None,
+        hold_seconds: float = 1.5,
+        startup: Optional[StartupReport] = None,
+        sinks: Optional[SinkDispatcher] = None,
+        headless: bool = False,
+        console: bool = True,
+    ) -> None:
+        self.threaded = threaded
+        self.recorder = recorder
+        self.metrics = metrics
+        self.event_log = event_log
+        self.roi = roi
+        self.scheduler = scheduler
+        self.smoother = smoother
+        self.rules = rules
+        self.hands = hands
+        self.service = service
+        self.landmark_filter = landmark_filter
+        self.hold_seconds = hold_seconds
+        self.startup = startup
+        self.sinks = sinks
+        self.headless = headless
+        self.console = console
+
+    @property
+    def max_hands(self) -> int:
+        return self.hands.max_hands if self.hands is not None else 1
+
+
+class _Controls:
+    def __init__(
+        self,
+        metrics: Optional[LatencyMetrics] = None,
+        rules: RuleSet = DEFAULT_RULESET,
+        service: Optional[EventService] = None,
+        headless: bool = False,
+        console: bool = True,
+    ) -> None:
+        # Headless runs never draw the debug checklines.
+        self.debug_enabled = not headless
+        self.console = console
+        self.metrics = metrics
+        self.rules = rules
+        self.service = service
+        self.hud = HudRenderer()
+        self.frames = FramePool()
+        self.capture: Optional[CaptureStats] = None
+        self.gesture_listeners: list[Callable[[Optional[str]], None]] = []
+        self.last_gesture: Optional[str] = None
+        if service is not None:
+            self.gesture_listeners.append(service.publish_gesture)
+
+    def publish_gesture(self, gesture: Optional[str]) -> None:
+        if gesture == self.last_gesture:
+            return
+        self.last_gesture = gesture
+        for listener in self.gesture_listeners:
+            listener(gesture)
+
+    def clock(self):
+        return self.metrics.clock() if self.metrics is not None else NULL_CLOCK
+
+
+def handle_activity_update(
+    stable_gesture, tracker: ActivityTracker, now: Optional[float] = None
+) -> bool:
+    """Advance ``tracker`` by one frame; its listeners log, serve, print and publish switches."""
+    if now is None:
+        now = time.monotonic()
+    tracker.tick(now)
+    return tracker.apply_gesture(stable_gesture, now)
+
+
+def _model_input(state: FrameState, roi: Optional[RoiTracker], frames: FramePool):
+    image, window = roi.prepare(state.frame) if roi is not None else (state.frame, None)
+    return frames.to_rgb(image), window
+
+
+def _mirrored(observations: list[HandObservation]) -> list[HandObservation]:
+    """The model sees the camera image; gates and the HUD work in the mirrored view."""
+    for observation in observations:
+        observation.landmarks = mirror_landmarks(observation.landmarks)
+        observation.handedness = mirror_handedness(observation.handedness)
+    return observations
+
+
+def _track_roi(roi: Optional[RoiTracker], window, landmarks, frame_shape):
+    """Map ROI landmarks back to the full frame and move the ROI for the next frame."""
+    if roi is None:
+        return landmarks
+    if landmarks is not None and window is not None:
+        landmarks = window.to_frame(landmarks)
+    roi.update(landmarks, frame_shape)
+    return landmarks
+
+
+def _carry_over(state: FrameState, previous: FrameState) -> None:
+    """Show the last inference result on a frame that was not sent to the model."""
+    state.stable_gesture = previous.stable_gesture
+    state.palm_ok = previous.palm_ok
+    state.debug_lines = previous.debug_lines
+    state.hand = previous.hand
+    state.hands = previous.hands
+
+
+def _observe_schedule(
+    scheduler: Optional[InferenceScheduler],
+    state: FrameState,
+    hold_gate: GestureHoldGate,
+    tracker: ActivityTracker,
+    hands: Optional[HandRegistry] = None,
+) -> None:
+    if scheduler is None:
+        return
+    if hands is None:
+        stacks = [(state.gesture, hold_gate, tracker)]
+    else:
+        stacks = [(h.gesture, h.hold_gate, h.tracker) for h in hands.hands.values()]
+    pending = any(
+        switch_pending(candidate, t.active_activity, t.activity_by_gesture, t.stop_gestures)
+        for gesture, gate, t in stacks
+        for candidate in (gesture, gate.current_candidate)
+    )
+    scheduler.observe(state.captured_at, state.hand is not None, pending)
+
+
+def _status_lines(
+    roi: Optional[RoiTracker],
+    scheduler: Optional[InferenceScheduler],
+    hands: Optional[HandRegistry] = None,
+) -> list[str]:
+    lines = []
+    if hands is not None:
+        lines += hands.hud_lines()
+    if roi is not None:
+        lines += roi.hud_lines()
+    if scheduler is not None:
+        lines += scheduler.hud_lines()
+    return lines
+
+
+def _update_gates(
+    state: FrameState,
+    landmarks,
+    handedness: Optional[str],
+    smoother: GestureSmoother,
+    hold_gate: GestureHoldGate,
+    controls: _Controls,
+    recorder: Optional[LandmarkRecorder] = None,
+    confidence: float = 1.0,
+    landmark_filter=None,
+) -> Optional[str]:
+    now = state.captured_at
+    if recorder is not None:
+        recorder.write(now, landmarks, handedness)
+    if landmark_filter is not None:
+        # Recordings keep the raw landmarks so filters can be compared on replay.
+        landmarks = filter_landmarks(landmark_filter, landmarks, now)
+    if landmarks is None:
+        state.stable_gesture = smoother.update(None)
+        controls.publish_gesture(state.stable_gesture)
+        return hold_gate.update(None, now)
+
+    state.palm_ok = palm_facing_camera(landmarks, handedness)
+    gesture, debug_lines, score = controls.rules.classify_scored(landmarks)
+    state.clock.lap("classify")
+    state.gesture = gesture
+    if controls.debug_enabled:
+        state.debug_lines = debug_lines
+    # Detection confidence times the classifier's certainty in the gesture.
+    state.stable_gesture = smoother.update(gesture, confidence * score)
+    controls.publish_gesture(state.stable_gesture)
+    if state.palm_ok:
+        return hold_gate.update(state.stable_gesture, now)
+    return hold_gate.update(None, now)
+
+
+def _update_hands(
+    state: FrameState,
+    observations: list[HandObservation],
+    hands: HandRegistry,
+    controls: _Controls,
+) -> None:
+    now = state.captured_at
+    held, retired = hands.update(observations, now, controls.debug_enabled)
+    state.clock.lap("classify")
+    for hand, gesture in held:
+        handle_activity_update(gesture, hand.tracker, now)
+    if controls.console:
+        for hand in retired:
+            print(f"HAND {hand.hand_id} GONE", flush=True)
+    visible = [hand for hand, _ in held if hand.landmarks is not None]
+    state.hands = [
+        (hand.hand_id, hand.landmarks, hand.stable_gesture, hand.tracker.active_activity)
+        for hand in visible
+    ]
+    state.hand = visible[0].landmarks if visible else None
+    state.gesture = visible[0].gesture if visible else None
+    state.stable_gesture = " ".join(f"#{h.hand_id}:{h.stable_gesture or '-'}" for h in visible)
+    state.palm_ok = any(hand.palm_ok for hand in visible)
+    if controls.debug_enabled:
+        state.debug_lines = [f"#{h.hand_id} {line}" for h in visible for line in h.debug_lines]
+
+
+def _present(
+    state: FrameState,
+    tracker,
+    controls: _Controls,
+    stats: Optional[PipelineStats],
+) -> bool:
+    frame = state.frame
+    metrics = controls.metrics
+    clock = controls.clock()
+    hud = controls.hud
+    hud.draw_hud(frame, state.stable_gesture, state.palm_ok, tracker, time.monotonic())
+    if controls.debug_enabled:
+        hud.draw_gesture_debug(frame, state.debug_lines)
+    status_lines = list(state.status_lines)
+    if controls.capture is not None:
+        status_lines = controls.capture.hud_lines() + status_lines
+    if stats is not None:
+        stats.observe_latency(state.captured_at, time.monotonic())
+        status_lines = stats.hud_lines() + status_lines
+    if status_lines:
+        hud.draw_pipeline_stats(frame, status_lines)
+    if metrics is not None:
+        hud.draw_metrics(frame, metrics.hud_lines(time.monotonic()))
+    clock.lap("hud")
+    cv2.imshow("Observer v2", frame)
+    key = cv2.waitKey(1) & 0xFF
+    if metrics is not None:
+        clock.lap("imshow")
+        now = time.monotonic()
+        metrics.record("end_to_end", now - state.captured_at)
+        metrics.maybe_report(now)
+    if key == ord("q"):
+        return False
+    if key == ord("d"):
+        controls.debug_enabled = not controls.debug_enabled
+    return True
+
+
+def _run_frames(
+    cap: cv2.VideoCapture,
+    process,
+    render,
+    threaded: bool,
+    controls: _Controls,
+    discard=None,
+) -> Optional[PipelineStats]:
+    """Read ``cap`` until it fails or ``render`` asks to stop; the pipeline's stats if threaded."""
+    metrics = controls.metrics
+    frames = controls.frames
+    on_read = None
+    if metrics is not None:
+        on_read = lambda seconds: metrics.record("read", seconds)  # noqa: E731
+    if threaded:
+        return run_pipeline(
+            cap, process, render, on_read=on_read, frames=frames, discard=discard
+        )
+    while True:
+        started = time.perf_counter()
+        ok, frame = frames.read(cap)
+        if not ok:
+            return None
+        if on_read is not None:
+            on_read(time.perf_counter() - started)
+        if not render(process(frame, time.monotonic()), None):
+            return None
+
+
+class FrameEngine:
+    """The per-frame path shared by every landmark source.
+
+    ``process`` (or ``process_async`` plus the source's result callback) turns
+    a camera frame into a ``FrameState``: ROI crop, model input, inference,
+    mirroring, landmark filter, classification, gates, activity tracking and
+    scheduling. ``render`` draws and shows it. Sources without frames feed
+    ``process_observations`` and are always rendered headless, as are runs
+    with a ``service``. Gates and timers run on each frame's capture time.
+    """
+
+    def __init__(self, source: LandmarkSource, config: Optional[RuntimeConfig] = None) -> None:
+        config = config or RuntimeConfig()
+        if not source.needs_frames and config.roi is not None:
+            raise ValueError("ROI cropping needs a camera source")
+        self.source = source
+        self.config = config
+        self.smoother = config.smoother or GestureSmoother()
+        self.hold_gate = GestureHoldGate(config.hold_seconds)
+        event_log = config.event_log
+        self.tracker = ActivityTracker(
+            initial_totals=event_log.recovered.totals if event_log else None,
+            activity_by_gesture=config.rules.activity_by_gesture,
+            stop_gestures=config.rules.stop_gestures,
+        )
+        self.headless = config.headless or config.service is not None or not source.needs_frames
+        self.controls = _Controls(
+            config.metrics, config.rules, config.service, self.headless, config.console
+        )
+        self.pipeline_stats: Optional[PipelineStats] = None
+        self.start = time.monotonic()
+        self.in_flight = InFlightTracker(max_in_flight=2, max_age_ms=250)
+        self.frames_processed = 0
+        self._lock = threading.Lock()
+        self._latest = FrameState(None, self.start)
+        # Asynchronous sources: ROI window and frame shape of each submitted timestamp.
+        self._roi_windows: dict[int, tuple] = {}
+        self._loader: Optional[SourceLoader] = None
+        # Everything that reacts to switches listens on the tracker, in this order.
+        if config.event_log is not None:
+            config.event_log.attach(self.tracker)
+        if config.service is not None:
+            config.service.attach(self.tracker)
+        if config.sinks is not None:
+            config.sinks.attach(self.tracker)
+        if config.console:
+            self.tracker.subscribe(SwitchPrinter())
+            if config.hands is not None:
+                config.hands.listener_factory = lambda hand_id: SwitchPrinter(f"HAND {hand_id} ")
+
+    def _timestamp_ms(self, captured_at: float) -> int:
+        return int((captured_at - self.start) * 1000.0)
+
+    def _skipped(self, state: FrameState) -> bool:
+        scheduler = self.config.scheduler
+        if scheduler is None or scheduler.should_run(state.captured_at):
+            return False
+        with self._lock:
+            _carry_over(state, self._latest)
+        state.status_lines = _status_lines(self.config.roi, scheduler, self.config.hands)
+        return True
+
+    def process(self, frame, captured_at: float) -> FrameState:
+        state = FrameState(frame, captured_at, self.controls.clock())
+        if self._skipped(state):
+            return state
+        rgb, window = _model_input(state, self.config.roi, self.controls.frames)
+        if self.source.copies_input:
+            self.controls.frames.count_copy(rgb)
+        state.clock.lap("convert")
+        started = time.perf_counter()
+        observations = self.source.detect(rgb, self._timestamp_ms(captured_at))
+        self.controls.frames.release(rgb)
+        if self.config.scheduler is not None:
+            self.config.scheduler.record_inference(time.perf_counter() - started)
+        state.clock.lap("inference")
+        self.apply(state, observations, window, frame.shape)
+        return state
+
+    def process_async(self, frame, captured_at: float) -> FrameState:
+        """Submit the frame if a slot is free and show the latest finished result."""
+        config = self.config
+        state = FrameState(frame, captured_at, self.controls.clock())
+        timestamp_ms = None
+        if config.scheduler is None or config.scheduler.should_run(captured_at):
+            timestamp_ms = self.in_flight.try_submit(self._timestamp_ms(captured_at))
+        if timestamp_ms is not None:
+            rgb, window = _model_input(state, config.roi, self.controls.frames)
+            if self.source.copies_input:
+                self.controls.frames.count_copy(rgb)
+            if config.roi is not None:
+                with self._lock:
+                    self._roi_windows[timestamp_ms] = (window, frame.shape)
+            state.clock.lap("convert")
+            self.source.detect_async(rgb, timestamp_ms)
+            self.controls.frames.release(rgb)
+        with self._lock:
+            result_state = self._latest
+        _carry_over(state, result_state)
+        state.status_lines = self.in_flight.hud_lines() + _status_lines(
+            config.roi, config.scheduler, config.hands
+        )
+        return state
+
+    def on_result(self, observations: list[HandObservation], timestamp_ms: int) -> None:
+        """Result callback for asynchronous sources; the capture loop never waits on it."""
+        now_ms = self._timestamp_ms(time.monotonic())
+        if not self.in_flight.complete(timestamp_ms, now_ms):
+            return
+        state = FrameState(None, self.start + timestamp_ms / 1000.0, self.controls.clock())
+        if self.controls.metrics is not None:
+            # Submit-to-callback time: queueing inside the source plus the model itself.
+            self.controls.metrics.record("inference", time.monotonic() - state.captured_at)
+        window = shape = None
+        if self.config.roi is not None:
+            with self._lock:
+                window, shape = self._roi_windows.pop(timestamp_ms)
+                for ts in [ts for ts in self._roi_windows if ts < timestamp_ms]:
+                    del self._roi_windows[ts]
+        self.apply(state, observations, window, shape)
+
+    def process_observations(
+        self, observations: list[HandObservation], captured_at: float
+    ) -> FrameState:
+        """One frame from a source without camera images."""
+        state = FrameState(None, captured_at, self.controls.clock())
+        if not self._skipped(state):
+            self.apply(state, observations, None, None)
+        return state
+
+    def apply(
+        self, state: FrameState, observations: list[HandObservation], window, frame_shape
+    ) -> None:
+        """Run one frame's hands through the gates and activity tracking."""
+        config = self.config
+        controls = self.controls
+        self.frames_processed += 1
+        if config.hands is not None:
+            if not self.source.selfie_view:
+                observations = _mirrored(observations)
+            _update_hands(state, observations, config.hands, controls)
+            _observe_schedule(config.scheduler, state, self.hold_gate, self.tracker, config.hands)
+        else:
+            landmarks = handedness = None
+            confidence = 1.0
+            if observations:
+                first = observations[0]
+                landmarks, handedness, confidence = (
+                    first.landmarks, first.handedness, first.confidence
+                )
+            landmarks = _track_roi(config.roi, window, landmarks, frame_shape)
+            state.hand = landmarks
+            if not self.source.selfie_view:
+                landmarks = mirror_landmarks(landmarks)
+                handedness = mirror_handedness(handedness)
+            held_gesture = _update_gates(
+                state,
+                landmarks,
+                handedness,
+                self.smoother,
+                self.hold_gate,
+                controls,
+                config.recorder,
+                confidence,
+                config.landmark_filter,
+            )
+            handle_activity_update(held_gesture, self.tracker, state.captured_at)
+            _observe_schedule(config.scheduler, state, self.hold_gate, self.tracker)
+        state.status_lines = _status_lines(config.roi, config.scheduler, config.hands)
+        state.clock.lap("gate")
+        with self._lock:
+            self._latest = state
+        if config.startup is not None and self.frames_processed == 1 and config.console:
+            config.startup.mark("first_frame")
+            print(config.startup.summary(), flush=True)
+
+    def render(self, state: FrameState, stats: Optional[PipelineStats]) -> bool:
+        hands = self.config.hands
+        frames = self.controls.frames
+        captured = state.frame
+        if hands is None and state.hand is not None:
+            draw_landmark_points(captured, state.hand)
+        state.frame = frames.mirror(captured)
+        frames.release(captured)
+        if hands is not None:
+            draw_hand_labels(state.frame, state.hands)
+        try:
+            return _present(state, hands or self.tracker, self.controls, stats)
+        finally:
+            self.discard(state)
+
+    def discard(self, state: FrameState) -> None:
+        """Give the state's frame buffer back to the pool."""
+        self.controls.frames.release(state.frame)
+        state.frame = None
+
+    def render_headless(self, state: FrameState, stats: Optional[PipelineStats]) -> bool:
+        """No HUD or window, only latency bookkeeping."""
+        self.discard(state)
+        now = time.monotonic()
+        if stats is not None:
+            stats.observe_latency(state.captured_at, now)
+        metrics = self.controls.metrics
+        if metrics is not None:
+            metrics.record("end_to_end", now - state.captured_at)
+            metrics.maybe_report(now)
+        return True
+
+    def subscribe_gestures(self, listener: Callable[[Optional[str]], None]) -> None:
+        """Call ``listener`` on the frame thread whenever the smoothed gesture changes."""
+        self.controls.gesture_listeners.append(listener)
+
+    def load(self, background: bool = False) -> None:
+        """Open and warm up the source; with ``background``, ``run`` waits for it."""
+        self._loader = SourceLoader(self.source, self.on_result)
+        if background:
+            self._loader.start()
+
+    def wait_loaded(self) -> None:
+        """Block until the source is open, loading it here if ``load`` was not called."""
+        if self._loader is None:
+            self.load()
+        self._loader.wait()
+
+    def run(self, cap: Optional[cv2.VideoCapture] = None) -> None:
+        """Load the source, run until it ends or the user quits, then print summaries."""
+        source = self.source
+        render = self.render_headless if self.headless else self.render
+        if isinstance(cap, Capture):
+            self.controls.capture = cap.stats
+        self.wait_loaded()
+        loader = self._loader
+        startup = self.config.startup
+        if startup is not None:
+            startup.mark("backend", loader.loaded_at)
+            startup.record("backend_load", loader.load_seconds)
+            startup.record("backend_wait", loader.wait_seconds)
+        try:
+            if not source.needs_frames:
+                for captured_at, observations in source.frames():
+                    if not render(self.process_observations(observations, captured_at), None):
+                        break
+            else:
+                process = self.process_async if source.asynchronous else self.process
+                self.pipeline_stats = _run_frames(
+                    cap, process, render, self.config.threaded, self.controls, self.discard
+                )
+        finally:
+            source.close()
+            # A quit or the end of the stream closes the running session for every listener.
+            self.tracker.stop(self._latest.captured_at)
+            if self.config.hands is not None:
+                self.config.hands.stop(self._latest.captured_at)
+        if self.config.console:
+            for line in self.summary_lines():
+                print(line, flush=True)
+
+    def summary_lines(self) -> list[str]:
+        lines = []
+        if self.pipeline_stats is not None:
+            lines.append(self.pipeline_stats.summary())
+        if self.config.metrics is not None and self.source.needs_frames:
+            lines.append(self.controls.frames.summary())
+        if self.controls.capture is not None:
+            lines.append(self.controls.capture.summary())
+        if self.source.asynchronous:
+            lines.append(self.in_flight.summary())
+        if self.config.roi is not None:
+            lines.append(self.config.roi.summary())
+        if self.config.scheduler is not None:
+            lines.append(self.config.scheduler.summary())
+        return lines
@@ -0,0 +1,257 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import Iterator, Optional
+
+from observer.history import HistoryStore
+
+_STOP = object()
+
+
+def read_events(path: str) -> Iterator[dict]:
+    """Yield events from a JSONL log, skipping a torn final line after a crash."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(event, dict) and "ts" in event:
+                yield event
+
+
+def _truncate_torn_tail(path: str) -> None:
+    # A crash mid-write leaves a partial last line; appending after it would
+    # corrupt the next event too.
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        keep = 0
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            index = f.read(step).rfind(b"\n")
+            if index >= 0:
+                keep = position + index + 1
+                break
+        f.truncate(keep)
+
+
+class RecoveredState:
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = {}
+        self.events = 0
+        self.last_ts: Optional[float] = None
+        # Activity left open by a crash, and the last time it was seen alive.
+        self.dangling: Optional[str] = None
+        self.dangling_until: Optional[float] = None
+
+
+def rebuild_totals(events) -> RecoveredState:
+    state = RecoveredState()
+    active: Optional[str] = None
+    since = 0.0
+    for event in events:
+        state.events += 1
+        ts = float(event["ts"])
+        state.last_ts = ts if state.last_ts is None else max(state.last_ts, ts)
+        if event.get("type") != "switch":
+            continue
+        if active is not None:
+            state.totals[active] = state.totals.get(active, 0.0) + max(0.0, ts - since)
+        active = event.get("to")
+        since = ts
+    if active is not None and state.last_ts is not None:
+        state.totals[active] = state.totals.get(active, 0.0) + max(0.0, state.last_ts - since)
+        state.dangling = active
+        state.dangling_until = state.last_ts
+    return state
+
+
+class EventLog:
+    """Append-only JSONL log of activity switches, written off the frame thread.
+
+    ``record_switch`` (which ``attach`` subscribes to a tracker's switches)
+    only enqueues. A writer thread appends lines, fsyncs in
+    batches, and writes heartbeats while an activity is running, so a crash loses
+    at most one heartbeat interval of time. ``close`` ends a still-running
+    activity with a final switch, so a clean quit is not mistaken for a crash.
+    With ``history_path``, the writer also adds each session to that
+    ``HistoryStore`` once its closing switch is synced. If the writer fails,
+    its exception is kept in ``error`` and later switches are counted in
+    ``lost`` instead of being queued.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_interval: float = 1.0,
+        heartbeat_interval: float = 30.0,
+        history_path: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.history_path = history_path
+        self.history_error: Optional[BaseException] = None
+        self.fsync_interval = fsync_interval
+        self.heartbeat_interval = heartbeat_interval
+        _truncate_torn_tail(path)
+        self.recovered = rebuild_totals(read_events(path))
+        self.written = 0
+        self.lost = 0
+        self.error: Optional[BaseException] = None
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._active: Optional[str] = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        if self.recovered.dangling is not None:
+            # Close the activity a crash left open, at the last time it was seen.
+            self._write(
+                {
+                    "type": "switch",
+                    "ts": self.recovered.dangling_until,
+                    "from": self.recovered.dangling,
+                    "to": None,
+                    "recovered": True,
+                }
+            )
+            self._sync()
+        self._thread = threading.Thread(target=self._run, name="observer-eventlog", daemon=True)
+        self._thread.start()
+
+    def record_switch(
+        self, previous: Optional[str], current: Optional[str], ts: Optional[float] = None
+    ) -> None:
+        if self.error is not None:
+            # The writer thread is gone; nothing would ever take this off the queue.
+            self.lost += 1
+            return
+        self._queue.put(
+            {
+                "type": "switch",
+                "ts": time.time() if ts is None else ts,
+                "from": previous,
+                "to": current,
+            }
+        )
+
+    def attach(self, tracker) -> None:
+        """Record every switch ``tracker`` makes, including the final stop."""
+        tracker.subscribe(self._on_event)
+
+    def _on_event(self, event: dict) -> None:
+        if event["type"] == "switch":
+            self.record_switch(event["from"], event["to"], event["ts"])
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.error is not None:
+            # Whatever the writer did not get to is lost with it.
+            while not self._queue.empty():
+                if self._queue.get_nowait() is not _STOP:
+                    self.lost += 1
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            return
+        self._sync()
+        self._file.close()
+
+    def _write(self, event: dict) -> None:
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self.written += 1
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _ingest(self, store: Optional[HistoryStore]) -> Optional[HistoryStore]:
+        # History is a convenience on top of the log; a failure only stops it.
+        if store is None:
+            return None
+        try:
+            store.ingest_event_log(self.path)
+        except Exception as exc:
+            self.history_error = exc
+            store.close()
+            return None
+        return store
+
+    def _run(self) -> None:
+        dirty = False
+        closed_session = False
+        last_sync = time.monotonic()
+        next_heartbeat = last_sync + self.heartbeat_interval
+        store = None
+        try:
+            if self.history_path is not None:
+                try:
+                    # SQLite connections stay on the thread that opened them.
+                    store = HistoryStore(self.history_path)
+                except Exception as exc:
+                    self.history_error = exc
+            store = self._ingest(store)
+            while True:
+                timeout = self.fsync_interval if dirty else self.heartbeat_interval
+                try:
+                    event = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    event = None
+                if event is _STOP:
+                    break
+                if event is not None:
+                    self._write(event)
+                    closed_session = closed_session or self._active is not None
+                    self._active = event.get("to")
+                    dirty = True
+                now = time.monotonic()
+                if self._active is not None and now >= next_heartbeat:
+                    self._write({"type": "heartbeat", "ts": time.time(), "active": self._active})
+                    dirty = True
+                if now >= next_heartbeat:
+                    next_heartbeat = now + self.heartbeat_interval
+                if dirty and now - last_sync >= self.fsync_interval:
+                    self._sync()
+                    dirty = False
+                    last_sync = now
+                    if closed_session:
+                        store = self._ingest(store)
+                        closed_session = False
+            while True:
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if event is not _STOP:
+                    self._write(event)
+                    self._active = event.get("to")
+            if self._active is not None:
+                self._write({"type": "switch", "ts": time.time(), "from": self._active, "to": None})
+                self._active = None
+            if store is not None:
+                self._sync()
+                store = self._ingest(store)
+        except BaseException as exc:  # never take down the frame loop
+            self.error = exc
+        finally:
+            if store is not None:
+                store.close()
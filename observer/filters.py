@@ -0,0 +1,152 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from observer.roi import Point
+
+
+class OneEuroFilter:
+    """One-Euro filter over a whole (21, 3) landmark array at once.
+
+    Each coordinate is low-pass filtered with a cutoff that rises with its own
+    speed: ``min_cutoff`` Hz when the hand is still (jitter is smoothed away) and
+    ``min_cutoff + beta * speed`` when it moves (little lag). Speeds are in
+    normalized image units per second. A gap longer than ``max_gap`` seconds
+    starts over from the next measurement.
+    """
+
+    def __init__(
+        self,
+        min_cutoff: float = 1.0,
+        beta: float = 10.0,
+        d_cutoff: float = 1.0,
+        max_gap: float = 0.5,
+    ) -> None:
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self) -> None:
+        self._value: Optional[np.ndarray] = None
+        self._speed: Optional[np.ndarray] = None
+        self._time = 0.0
+
+    def filter(self, points: np.ndarray, now: float) -> np.ndarray:
+        dt = now - self._time
+        if self._value is None or not 0.0 < dt <= self.max_gap:
+            self._value = np.array(points, dtype=np.float64)
+            self._speed = np.zeros_like(self._value)
+            self._time = now
+            return self._value
+        speed = (points - self._value) / dt
+        self._speed += _alpha(self.d_cutoff, dt) * (speed - self._speed)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._speed)
+        # alpha = 1 / (1 + tau / dt) with tau = 1 / (2 pi cutoff), per coordinate.
+        alpha = cutoff / (cutoff + 1.0 / (2.0 * math.pi * dt))
+        self._value = self._value + alpha * (points - self._value)
+        self._time = now
+        return self._value
+
+
+class KalmanLandmarkFilter:
+    """Constant-velocity Kalman filter run independently for every coordinate.
+
+    The 2x2 covariance of each (position, velocity) pair is kept as three
+    arrays, so one frame is a handful of element-wise operations on (21, 3)
+    arrays. ``accel_noise`` is the white-acceleration spectral density and
+    ``measurement_noise`` the landmark jitter variance, both in normalized image
+    units.
+    """
+
+    def __init__(
+        self,
+        accel_noise: float = 0.2,
+        measurement_noise: float = 1e-4,
+        max_gap: float = 0.5,
+    ) -> None:
+        self.accel_noise = accel_noise
+        self.measurement_noise = measurement_noise
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self) -> None:
+        self._value: Optional[np.ndarray] = None
+        self._time = 0.0
+
+    def filter(self, points: np.ndarray, now: float) -> np.ndarray:
+        dt = now - self._time
+        if self._value is None or not 0.0 < dt <= self.max_gap:
+            self._value = np.array(points, dtype=np.float64)
+            self._velocity = np.zeros_like(self._value)
+            self._p00 = np.full_like(self._value, self.measurement_noise)
+            self._p01 = np.zeros_like(self._value)
+            self._p11 = np.full_like(self._value, 1.0)
+            self._time = now
+            return self._value
+        q = self.accel_noise
+        p00, p01, p11 = self._p00, self._p01, self._p11
+        # Predict.
+        value = self._value + self._velocity * dt
+        p00 = p00 + dt * (2.0 * p01 + dt * p11) + q * dt**3 / 3.0
+        p01 = p01 + dt * p11 + q * dt**2 / 2.0
+        p11 = p11 + q * dt
+        # Update with the measured position.
+        innovation = points - value
+        gain_p = p00 / (p00 + self.measurement_noise)
+        gain_v = p01 / (p00 + self.measurement_noise)
+        self._value = value + gain_p * innovation
+        self._velocity = self._velocity + gain_v * innovation
+        self._p11 = p11 - gain_v * p01
+        self._p01 = (1.0 - gain_p) * p01
+        self._p00 = (1.0 - gain_p) * p00
+        self._time = now
+        return self._value
+
+
+def _alpha(cutoff: float, dt: float) -> float:
+    return 1.0 / (1.0 + 1.0 / (2.0 * math.pi * cutoff * dt))
+
+
+LANDMARK_FILTERS = ("none", "one-euro", "kalman")
+
+
+def make_landmark_filter(kind: str = "none"):
+    """Build a landmark filter by name; ``none`` returns ``None``."""
+    if kind == "none":
+        return None
+    if kind == "one-euro":
+        return OneEuroFilter()
+    if kind == "kalman":
+        return KalmanLandmarkFilter()
+    raise ValueError(f"Unknown landmark filter: {kind}")
+
+
+def filter_landmarks(landmark_filter, landmarks, now: float) -> Optional[list[Point]]:
+    """Filter one frame's landmarks; ``None`` (hand lost) resets the filter."""
+    if landmarks is None:
+        landmark_filter.reset()
+        return None
+    if isinstance(landmarks, np.ndarray):
+        points = landmarks
+    else:
+        # A flat list builds faster than landmarks_to_array's list of tuples.
+        flat: list[float] = []
+        for lm in landmarks:
+            flat += (lm.x, lm.y, lm.z)
+        points = np.array(flat).reshape(-1, 3)
+    points = landmark_filter.filter(points, now)
+    return [Point(x, y, z) for x, y, z in points.tolist()]
+
+
+def filter_sequence(landmark_filter, times, present, points: np.ndarray) -> np.ndarray:
+    """Filter (N, 21, 3) recorded frames in order; frames without a hand reset it."""
+    filtered = np.array(points, dtype=np.float64)
+    for i, (now, hand) in enumerate(zip(times, present)):
+        if hand:
+            filtered[i] = landmark_filter.filter(filtered[i], now)
+        else:
+            landmark_filter.reset()
+    return filtered
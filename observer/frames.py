@@ -0,0 +1,131 @@
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from observer.roi import Point
+
+_MIRRORED_HANDEDNESS = {"Left": "Right", "Right": "Left"}
+
+
+def mirror_landmarks(landmarks) -> Optional[list[Point]]:
+    """Mirror normalized landmarks horizontally (x -> 1 - x)."""
+    if landmarks is None:
+        return None
+    return [Point(1.0 - lm.x, lm.y, lm.z) for lm in landmarks]
+
+
+def mirror_handedness(handedness: Optional[str]) -> Optional[str]:
+    return _MIRRORED_HANDEDNESS.get(handedness, handedness)
+
+
+class FramePool:
+    """Reusable frame buffers for capture, colour conversion and display.
+
+    Frames are read, converted and mirrored into buffers from the pool through
+    OpenCV ``dst`` outputs instead of allocating new arrays every frame. A
+    buffer handed out by ``take``, ``read``, ``to_rgb`` or ``mirror`` belongs to
+    the caller until it passes it to ``release``; views of it (ROI crops) must
+    not be used after that. Releasing an array the pool did not hand out, such
+    as a one-off or ``None``, does nothing. When every buffer is in use and the
+    pool is at ``max_buffers``, a one-off array is allocated and counted in
+    ``unpooled``. Copies made outside the pool, such as MediaPipe's copy of
+    each model input, are reported through ``count_copy``.
+    """
+
+    def __init__(self, max_buffers: int = 12) -> None:
+        self.max_buffers = max_buffers
+        self.buffers: list[np.ndarray] = []
+        self.free: list[np.ndarray] = []
+        self.taken = 0
+        self.allocated = 0
+        self.allocated_bytes = 0
+        self.unpooled = 0
+        self.copied = 0
+        self.copied_bytes = 0
+        self.frame_shape: Optional[tuple] = None
+        # Buffers handed out and not yet released, by id.
+        self._in_use: dict[int, np.ndarray] = {}
+        # Capture, inference and render threads take and release concurrently.
+        self._lock = threading.Lock()
+
+    def take(self, shape: tuple, dtype=np.uint8) -> np.ndarray:
+        with self._lock:
+            self.taken += 1
+            free = self.free
+            for index in range(len(free)):
+                buffer = free[index]
+                if buffer.shape == shape and buffer.dtype == dtype:
+                    del free[index]
+                    self._in_use[id(buffer)] = buffer
+                    return buffer
+            buffer = np.empty(shape, dtype=dtype)
+            self.allocated += 1
+            self.allocated_bytes += buffer.nbytes
+            if len(self.buffers) >= self.max_buffers and free:
+                # Shape changed (ROI crop, new camera mode): replace an idle buffer.
+                idle = free.pop(0)
+                self.buffers = [b for b in self.buffers if b is not idle]
+            if len(self.buffers) < self.max_buffers:
+                self.buffers.append(buffer)
+                self._in_use[id(buffer)] = buffer
+            else:
+                self.unpooled += 1
+            return buffer
+
+    def release(self, buffer: Optional[np.ndarray]) -> None:
+        """Give ``buffer`` back for reuse; the caller must not touch it afterwards."""
+        if buffer is None:
+            return
+        with self._lock:
+            if self._in_use.pop(id(buffer), None) is not None:
+                self.free.append(buffer)
+
+    @property
+    def in_use(self) -> int:
+        return len(self._in_use)
+
+    def read(self, cap) -> tuple[bool, Optional[np.ndarray]]:
+        """``cap.read()`` into a pooled buffer once the frame size is known."""
+        if self.frame_shape is None:
+            ok, frame = cap.read()
+        else:
+            buffer = self.take(self.frame_shape)
+            ok, frame = cap.read(buffer)
+            if not ok or frame is not buffer:
+                # Nothing read, or the camera changed mode and OpenCV allocated anew.
+                self.release(buffer)
+        if ok and frame.shape != self.frame_shape:
+            self.frame_shape = frame.shape
+        return ok, frame
+
+    def mirror(self, frame) -> np.ndarray:
+        """The selfie view of ``frame`` for display."""
+        return cv2.flip(frame, 1, dst=self.take(frame.shape))
+
+    def to_rgb(self, image) -> np.ndarray:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.take(image.shape))
+
+    def count_copy(self, image: np.ndarray) -> None:
+        self.copied += 1
+        self.copied_bytes += image.nbytes
+
+    @property
+    def reuse_rate(self) -> float:
+        return 1.0 - self.allocated / self.taken if self.taken else 0.0
+
+    def hud_lines(self) -> list[str]:
+        return [
+            f"Frames: {len(self.buffers)} buffers  alloc={self.allocated} "
+            f"reuse={self.reuse_rate:.1%}"
+        ]
+
+    def summary(self) -> str:
+        pooled = sum(buffer.nbytes for buffer in self.buffers)
+        return (
+            f"FRAMES taken={self.taken} allocated={self.allocated} "
+            f"allocated_mb={self.allocated_bytes / 1e6:.1f} reuse={self.reuse_rate:.1%} "
+            f"buffers={len(self.buffers)} pooled_mb={pooled / 1e6:.1f} unpooled={self.unpooled} "
+            f"copied={self.copied} copied_mb={self.copied_bytes / 1e6:.1f}"
+        )
@@ -1,23 +1,128 @@
-from collections import Counter, deque
+from collections import deque
 from typing import Optional
 
 
 class GestureSmoother:
+    """Majority vote over the last ``window`` frames with running counts.
+
+    Counts are updated on append and eviction, so an update touches one or two
+    entries regardless of the window size.
+    """
+
     def __init__(self, window: int = 7, min_count: int = 5) -> None:
+        if window < 1:
+            raise ValueError("Smoothing window must be at least 1 frame")
         self.history = deque(maxlen=window)
+        self.counts: dict[str, int] = {}
         self.min_count = min_count
 
-    def update(self, gesture: Optional[str]) -> Optional[str]:
-        self.history.append(gesture)
-        votes = Counter(g for g in self.history if g is not None)
-        if not votes:
-            return None
-        winner, count = votes.most_common(1)[0]
-        if count >= self.min_count:
+    def update(self, gesture: Optional[str], confidence: float = 1.0) -> Optional[str]:
+        history = self.history
+        counts = self.counts
+        if len(history) == history.maxlen:
+            evicted = history[0]
+            if evicted is not None:
+                remaining = counts[evicted] - 1
+                if remaining:
+                    counts[evicted] = remaining
+                else:
+                    del counts[evicted]
+        history.append(gesture)
+        if gesture is not None:
+            counts[gesture] = counts.get(gesture, 0) + 1
+        winner = None
+        best = 0
+        for candidate, count in counts.items():
+            if count > best:
+                winner, best = candidate, count
+        if best >= self.min_count:
             return winner
         return None
 
 
+class WeightedGestureSmoother:
+    """Windowed vote where each frame counts with its detection confidence."""
+
+    def __init__(self, window: int = 7, min_weight: float = 4.0) -> None:
+        if window < 1:
+            raise ValueError("Smoothing window must be at least 1 frame")
+        self.history = deque(maxlen=window)
+        self.weights: dict[str, float] = {}
+        self.min_weight = min_weight
+
+    def update(self, gesture: Optional[str], confidence: float = 1.0) -> Optional[str]:
+        history = self.history
+        weights = self.weights
+        if len(history) == history.maxlen:
+            evicted, evicted_weight = history[0]
+            if evicted is not None:
+                remaining = weights[evicted] - evicted_weight
+                if remaining > 1e-9:
+                    weights[evicted] = remaining
+                else:
+                    del weights[evicted]
+        history.append((gesture, confidence))
+        if gesture is not None:
+            weights[gesture] = weights.get(gesture, 0.0) + confidence
+        winner = None
+        best = 0.0
+        for candidate, weight in weights.items():
+            if weight > best:
+                winner, best = candidate, weight
+        if best >= self.min_weight:
+            return winner
+        return None
+
+
+class DecayedGestureSmoother:
+    """Exponentially decayed vote with no fixed window.
+
+    Each frame's vote halves in weight every ``half_life`` frames. A gesture wins
+    once its score reaches ``min_share`` of the score a gesture would have after
+    showing on every frame indefinitely.
+    """
+
+    def __init__(self, half_life: float = 3.0, min_share: float = 0.6) -> None:
+        if half_life <= 0:
+            raise ValueError("Smoothing half-life must be positive")
+        self.decay = 0.5 ** (1.0 / half_life)
+        self.threshold = min_share / (1.0 - self.decay)
+        self.scores: dict[str, float] = {}
+
+    def update(self, gesture: Optional[str], confidence: float = 1.0) -> Optional[str]:
+        scores = self.scores
+        decay = self.decay
+        # The gesture vocabulary is small and fixed, so keys are never removed.
+        for candidate, score in scores.items():
+            scores[candidate] = score * decay
+        if gesture is not None:
+            scores[gesture] = scores.get(gesture, 0.0) + confidence
+        winner = None
+        best = 0.0
+        for candidate, score in scores.items():
+            if score > best:
+                winner, best = candidate, score
+        if best >= self.threshold:
+            return winner
+        return None
+
+
+SMOOTHING_STRATEGIES = ("count", "weighted", "decay")
+
+
+def make_smoother(strategy: str = "count", window: int = 7):
+    """Build a smoother whose acceptance roughly matches the default 5-of-7 rule."""
+    if window < 1:
+        raise ValueError(f"Smoothing window must be at least 1 frame, got {window}")
+    if strategy == "count":
+        return GestureSmoother(window, min_count=max(1, round(window * 5 / 7)))
+    if strategy == "weighted":
+        return WeightedGestureSmoother(window, min_weight=window * 4 / 7)
+    if strategy == "decay":
+        return DecayedGestureSmoother(half_life=max(1.0, window * 3 / 7))
+    raise ValueError(f"Unknown smoothing strategy: {strategy}")
+
+
 class GestureHoldGate:
     def __init__(self, min_hold_seconds: float = 1.5) -> None:
         self.min_hold_seconds = min_hold_seconds
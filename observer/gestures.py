@@ -1,12 +1,10 @@
 import math
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from observer.constants import (
-    GESTURE_ILY,
-    GESTURE_ONE_FINGER,
-    GESTURE_OPEN_PALM,
-    GESTURE_TWO_FINGERS,
-)
+from observer.rules import DEFAULT_RULESET
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 def dist(a, b) -> float:
@@ -45,6 +43,7 @@ def thumb_extended_for_ily(landmarks) -> bool:
 
 
 def _atomic_flags(landmarks) -> dict[str, bool]:
+    # Plain-Python reference for the default rules in observer/rules.py.
     index_up = finger_extended(landmarks, 8, 6, 5)
     middle_up = finger_extended(landmarks, 12, 10, 9)
     ring_up = finger_extended(landmarks, 16, 14, 13)
@@ -85,74 +84,11 @@ def _atomic_flags(landmarks) -> dict[str, bool]:
 
 
 def gesture_checklines(landmarks) -> list[str]:
-    f = _atomic_flags(landmarks)
-    checks = [
-        (
-            "OPEN",
-            f["four_fingers_up"] and f["thumb_away_from_palm"],
-            [("4UP", f["four_fingers_up"]), ("TH_AWAY", f["thumb_away_from_palm"])],
-        ),
-        (
-            "ILY",
-            f["index_up"]
-            and f["pinky_up"]
-            and (not f["middle_up"])
-            and (not f["ring_up"])
-            and (f["thumb_side"] or f["thumb_ily"]),
-            [
-                ("IDX", f["index_up"]),
-                ("PNK", f["pinky_up"]),
-                ("MID_DN", not f["middle_up"]),
-                ("RNG_DN", not f["ring_up"]),
-                ("TH", f["thumb_side"] or f["thumb_ily"]),
-            ],
-        ),
-        (
-            "ONE",
-            f["index_up"] and f["three_curled"] and f["thumb_near_palm"],
-            [
-                ("IDX", f["index_up"]),
-                ("3CURL", f["three_curled"]),
-                ("TH_NEAR", f["thumb_near_palm"]),
-            ],
-        ),
-        (
-            "TWO",
-            f["index_up"] and f["middle_up"] and f["two_curled"] and f["thumb_near_palm"],
-            [
-                ("IDX", f["index_up"]),
-                ("MID", f["middle_up"]),
-                ("2CURL", f["two_curled"]),
-                ("TH_NEAR", f["thumb_near_palm"]),
-            ],
-        ),
-    ]
-    lines = []
-    for name, matched, parts in checks:
-        prefix = "*" if matched else "-"
-        status = " ".join(f"{k}:{'T' if v else 'F'}" for k, v in parts)
-        lines.append(f"{prefix}{name} {status}")
-    return lines
+    return DEFAULT_RULESET.classify(landmarks)[1]
 
 
 def detect_gesture(landmarks) -> Optional[str]:
-    f = _atomic_flags(landmarks)
-
-    if f["four_fingers_up"] and f["thumb_away_from_palm"]:
-        return GESTURE_OPEN_PALM
-    if (
-        f["index_up"]
-        and f["pinky_up"]
-        and not f["middle_up"]
-        and not f["ring_up"]
-        and (f["thumb_side"] or f["thumb_ily"])
-    ):
-        return GESTURE_ILY
-    if f["index_up"] and f["three_curled"] and f["thumb_near_palm"]:
-        return GESTURE_ONE_FINGER
-    if f["index_up"] and f["middle_up"] and f["two_curled"] and f["thumb_near_palm"]:
-        return GESTURE_TWO_FINGERS
-    return None
+    return DEFAULT_RULESET.detect(landmarks)
 
 
 def palm_facing_camera(landmarks, handedness_label: Optional[str]) -> bool:
@@ -186,3 +122,50 @@ def outside_of_hand_showing(landmarks, handedness_label: Optional[str]) -> bool:
 
     # Unknown handedness: only block when depth strongly indicates outside hand.
     return depth_score > 0.0
+
+
+def landmarks_to_array(landmarks) -> "np.ndarray":
+    import numpy as np  # the batch helpers only; the per-frame checks stay pure Python
+
+    if isinstance(landmarks, np.ndarray):
+        return landmarks.astype(np.float32, copy=False)
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+def atomic_flags_array(points: "np.ndarray") -> dict[str, "np.ndarray"]:
+    """Batch form of ``_atomic_flags``: each flag is a bool array over the leading axes."""
+    return DEFAULT_RULESET.features_batch(points)
+
+
+def classify_landmarks(landmarks) -> tuple[Optional[str], list[str]]:
+    """Classify one hand and build its debug checklines from a single feature pass."""
+    return DEFAULT_RULESET.classify(landmarks)
+
+
+def outside_of_hand_showing_batch(points: "np.ndarray", handedness_codes) -> "np.ndarray":
+    """Batch form of ``outside_of_hand_showing`` over (N, 21, 3) arrays.
+
+    ``handedness_codes`` indexes ``HANDEDNESS_LABELS`` (0 unknown, 1 Left, 2 Right).
+    """
+    import numpy as np
+
+    p = np.asarray(points, dtype=np.float64)
+    codes = np.asarray(handedness_codes)
+    v1 = p[..., 5, :2] - p[..., 0, :2]
+    v2 = p[..., 17, :2] - p[..., 0, :2]
+    normal_z = (v1[..., 0] * v2[..., 1]) - (v1[..., 1] * v2[..., 0])
+    depth_score = (
+        (p[..., 8, 2] - p[..., 5, 2])
+        + (p[..., 12, 2] - p[..., 9, 2])
+        + (p[..., 20, 2] - p[..., 17, 2])
+    ) / 3.0
+    depth_ok = depth_score > -0.02
+    return np.select(
+        [codes == 2, codes == 1],
+        [(normal_z > 0.01) & depth_ok, (normal_z < -0.01) & depth_ok],
+        default=depth_score > 0.0,
+    )
+
+
+def detect_gesture_batch(points: "np.ndarray") -> list[Optional[str]]:
+    return DEFAULT_RULESET.detect_batch(points)
@@ -0,0 +1,248 @@
+import math
+from typing import Callable, Optional
+
+from observer.activity import ActivityTracker, Listener
+from observer.filters import filter_landmarks
+from observer.gates import GestureHoldGate, GestureSmoother
+from observer.gestures import palm_facing_camera
+from observer.rules import DEFAULT_RULESET, RuleSet
+
+
+def palm_position(landmarks) -> tuple[float, float, float]:
+    """Palm centre ``(x, y)`` and palm length (wrist to middle knuckle) of one hand.
+
+    Uses the wrist and the four knuckles, which move with the hand and not with
+    the gesture.
+    """
+    wrist, index, middle, ring, pinky = (
+        landmarks[0], landmarks[5], landmarks[9], landmarks[13], landmarks[17]
+    )
+    x = (wrist.x + index.x + middle.x + ring.x + pinky.x) * 0.2
+    y = (wrist.y + index.y + middle.y + ring.y + pinky.y) * 0.2
+    return x, y, math.hypot(middle.x - wrist.x, middle.y - wrist.y)
+
+
+class HandObservation:
+    __slots__ = ("landmarks", "handedness", "confidence")
+
+    def __init__(
+        self, landmarks, handedness: Optional[str] = None, confidence: float = 1.0
+    ) -> None:
+        self.landmarks = landmarks
+        self.handedness = handedness
+        self.confidence = confidence
+
+
+class TrackedHand:
+    """Gate and activity state for one hand identity."""
+
+    def __init__(
+        self,
+        hand_id: int,
+        smoother,
+        hold_gate: GestureHoldGate,
+        tracker: ActivityTracker,
+        landmark_filter=None,
+    ) -> None:
+        self.hand_id = hand_id
+        self.smoother = smoother
+        self.hold_gate = hold_gate
+        self.tracker = tracker
+        self.landmark_filter = landmark_filter
+        self.x = 0.0
+        self.y = 0.0
+        self.scale = 0.0
+        self.handedness: Optional[str] = None
+        self.last_seen = 0.0
+        self.landmarks = None
+        self.gesture: Optional[str] = None
+        self.stable_gesture: Optional[str] = None
+        self.palm_ok = False
+        self.debug_lines: list[str] = []
+
+    def observe(self, observation: HandObservation, position, now: float) -> None:
+        self.x, self.y, self.scale = position
+        self.handedness = observation.handedness
+        self.landmarks = observation.landmarks
+        self.last_seen = now
+
+
+class HandRegistry:
+    """Keeps hand identities across frames and one gate/tracker stack per identity.
+
+    Each frame's hands are matched greedily to known identities by palm-centre
+    distance in palm lengths, with a penalty for a handedness change. A hand that
+    matches nothing within ``max_jump`` gets a new identity. Identities unseen for
+    ``forget_after`` seconds are retired and their time moves into
+    ``retired_totals``. At most ``max_hands`` observations and ``2 * max_hands``
+    identities are considered, so the cost per frame does not grow with the
+    number of people who have passed the camera. ``listener_factory``, if set,
+    is called with each new identity's id and its result subscribed to that
+    identity's tracker.
+    """
+
+    def __init__(
+        self,
+        max_hands: int = 2,
+        rules: RuleSet = DEFAULT_RULESET,
+        smoother_factory=GestureSmoother,
+        hold_seconds: float = 1.5,
+        filter_factory=None,
+        max_jump: float = 2.0,
+        handedness_penalty: float = 1.0,
+        forget_after: float = 5.0,
+    ) -> None:
+        if max_hands < 1:
+            raise ValueError("max_hands must be at least 1")
+        self.max_hands = max_hands
+        self.max_identities = 2 * max_hands
+        self.rules = rules
+        self.smoother_factory = smoother_factory
+        self.hold_seconds = hold_seconds
+        self.filter_factory = filter_factory
+        self.max_jump = max_jump
+        self.handedness_penalty = handedness_penalty
+        self.forget_after = forget_after
+        self.listener_factory: Optional[Callable[[int], Listener]] = None
+        self.hands: dict[int, TrackedHand] = {}
+        self.retired_totals = {activity: 0.0 for activity in rules.activities}
+        self._next_id = 1
+        self._retired: list[TrackedHand] = []
+
+    def _new_hand(self) -> TrackedHand:
+        if len(self.hands) >= self.max_identities:
+            # Make room by dropping the identity that has been gone the longest.
+            oldest = min(self.hands.values(), key=lambda hand: hand.last_seen)
+            self._retire(oldest)
+        tracker = ActivityTracker(
+            activity_by_gesture=self.rules.activity_by_gesture,
+            stop_gestures=self.rules.stop_gestures,
+        )
+        if self.listener_factory is not None:
+            tracker.subscribe(self.listener_factory(self._next_id))
+        hand = TrackedHand(
+            self._next_id,
+            self.smoother_factory(),
+            GestureHoldGate(self.hold_seconds),
+            tracker,
+            self.filter_factory() if self.filter_factory is not None else None,
+        )
+        self.hands[hand.hand_id] = hand
+        self._next_id += 1
+        return hand
+
+    def _retire(self, hand: TrackedHand) -> None:
+        # The identity is gone for good: its tracker's listeners get the closing switch.
+        hand.tracker.stop(hand.last_seen)
+        for activity, seconds in hand.tracker.snapshot(hand.last_seen).items():
+            self.retired_totals[activity] = self.retired_totals.get(activity, 0.0) + seconds
+        del self.hands[hand.hand_id]
+        self._retired.append(hand)
+
+    def _cost(self, hand: TrackedHand, observation: HandObservation, position) -> float:
+        x, y, scale = position
+        cost = math.hypot(x - hand.x, y - hand.y) / max(scale, hand.scale, 1e-3)
+        if hand.handedness and observation.handedness and hand.handedness != observation.handedness:
+            cost += self.handedness_penalty
+        return cost
+
+    def match(
+        self, observations: list[HandObservation], now: float
+    ) -> list[tuple[TrackedHand, HandObservation]]:
+        """Assign each observation (best ``max_hands`` by confidence) to an identity."""
+        if len(observations) > self.max_hands:
+            observations = sorted(observations, key=lambda o: o.confidence, reverse=True)
+            observations = observations[: self.max_hands]
+        positions = [palm_position(o.landmarks) for o in observations]
+        pairs = sorted(
+            (self._cost(hand, observation, position), i, hand.hand_id)
+            for i, (observation, position) in enumerate(zip(observations, positions))
+            for hand in self.hands.values()
+        )
+        assigned: dict[int, TrackedHand] = {}
+        taken = set()
+        for cost, i, hand_id in pairs:
+            if cost > self.max_jump:
+                break
+            if i in assigned or hand_id in taken:
+                continue
+            assigned[i] = self.hands[hand_id]
+            taken.add(hand_id)
+        for i, hand in assigned.items():
+            hand.observe(observations[i], positions[i], now)
+        matched = []
+        for i, observation in enumerate(observations):
+            hand = assigned.get(i)
+            if hand is None:
+                hand = self._new_hand()
+                hand.observe(observation, positions[i], now)
+            matched.append((hand, observation))
+        return matched
+
+    def update(
+        self, observations: list[HandObservation], now: float, debug: bool = True
+    ) -> tuple[list[tuple[TrackedHand, Optional[str]]], list[TrackedHand]]:
+        """Classify and gate one frame.
+
+        Returns every live identity with its held gesture (unseen ones are fed
+        ``None``), and the identities retired on this frame.
+        """
+        seen = set()
+        held = []
+        for hand, observation in self.match(observations, now):
+            seen.add(hand.hand_id)
+            landmarks = observation.landmarks
+            if hand.landmark_filter is not None:
+                landmarks = filter_landmarks(hand.landmark_filter, landmarks, now)
+                hand.landmarks = landmarks
+            hand.palm_ok = palm_facing_camera(landmarks, observation.handedness)
+            hand.gesture, debug_lines, score = self.rules.classify_scored(landmarks)
+            if debug:
+                hand.debug_lines = debug_lines
+            hand.stable_gesture = hand.smoother.update(
+                hand.gesture, observation.confidence * score
+            )
+            gated = hand.stable_gesture if hand.palm_ok else None
+            held.append((hand, hand.hold_gate.update(gated, now)))
+        for hand in list(self.hands.values()):
+            if hand.hand_id in seen:
+                continue
+            if now - hand.last_seen >= self.forget_after:
+                self._retire(hand)
+                continue
+            hand.landmarks = None
+            if hand.landmark_filter is not None:
+                hand.landmark_filter.reset()
+            hand.gesture = None
+            hand.palm_ok = False
+            hand.stable_gesture = hand.smoother.update(None)
+            held.append((hand, hand.hold_gate.update(None, now)))
+        retired, self._retired = self._retired, []
+        return held, retired
+
+    def stop(self, now: float) -> None:
+        """End every live identity's running activity because the run is ending."""
+        for hand in list(self.hands.values()):
+            hand.tracker.stop(now)
+
+    @property
+    def active_activities(self) -> tuple:
+        """Each live identity's running activity (or ``None``), in identity order."""
+        return tuple(hand.tracker.active_activity for hand in list(self.hands.values()))
+
+    @property
+    def active_activity(self) -> Optional[str]:
+        active = sorted({h.tracker.active_activity for h in self.hands.values()} - {None})
+        return ", ".join(active) if active else None
+
+    def snapshot(self, now: float) -> dict[str, float]:
+        """Totals over every identity, live and retired."""
+        totals = dict(self.retired_totals)
+        for hand in list(self.hands.values()):
+            for activity, seconds in hand.tracker.snapshot(now).items():
+                totals[activity] = totals.get(activity, 0.0) + seconds
+        return totals
+
+    def hud_lines(self) -> list[str]:
+        visible = sum(hand.landmarks is not None for hand in list(self.hands.values()))
+        return [f"Hands: {visible} visible, {len(self.hands)} tracked (max {self.max_hands})"]
@@ -0,0 +1,197 @@
+import datetime
+import json
+import os
+import sqlite3
+from typing import Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    activity TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    duration REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_start ON sessions(start);
+CREATE INDEX IF NOT EXISTS sessions_by_duration ON sessions(activity, duration);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT NOT NULL,
+    activity TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (day, activity)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hourly (
+    hour TEXT NOT NULL,
+    activity TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (hour, activity)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def hour_slices(start: float, end: float) -> list[tuple[datetime.datetime, float]]:
+    """Split ``[start, end)`` at local hour boundaries into ``(hour_start, seconds)``."""
+    slices = []
+    t = start
+    while t < end:
+        hour = datetime.datetime.fromtimestamp(t).replace(minute=0, second=0, microsecond=0)
+        boundary = (hour + datetime.timedelta(hours=1)).timestamp()
+        stop = min(end, boundary)
+        slices.append((hour, stop - t))
+        t = stop
+    return slices
+
+
+class HistoryStore:
+    """SQLite store of closed sessions with daily and hourly rollups (local time).
+
+    Rollups are updated in the same transaction as each session insert, so range
+    queries read a handful of pre-aggregated rows instead of raw events.
+    """
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO meta VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value),
+        )
+
+    def _insert_session(self, activity: str, start: float, end: float) -> None:
+        if end <= start:
+            return
+        self.conn.execute(
+            "INSERT INTO sessions (activity, start, end, duration) VALUES (?, ?, ?, ?)",
+            (activity, start, end, end - start),
+        )
+        for hour, seconds in hour_slices(start, end):
+            self.conn.execute(
+                "INSERT INTO hourly VALUES (?, ?, ?) ON CONFLICT(hour, activity) "
+                "DO UPDATE SET seconds = seconds + excluded.seconds",
+                (hour.strftime("%Y-%m-%dT%H"), activity, seconds),
+            )
+            self.conn.execute(
+                "INSERT INTO daily VALUES (?, ?, ?) ON CONFLICT(day, activity) "
+                "DO UPDATE SET seconds = seconds + excluded.seconds",
+                (hour.strftime("%Y-%m-%d"), activity, seconds),
+            )
+
+    def add_session(self, activity: str, start: float, end: float) -> None:
+        with self.conn:
+            self._insert_session(activity, start, end)
+
+    def ingest_event_log(self, log_path: str) -> int:
+        """Add sessions closed since the last ingest; returns how many were added.
+
+        Only bytes past the stored offset are read, and an activity still open at
+        the end of the log is carried over until a later switch closes it.
+        """
+        if not os.path.exists(log_path):
+            return 0
+        key = f"log:{os.path.abspath(log_path)}"
+        added = 0
+        with open(log_path, "rb") as f, self.conn:
+            # A running EventLog ingests too; hold the write lock from reading the cursor on.
+            self.conn.execute("BEGIN IMMEDIATE")
+            cursor = json.loads(self._meta(key) or '{"offset": 0, "active": null, "since": 0.0}')
+            if os.path.getsize(log_path) < cursor["offset"]:
+                # The log was replaced; start over rather than seek past its end.
+                cursor = {"offset": 0, "active": None, "since": 0.0}
+            f.seek(cursor["offset"])
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # still being written
+                cursor["offset"] += len(line)
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if not isinstance(event, dict) or event.get("type") != "switch":
+                    continue
+                ts = float(event["ts"])
+                if cursor["active"] is not None:
+                    self._insert_session(cursor["active"], cursor["since"], ts)
+                    added += 1
+                cursor["active"] = event.get("to")
+                cursor["since"] = ts
+            self._set_meta(key, json.dumps(cursor))
+        return added
+
+    def daily(
+        self, first_day: str, last_day: str, activity: Optional[str] = None
+    ) -> list[tuple[str, str, float]]:
+        """Return ``(day, activity, seconds)`` for days in ``[first_day, last_day]``."""
+        return self._range("daily", "day", first_day, last_day, activity)
+
+    def hourly(
+        self, first_hour: str, last_hour: str, activity: Optional[str] = None
+    ) -> list[tuple[str, str, float]]:
+        return self._range("hourly", "hour", first_hour, last_hour, activity)
+
+    def _range(self, table, column, first, last, activity):
+        query = f"SELECT {column}, activity, seconds FROM {table} WHERE {column} BETWEEN ? AND ?"
+        params: list = [first, last]
+        if activity is not None:
+            query += " AND activity = ?"
+            params.append(activity)
+        return self.conn.execute(query + f" ORDER BY {column}, activity", params).fetchall()
+
+    def totals(self, first_day: str, last_day: str) -> dict[str, float]:
+        rows = self.conn.execute(
+            "SELECT activity, SUM(seconds) FROM daily WHERE day BETWEEN ? AND ? "
+            "GROUP BY activity ORDER BY activity",
+            (first_day, last_day),
+        )
+        return dict(rows.fetchall())
+
+    def longest_session(self, activity: str) -> Optional[tuple[float, float]]:
+        row = self.conn.execute(
+            "SELECT start, end FROM sessions WHERE activity = ? ORDER BY duration DESC LIMIT 1",
+            (activity,),
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def longest_streak(
+        self, activity: str, min_seconds: float = 1.0
+    ) -> Optional[tuple[str, str, int]]:
+        """Longest run of consecutive days with at least ``min_seconds`` of ``activity``."""
+        rows = self.conn.execute(
+            "SELECT day FROM daily WHERE activity = ? AND seconds >= ? ORDER BY day",
+            (activity, min_seconds),
+        )
+        best = None
+        run_start = previous = None
+        length = 0
+        for (day,) in rows:
+            current = datetime.date.fromisoformat(day)
+            if previous is not None and current - previous == datetime.timedelta(days=1):
+                length += 1
+            else:
+                run_start, length = current, 1
+            previous = current
+            if best is None or length > best[2]:
+                best = (run_start.isoformat(), current.isoformat(), length)
+        return best
@@ -0,0 +1,306 @@
+import math
+from typing import Optional, Sequence
+
+import numpy as np
+
+from observer.recording import open_recording
+from observer.rules import DEFAULT_RULESET, RuleSet
+
+# Class name for frames that show a hand but no gesture.
+NO_GESTURE = "none"
+MODEL_VERSION = 1
+_MODEL_KEYS = ("version", "classes", "mean", "std", "w1", "b1", "w2", "b2", "min_confidence")
+
+
+def hand_features(points: np.ndarray) -> np.ndarray:
+    """Normalize ``(..., 21, 3)`` landmarks to ``(..., 63)`` features.
+
+    Landmarks are taken relative to the wrist and divided by the palm length
+    (wrist to middle-finger MCP in the image plane), so hand size and distance
+    from the camera drop out. Orientation is kept: "up" still means up.
+    """
+    p = np.asarray(points, dtype=np.float64)
+    centered = p - p[..., :1, :]
+    scale = np.maximum(np.hypot(centered[..., 9, 0], centered[..., 9, 1]), 1e-6)
+    return (centered / scale[..., None, None]).reshape(p.shape[:-2] + (63,))
+
+
+class LearnedClassifier:
+    """Small MLP (one ReLU hidden layer, softmax) over normalized landmarks.
+
+    It stands in for a ``RuleSet`` anywhere the runtime classifies hands: it
+    has the same ``classify``/``classify_scored``/``detect``/``detect_batch``
+    methods and takes the activity mapping from the rule set it was loaded
+    with. ``classify_scored`` reports the winning class's probability, which
+    weights the frame in the confidence-weighted smoothers. A frame whose best
+    class scores below ``min_confidence`` is reported as no gesture.
+
+    The wrist offset, palm-length scale and feature standardization are folded
+    into the first layer, so one frame is a 63xH and an HxK product plus a few
+    element-wise operations.
+    """
+
+    def __init__(
+        self,
+        classes: Sequence[str],
+        mean: np.ndarray,
+        std: np.ndarray,
+        w1: np.ndarray,
+        b1: np.ndarray,
+        w2: np.ndarray,
+        b2: np.ndarray,
+        rules: RuleSet = DEFAULT_RULESET,
+        min_confidence: float = 0.6,
+    ) -> None:
+        known = set(rules.gesture_names) | {NO_GESTURE}
+        unknown = [name for name in classes if name not in known]
+        if unknown:
+            raise ValueError(f"Model classes missing from the gesture rules: {', '.join(unknown)}")
+        self.classes = tuple(classes)
+        self.mean, self.std = mean, std
+        self.w1, self.b1, self.w2, self.b2 = w1, b1, w2, b2
+        self.min_confidence = min_confidence
+        self.gesture_names = rules.gesture_names
+        self.stop_gestures = rules.stop_gestures
+        self.activity_by_gesture = rules.activity_by_gesture
+        self.activities = rules.activities
+        self._names = [None if name == NO_GESTURE else name for name in self.classes]
+        # ((p - wrist) / scale - mean) / std @ w1 + b1
+        #   == (p @ w1f) / scale + b1f, with the wrist term folded into rows 0-2.
+        scaled = w1 / std[:, None]
+        folded = scaled.copy()
+        folded[:3] -= scaled.reshape(21, 3, -1).sum(axis=0)
+        self._w1 = folded
+        self._b1 = b1 - (mean / std) @ w1
+
+    @classmethod
+    def load(cls, path: str, rules: RuleSet = DEFAULT_RULESET) -> "LearnedClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            missing = [key for key in _MODEL_KEYS if key not in data.files]
+            if missing:
+                raise ValueError(f"{path}: not a gesture model (missing {', '.join(missing)})")
+            version = int(data["version"])
+            if version != MODEL_VERSION:
+                raise ValueError(f"{path}: unsupported gesture model version {version}")
+            return cls(
+                [str(name) for name in data["classes"]],
+                data["mean"],
+                data["std"],
+                data["w1"],
+                data["b1"],
+                data["w2"],
+                data["b2"],
+                rules,
+                float(data["min_confidence"]),
+            )
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                version=MODEL_VERSION,
+                classes=np.array(self.classes),
+                mean=self.mean,
+                std=self.std,
+                w1=self.w1,
+                b1=self.b1,
+                w2=self.w2,
+                b2=self.b2,
+                min_confidence=self.min_confidence,
+            )
+
+    def _probabilities(self, landmarks) -> list[float]:
+        if isinstance(landmarks, np.ndarray):
+            p = landmarks.reshape(63).astype(np.float64)
+            scale = float(np.hypot(p[27] - p[0], p[28] - p[1]))
+        else:
+            flat: list[float] = []
+            for lm in landmarks:
+                flat += (lm.x, lm.y, lm.z)
+            p = np.array(flat)
+            wrist, mcp = landmarks[0], landmarks[9]
+            scale = ((mcp.x - wrist.x) ** 2 + (mcp.y - wrist.y) ** 2) ** 0.5
+        hidden = np.maximum((p @ self._w1) / max(scale, 1e-6) + self._b1, 0.0)
+        # A handful of classes: the softmax is cheaper in plain Python than in NumPy.
+        logits = (hidden @ self.w2 + self.b2).tolist()
+        top = max(logits)
+        e = [math.exp(v - top) for v in logits]
+        total = sum(e)
+        return [v / total for v in e]
+
+    def probabilities(self, landmarks) -> np.ndarray:
+        """Per-class probabilities for one hand, in ``classes`` order."""
+        return np.array(self._probabilities(landmarks))
+
+    def probabilities_batch(self, points: np.ndarray) -> np.ndarray:
+        hidden = np.maximum((hand_features(points) - self.mean) / self.std @ self.w1 + self.b1, 0.0)
+        logits = hidden @ self.w2 + self.b2
+        e = np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return e / e.sum(axis=-1, keepdims=True)
+
+    def confidences(self, landmarks) -> dict[str, float]:
+        return dict(zip(self.classes, self._probabilities(landmarks)))
+
+    def classify_scored(self, landmarks) -> tuple[Optional[str], list[str], float]:
+        """Return the gesture, one ``name p=0.00`` debug line per class and the best probability."""
+        probs = self._probabilities(landmarks)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        gesture = self._names[best] if probs[best] >= self.min_confidence else None
+        lines = [
+            f"{'*' if i == best else '-'}{name} p={prob:.2f}"
+            for i, (name, prob) in enumerate(zip(self.classes, probs))
+        ]
+        return gesture, lines, probs[best]
+
+    def classify(self, landmarks) -> tuple[Optional[str], list[str]]:
+        gesture, lines, _ = self.classify_scored(landmarks)
+        return gesture, lines
+
+    def detect(self, landmarks) -> Optional[str]:
+        probs = self._probabilities(landmarks)
+        best = max(range(len(probs)), key=probs.__getitem__)
+        return self._names[best] if probs[best] >= self.min_confidence else None
+
+    def detect_batch(self, points: np.ndarray) -> list[Optional[str]]:
+        probs = self.probabilities_batch(points).reshape(-1, len(self.classes))
+        best = probs.argmax(axis=-1)
+        confident = probs[np.arange(len(probs)), best] >= self.min_confidence
+        names = self._names
+        return [names[b] if ok else None for b, ok in zip(best.tolist(), confident.tolist())]
+
+
+def load_classifier(rules: RuleSet, model_path: Optional[str]):
+    """The learned classifier at ``model_path``, or ``rules`` itself when no path is given."""
+    return LearnedClassifier.load(model_path, rules) if model_path else rules
+
+
+def train_classifier(
+    points: np.ndarray,
+    labels: Sequence[Optional[str]],
+    rules: RuleSet = DEFAULT_RULESET,
+    hidden: int = 32,
+    epochs: int = 60,
+    batch_size: int = 64,
+    learning_rate: float = 0.01,
+    weight_decay: float = 1e-4,
+    mirror: bool = True,
+    min_confidence: float = 0.6,
+    seed: int = 0,
+) -> LearnedClassifier:
+    """Fit a ``LearnedClassifier`` to ``(N, 21, 3)`` hands labeled with gesture names.
+
+    ``None`` or ``"none"`` labels a hand showing no gesture. Classes are weighted
+    by inverse frequency, so long idle stretches do not swamp short gestures.
+    With ``mirror`` every hand is also used flipped left-right, which covers the
+    other hand. Training is mini-batch Adam on the cross-entropy loss.
+    """
+    names = [NO_GESTURE if label is None else label for label in labels]
+    unknown = sorted(set(names) - set(rules.gesture_names) - {NO_GESTURE})
+    if unknown:
+        raise ValueError(f"Unknown gesture labels: {', '.join(unknown)}")
+    if len(names) != len(points) or not names:
+        raise ValueError("Need one label per hand and at least one hand")
+    classes = (NO_GESTURE,) + tuple(g for g in rules.gesture_names if g in set(names))
+    targets = np.array([classes.index(name) for name in names])
+
+    features = hand_features(points)
+    if mirror:
+        flipped = features.reshape(-1, 21, 3).copy()
+        flipped[..., 0] *= -1.0
+        features = np.concatenate([features, flipped.reshape(-1, 63)])
+        targets = np.concatenate([targets, targets])
+    mean = features.mean(axis=0)
+    std = features.std(axis=0)
+    std[std < 1e-6] = 1.0
+    x = (features - mean) / std
+    counts = np.bincount(targets, minlength=len(classes))
+    class_weight = len(targets) / (np.maximum(counts, 1) * np.count_nonzero(counts))
+
+    rng = np.random.default_rng(seed)
+    params = [
+        rng.normal(0.0, np.sqrt(2.0 / 63), (63, hidden)),
+        np.zeros(hidden),
+        rng.normal(0.0, np.sqrt(1.0 / hidden), (hidden, len(classes))),
+        np.zeros(len(classes)),
+    ]
+    moments = [np.zeros_like(p) for p in params]
+    squares = [np.zeros_like(p) for p in params]
+    beta1, beta2 = 0.9, 0.999
+    step = 0
+    for _ in range(epochs):
+        order = rng.permutation(len(x))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            xb, yb = x[batch], targets[batch]
+            w1, b1, w2, b2 = params
+            pre = xb @ w1 + b1
+            h = np.maximum(pre, 0.0)
+            logits = h @ w2 + b2
+            e = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs = e / e.sum(axis=1, keepdims=True)
+            weights = class_weight[yb]
+            probs[np.arange(len(yb)), yb] -= 1.0
+            d_logits = probs * (weights / weights.sum())[:, None]
+            d_h = (d_logits @ w2.T) * (pre > 0.0)
+            grads = [
+                xb.T @ d_h + weight_decay * w1,
+                d_h.sum(axis=0),
+                h.T @ d_logits + weight_decay * w2,
+                d_logits.sum(axis=0),
+            ]
+            step += 1
+            correction = np.sqrt(1.0 - beta2**step) / (1.0 - beta1**step)
+            for p, g, m, v in zip(params, grads, moments, squares):
+                m += (1.0 - beta1) * (g - m)
+                v += (1.0 - beta2) * (g * g - v)
+                p -= learning_rate * correction * m / (np.sqrt(v) + 1e-8)
+    return LearnedClassifier(classes, mean, std, *params, rules, min_confidence)
+
+
+def load_labeled_recordings(
+    labeled_paths: Sequence[tuple[str, str]], holdout: float = 0.0
+) -> tuple[tuple[np.ndarray, list], tuple[np.ndarray, list]]:
+    """Hand-present frames of ``(label, recording path)`` pairs as training data.
+
+    Each recording is meant to hold one gesture (or ``none``). The last
+    ``holdout`` fraction of every recording is returned separately as test
+    data; neighbouring frames are nearly identical, so a random split would
+    overstate accuracy.
+    """
+    train_points, train_labels, test_points, test_labels = [], [], [], []
+    for label, path in labeled_paths:
+        frames = open_recording(path).frames
+        hands = np.asarray(frames["landmarks"][frames["present"] == 1], dtype=np.float32)
+        if len(hands) == 0:
+            raise ValueError(f"{path}: recording has no hand-present frames")
+        split = len(hands) - int(round(len(hands) * holdout))
+        train_points.append(hands[:split])
+        train_labels += [label] * split
+        test_points.append(hands[split:])
+        test_labels += [label] * (len(hands) - split)
+    return (
+        (np.concatenate(train_points), train_labels),
+        (np.concatenate(test_points), test_labels),
+    )
+
+
+def evaluate(classifier, points: np.ndarray, labels: Sequence[Optional[str]]) -> dict:
+    """Accuracy of anything with ``detect_batch`` (a ``RuleSet`` or a learned model).
+
+    Returns the overall accuracy and a per-label ``{label: accuracy}`` breakdown.
+    """
+    expected = [None if label in (None, NO_GESTURE) else label for label in labels]
+    if not expected:
+        return {"frames": 0, "accuracy": 0.0, "per_label": {}}
+    predicted = classifier.detect_batch(np.asarray(points))
+    hits: dict[str, list[int]] = {}
+    for want, got in zip(expected, predicted):
+        counts = hits.setdefault(want or NO_GESTURE, [0, 0])
+        counts[0] += want == got
+        counts[1] += 1
+    correct = sum(c for c, _ in hits.values())
+    return {
+        "frames": len(expected),
+        "accuracy": correct / len(expected),
+        "per_label": {label: c / n for label, (c, n) in hits.items()},
+    }
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+from typing import Optional, TextIO
+
+import numpy as np
+
+STAGES = ("read", "convert", "inference", "classify", "gate", "hud", "imshow", "end_to_end")
+PERCENTILES = (50, 95, 99)
+
+
+class RingHistogram:
+    """Fixed-size ring buffer of duration samples (milliseconds)."""
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.samples = np.zeros(capacity, dtype=np.float64)
+        self.capacity = capacity
+        self.count = 0
+
+    def record(self, value_ms: float) -> None:
+        self.samples[self.count % self.capacity] = value_ms
+        self.count += 1
+
+    def percentiles(self, qs=PERCENTILES) -> Optional[list[float]]:
+        filled = min(self.count, self.capacity)
+        if filled == 0:
+            return None
+        return np.percentile(self.samples[:filled], qs).tolist()
+
+
+class StageClock:
+    def __init__(self, metrics: "LatencyMetrics") -> None:
+        self.metrics = metrics
+        self.last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.metrics.record(stage, now - self.last)
+        self.last = now
+
+
+class _NullClock:
+    def lap(self, stage: str) -> None:
+        pass
+
+
+NULL_CLOCK = _NullClock()
+
+
+class StartupReport:
+    """Milestones from process start to the first classified frame.
+
+    ``mark`` stores the time since ``started``, ``record`` a duration; the
+    summary lists both in milliseconds in the order they were added.
+    """
+
+    def __init__(self, started: Optional[float] = None) -> None:
+        self.started = time.perf_counter() if started is None else started
+        self.values: dict[str, float] = {}
+
+    def mark(self, name: str, at: Optional[float] = None) -> None:
+        if at is None:
+            at = time.perf_counter()
+        self.values[name] = at - self.started
+
+    def record(self, name: str, seconds: float) -> None:
+        self.values[name] = seconds
+
+    def summary(self) -> str:
+        parts = [f"{name}_ms={seconds * 1000.0:.0f}" for name, seconds in self.values.items()]
+        return "STARTUP " + " ".join(parts)
+
+
+class LatencyMetrics:
+    """Per-stage latency histograms with a cached HUD view and periodic reports.
+
+    ``record`` may be called from any pipeline thread; reads take the same lock.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        report_interval: float = 10.0,
+        metrics_file: Optional[str] = None,
+        alert_ms: Optional[float] = None,
+        hud_refresh: float = 0.5,
+    ) -> None:
+        self.histograms = {stage: RingHistogram(capacity) for stage in STAGES}
+        self.report_interval = report_interval
+        self.alert_ms = alert_ms
+        self.hud_refresh = hud_refresh
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = open(metrics_file, "a") if metrics_file else None
+        self._next_report = time.monotonic() + report_interval
+        self._hud_at = 0.0
+        self._hud_lines: list[str] = []
+
+    def clock(self) -> StageClock:
+        return StageClock(self)
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.histograms[stage].record(seconds * 1000.0)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            stats = {}
+            for stage, histogram in self.histograms.items():
+                values = histogram.percentiles()
+                if values is None:
+                    continue
+                stats[stage] = {f"p{q}": v for q, v in zip(PERCENTILES, values)}
+                stats[stage]["count"] = histogram.count
+        return stats
+
+    def hud_lines(self, now: float) -> list[str]:
+        if now - self._hud_at >= self.hud_refresh:
+            self._hud_at = now
+            self._hud_lines = [
+                f"{stage:<10} {s['p50']:6.1f} {s['p95']:6.1f} {s['p99']:6.1f}"
+                for stage, s in self.snapshot().items()
+            ]
+            if self._hud_lines:
+                self._hud_lines.insert(0, f"{'ms':<10} {'p50':>6} {'p95':>6} {'p99':>6}")
+        return self._hud_lines
+
+    def maybe_report(self, now: float) -> None:
+        if now < self._next_report:
+            return
+        self._next_report = now + self.report_interval
+        stats = self.snapshot()
+        alert = None
+        e2e = stats.get("end_to_end")
+        if self.alert_ms is not None and e2e is not None and e2e["p95"] > self.alert_ms:
+            alert = f"end-to-end p95 {e2e['p95']:.1f}ms exceeds {self.alert_ms:.1f}ms"
+        if self._file is not None:
+            record = {"ts": time.time(), "stages": stats}
+            if alert:
+                record["alert"] = alert
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+        else:
+            parts = " ".join(
+                f"{stage}={s['p50']:.1f}/{s['p95']:.1f}/{s['p99']:.1f}" for stage, s in stats.items()
+            )
+            print(f"METRICS p50/p95/p99 ms {parts}", flush=True)
+        if alert:
+            print(f"ALERT: {alert}", flush=True)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,290 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class LatestQueue:
+    """Bounded hand-off queue where the newest item wins.
+
+    When full, ``put`` evicts the oldest item instead of blocking, so a slow
+    consumer always sees the most recent frame and never a backlog. Evicted
+    items are passed to ``on_drop``, if given.
+    """
+
+    def __init__(self, maxsize: int = 1, on_drop: Optional[Callable] = None) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.on_drop = on_drop
+        self.items: deque = deque()
+        self.dropped = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item) -> None:
+        evicted = None
+        with self._cond:
+            if len(self.items) >= self.maxsize:
+                evicted = self.items.popleft()
+                self.dropped += 1
+            self.items.append(item)
+            self._cond.notify()
+        if evicted is not None and self.on_drop is not None:
+            self.on_drop(evicted)
+
+    def get(self, timeout: Optional[float] = None):
+        with self._cond:
+            self._cond.wait_for(lambda: self.items or self.closed, timeout)
+            if self.items:
+                return self.items.popleft()
+            return None
+
+    def close(self) -> None:
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    @property
+    def drained(self) -> bool:
+        with self._cond:
+            return self.closed and not self.items
+
+
+class RateMeter:
+    def __init__(self, window_seconds: float = 1.0) -> None:
+        self.window_seconds = window_seconds
+        self.fps = 0.0
+        self.total = 0
+        self._count = 0
+        self._window_start: Optional[float] = None
+
+    def tick(self, now: float) -> None:
+        self.total += 1
+        if self._window_start is None:
+            self._window_start = now
+            return
+        self._count += 1
+        elapsed = now - self._window_start
+        if elapsed >= self.window_seconds:
+            self.fps = self._count / elapsed
+            self._count = 0
+            self._window_start = now
+
+
+class PipelineStats:
+    def __init__(self, frames: LatestQueue, results: LatestQueue) -> None:
+        self.frames = frames
+        self.results = results
+        self.capture = RateMeter()
+        self.inference = RateMeter()
+        self.render = RateMeter()
+        self.latency_ms = 0.0
+
+    def observe_latency(self, captured_at: float, now: float) -> None:
+        sample = (now - captured_at) * 1000.0
+        if self.latency_ms == 0.0:
+            self.latency_ms = sample
+        else:
+            self.latency_ms += 0.1 * (sample - self.latency_ms)
+
+    def hud_lines(self) -> list[str]:
+        return [
+            f"FPS cap/inf/ui: {self.capture.fps:.1f}/{self.inference.fps:.1f}/{self.render.fps:.1f}",
+            f"Drops frm/res: {self.frames.dropped}/{self.results.dropped}"
+            f"  Lat: {self.latency_ms:.0f}ms",
+        ]
+
+    def summary(self) -> str:
+        return (
+            f"PIPELINE capture={self.capture.total} ({self.capture.fps:.1f} fps) "
+            f"inference={self.inference.total} ({self.inference.fps:.1f} fps) "
+            f"render={self.render.total} ({self.render.fps:.1f} fps) "
+            f"dropped_frames={self.frames.dropped} dropped_results={self.results.dropped} "
+            f"latency_ms={self.latency_ms:.1f}"
+        )
+
+
+class InFlightTracker:
+    """Bookkeeping for asynchronous inference requests keyed by timestamp.
+
+    Caps the number of outstanding requests, keeps submitted timestamps strictly
+    increasing (required by MediaPipe's LIVE_STREAM mode) and rejects results
+    that arrive out of order or too late to be useful.
+    """
+
+    def __init__(self, max_in_flight: int = 2, max_age_ms: int = 250) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1")
+        self.max_in_flight = max_in_flight
+        self.max_age_ms = max_age_ms
+        self.pending: deque = deque()
+        self.last_submitted_ms = -1
+        self.last_completed_ms = -1
+        self.submitted = 0
+        self.skipped = 0
+        self.stale = 0
+        self.lost = 0
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self.pending)
+
+    def try_submit(self, timestamp_ms: int) -> Optional[int]:
+        with self._lock:
+            while self.pending and timestamp_ms - self.pending[0] > self.max_age_ms:
+                self.pending.popleft()
+                self.lost += 1
+            if len(self.pending) >= self.max_in_flight:
+                self.skipped += 1
+                return None
+            timestamp_ms = max(timestamp_ms, self.last_submitted_ms + 1)
+            self.pending.append(timestamp_ms)
+            self.last_submitted_ms = timestamp_ms
+            self.submitted += 1
+            return timestamp_ms
+
+    def complete(self, timestamp_ms: int, now_ms: int) -> bool:
+        with self._lock:
+            while self.pending and self.pending[0] < timestamp_ms:
+                self.pending.popleft()
+                self.lost += 1
+            if self.pending and self.pending[0] == timestamp_ms:
+                self.pending.popleft()
+            if timestamp_ms <= self.last_completed_ms or now_ms - timestamp_ms > self.max_age_ms:
+                self.stale += 1
+                return False
+            self.last_completed_ms = timestamp_ms
+            return True
+
+    def hud_lines(self) -> list[str]:
+        return [
+            f"Async in-flight: {self.in_flight}  skip/stale/lost: "
+            f"{self.skipped}/{self.stale}/{self.lost}"
+        ]
+
+    def summary(self) -> str:
+        return (
+            f"LIVE_STREAM submitted={self.submitted} skipped_busy={self.skipped} "
+            f"stale={self.stale} lost={self.lost}"
+        )
+
+
+class CaptureThread(threading.Thread):
+    def __init__(
+        self,
+        cap,
+        out: LatestQueue,
+        meter: RateMeter,
+        on_read: Optional[Callable[[float], None]] = None,
+        frames=None,
+    ) -> None:
+        super().__init__(name="observer-capture", daemon=True)
+        self.cap = cap
+        self.out = out
+        self.meter = meter
+        self.on_read = on_read
+        self.frames = frames
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                started = time.perf_counter()
+                if self.frames is not None:
+                    ok, frame = self.frames.read(self.cap)
+                else:
+                    ok, frame = self.cap.read()
+                if not ok:
+                    break
+                if self.on_read is not None:
+                    self.on_read(time.perf_counter() - started)
+                now = time.monotonic()
+                self.meter.tick(now)
+                self.out.put((frame, now))
+        finally:
+            self.out.close()
+
+
+class InferenceWorker(threading.Thread):
+    def __init__(
+        self,
+        process: Callable,
+        inbox: LatestQueue,
+        out: LatestQueue,
+        meter: RateMeter,
+    ) -> None:
+        super().__init__(name="observer-inference", daemon=True)
+        self.process = process
+        self.inbox = inbox
+        self.out = out
+        self.meter = meter
+        self.stopped = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                item = self.inbox.get(timeout=0.1)
+                if item is None:
+                    if self.inbox.drained:
+                        break
+                    continue
+                frame, captured_at = item
+                packet = self.process(frame, captured_at)
+                self.meter.tick(time.monotonic())
+                self.out.put(packet)
+        except BaseException as exc:  # surfaced on the render thread
+            self.error = exc
+        finally:
+            self.out.close()
+
+
+def run_pipeline(
+    cap,
+    process: Callable,
+    render: Callable,
+    on_read: Optional[Callable[[float], None]] = None,
+    frames=None,
+    discard: Optional[Callable] = None,
+) -> PipelineStats:
+    """Run capture and inference on worker threads and render on the caller's thread.
+
+    ``process(frame, captured_at)`` runs on the inference thread and returns a
+    packet; ``render(packet, stats)`` runs on the calling thread (OpenCV windows
+    must stay on the main thread) and returns ``False`` to stop. ``on_read``
+    receives the duration of each ``cap.read()`` call. With a ``FramePool`` as
+    ``frames``, frames are read into its buffers and frames dropped before
+    inference are released. ``discard(packet)`` is called for each packet
+    dropped before it was rendered.
+    """
+    on_frame_drop = None
+    if frames is not None:
+        on_frame_drop = lambda item: frames.release(item[0])  # noqa: E731
+    frame_queue = LatestQueue(maxsize=1, on_drop=on_frame_drop)
+    results = LatestQueue(maxsize=1, on_drop=discard)
+    stats = PipelineStats(frame_queue, results)
+    capture = CaptureThread(cap, frame_queue, stats.capture, on_read, frames)
+    worker = InferenceWorker(process, frame_queue, results, stats.inference)
+    capture.start()
+    worker.start()
+    try:
+        while True:
+            packet = results.get(timeout=0.1)
+            if packet is None:
+                if results.drained:
+                    break
+                continue
+            stats.render.tick(time.monotonic())
+            if not render(packet, stats):
+                break
+    finally:
+        capture.stopped.set()
+        worker.stopped.set()
+        worker.join(timeout=2.0)
+        capture.join(timeout=2.0)
+    if worker.error is not None:
+        raise worker.error
+    return stats
@@ -0,0 +1,115 @@
+import os
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+
+from observer.constants import HANDEDNESS_LABELS
+
+# File layout: a fixed 64-byte header followed by FRAME_DTYPE records.
+# The frame count in the header is written on close; files cut short by a
+# crash are still readable because the count is recovered from the file size.
+MAGIC = b"OBSREC\x00\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQd")  # magic, version, record size, frame count, started_at
+HEADER_SIZE = 64
+
+FRAME_DTYPE = np.dtype(
+    [
+        ("t", "<f8"),
+        ("present", "u1"),
+        ("handedness", "u1"),
+        ("_pad", "V6"),
+        ("landmarks", "<f4", (21, 3)),
+    ]
+)
+
+
+def handedness_code(label: Optional[str]) -> int:
+    try:
+        return HANDEDNESS_LABELS.index(label)
+    except ValueError:
+        return 0
+
+
+class LandmarkRecorder:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.started_at = time.time()
+        self.count = 0
+        self._row = np.zeros(1, dtype=FRAME_DTYPE)
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self) -> None:
+        header = _HEADER.pack(MAGIC, VERSION, FRAME_DTYPE.itemsize, self.count, self.started_at)
+        self._file.write(header.ljust(HEADER_SIZE, b"\0"))
+
+    def write(self, t: float, landmarks, handedness: Optional[str]) -> None:
+        row = self._row[0]
+        row["t"] = t
+        if landmarks is None:
+            row["present"] = 0
+            row["handedness"] = 0
+            row["landmarks"] = 0.0
+        else:
+            row["present"] = 1
+            row["handedness"] = handedness_code(handedness)
+            if isinstance(landmarks, np.ndarray):
+                row["landmarks"] = landmarks
+            else:
+                row["landmarks"] = [(lm.x, lm.y, lm.z) for lm in landmarks]
+        self._file.write(self._row.tobytes())
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self) -> "LandmarkRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class Recording:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE:
+            raise ValueError(f"{path}: file too short for a recording header")
+        magic, version, record_size, count, started_at = _HEADER.unpack_from(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an Observer landmark recording")
+        if version != VERSION or record_size != FRAME_DTYPE.itemsize:
+            raise ValueError(
+                f"{path}: unsupported recording version {version} (record size {record_size})"
+            )
+        available = (os.path.getsize(path) - HEADER_SIZE) // record_size
+        self.count = available if count == 0 or count > available else count
+        self.started_at = started_at
+        if self.count:
+            self.frames = np.memmap(
+                path, dtype=FRAME_DTYPE, mode="r", offset=HEADER_SIZE, shape=(self.count,)
+            )
+        else:
+            self.frames = np.zeros(0, dtype=FRAME_DTYPE)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def duration(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return float(self.frames["t"][-1] - self.frames["t"][0])
+
+
+def open_recording(path: str) -> Recording:
+    return Recording(path)
@@ -0,0 +1,96 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+from observer.activity import ActivityTracker
+from observer.filters import filter_sequence
+from observer.gates import GestureHoldGate, GestureSmoother
+from observer.gestures import outside_of_hand_showing_batch
+from observer.recording import Recording
+from observer.rules import DEFAULT_RULESET, RuleSet
+
+
+class ReplayResult:
+    def __init__(self, frames: int, start_time: float, end_time: float) -> None:
+        self.frames = frames
+        self.start_time = start_time
+        self.end_time = end_time
+        self.switches: list[tuple[float, Optional[str]]] = []
+        self.totals: dict[str, float] = {}
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    def sessions(self) -> list[tuple[str, float, float]]:
+        """Return ``(activity, start, end)`` spans; an open span ends with the input."""
+        spans = []
+        active: Optional[str] = None
+        since = 0.0
+        for now, activity in self.switches:
+            if active is not None:
+                spans.append((active, since, now))
+            active, since = activity, now
+        if active is not None:
+            spans.append((active, since, self.end_time))
+        return spans
+
+
+def replay_recording(
+    recording: Recording,
+    smoother: Optional[GestureSmoother] = None,
+    hold_gate: Optional[GestureHoldGate] = None,
+    tracker: Optional[ActivityTracker] = None,
+    on_switch: Optional[Callable[[float, Optional[str]], None]] = None,
+    rules: RuleSet = DEFAULT_RULESET,
+    landmark_filter=None,
+) -> ReplayResult:
+    return replay_frames(
+        recording.frames, smoother, hold_gate, tracker, on_switch, rules, landmark_filter
+    )
+
+
+def replay_frames(
+    frames: np.ndarray,
+    smoother: Optional[GestureSmoother] = None,
+    hold_gate: Optional[GestureHoldGate] = None,
+    tracker: Optional[ActivityTracker] = None,
+    on_switch: Optional[Callable[[float, Optional[str]], None]] = None,
+    rules: RuleSet = DEFAULT_RULESET,
+    landmark_filter=None,
+) -> ReplayResult:
+    """Drive the gate stack from ``FRAME_DTYPE`` records using their timestamps.
+
+    Classification and the outside-of-hand check run as one batch over the whole
+    recording; only the stateful gates (and ``landmark_filter``, which runs
+    first) step frame by frame.
+    """
+    smoother = smoother or GestureSmoother()
+    hold_gate = hold_gate or GestureHoldGate(1.5)
+    tracker = tracker or ActivityTracker(
+        activity_by_gesture=rules.activity_by_gesture, stop_gestures=rules.stop_gestures
+    )
+
+    times = frames["t"].tolist()
+    present = frames["present"].astype(bool)
+    gestures: list[Optional[str]] = [None] * len(frames)
+    palm_ok = np.zeros(len(frames), dtype=bool)
+    if present.any():
+        points = frames["landmarks"]
+        if landmark_filter is not None:
+            points = filter_sequence(landmark_filter, times, present.tolist(), points)
+        hands = np.asarray(points[present])
+        for i, gesture in zip(np.flatnonzero(present).tolist(), rules.detect_batch(hands)):
+            gestures[i] = gesture
+        palm_ok[present] = ~outside_of_hand_showing_batch(hands, frames["handedness"][present])
+
+    result = ReplayResult(len(frames), times[0] if times else 0.0, times[-1] if times else 0.0)
+    for now, hand, gesture, palm in zip(times, present.tolist(), gestures, palm_ok.tolist()):
+        stable_gesture = smoother.update(gesture if hand else None)
+        held_gesture = hold_gate.update(stable_gesture if palm else None, now)
+        if tracker.apply_gesture(held_gesture, now):
+            result.switches.append((now, tracker.active_activity))
+            if on_switch is not None:
+                on_switch(now, tracker.active_activity)
+    result.totals = tracker.snapshot(result.end_time)
+    return result
@@ -0,0 +1,103 @@
+from typing import Optional
+
+import numpy as np
+
+
+class Point:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class RoiWindow:
+    """Pixel rectangle of the full frame that was cropped and sent to the model."""
+
+    def __init__(
+        self, x0: int, y0: int, width: int, height: int, frame_width: int, frame_height: int
+    ) -> None:
+        self.x0 = x0
+        self.y0 = y0
+        self.width = width
+        self.height = height
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+
+    def to_frame(self, landmarks) -> list[Point]:
+        """Map crop-normalized landmarks to full-frame normalized coordinates."""
+        sx = self.width / self.frame_width
+        sy = self.height / self.frame_height
+        ox = self.x0 / self.frame_width
+        oy = self.y0 / self.frame_height
+        # MediaPipe scales z like x, so it follows the horizontal crop scale.
+        return [Point(ox + lm.x * sx, oy + lm.y * sy, lm.z * sx) for lm in landmarks]
+
+
+class RoiTracker:
+    """Crop around the previous frame's hand; fall back to the full frame when lost.
+
+    The square crop is the landmark bounding box grown by ``margin`` on each side,
+    at least ``min_side`` pixels, and is downscaled so its long side is at most
+    ``max_side`` before colour conversion and inference.
+    """
+
+    def __init__(self, margin: float = 0.35, min_side: int = 160, max_side: int = 320) -> None:
+        self.margin = margin
+        self.min_side = min_side
+        self.max_side = max_side
+        # (x0, y0, x1, y1) in pixels; replaced as a whole so readers need no lock.
+        self.box: Optional[tuple[int, int, int, int]] = None
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.lost = 0
+
+    def prepare(self, frame) -> tuple[np.ndarray, Optional[RoiWindow]]:
+        box = self.box
+        if box is None:
+            self.full_frames += 1
+            return frame, None
+        self.roi_frames += 1
+        x0, y0, x1, y1 = box
+        crop = frame[y0:y1, x0:x1]
+        width, height = x1 - x0, y1 - y0
+        scale = self.max_side / max(width, height)
+        if scale < 1.0:
+            # Imported here so the landmark types above load without OpenCV.
+            import cv2
+
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            crop = cv2.resize(crop, size, interpolation=cv2.INTER_LINEAR)
+        return crop, RoiWindow(x0, y0, width, height, frame.shape[1], frame.shape[0])
+
+    def update(self, landmarks, frame_shape) -> None:
+        """Track full-frame normalized ``landmarks``; ``None`` means the hand was lost."""
+        if landmarks is None:
+            if self.box is not None:
+                self.lost += 1
+            self.box = None
+            return
+        frame_height, frame_width = frame_shape[:2]
+        xs = [lm.x for lm in landmarks]
+        ys = [lm.y for lm in landmarks]
+        cx = (min(xs) + max(xs)) * 0.5 * frame_width
+        cy = (min(ys) + max(ys)) * 0.5 * frame_height
+        extent = max((max(xs) - min(xs)) * frame_width, (max(ys) - min(ys)) * frame_height)
+        side = max(self.min_side, extent * (1.0 + 2.0 * self.margin))
+        if side >= min(frame_width, frame_height):
+            # The hand fills the frame: a crop would save nothing.
+            self.box = None
+            return
+        half = side * 0.5
+        # Shift rather than shrink the square when it runs off an edge.
+        x0 = int(min(max(0.0, cx - half), frame_width - side))
+        y0 = int(min(max(0.0, cy - half), frame_height - side))
+        self.box = (x0, y0, x0 + int(side), y0 + int(side))
+
+    def hud_lines(self) -> list[str]:
+        mode = "ROI" if self.box is not None else "full"
+        return [f"Search: {mode}  roi/full/lost: {self.roi_frames}/{self.full_frames}/{self.lost}"]
+
+    def summary(self) -> str:
+        return f"ROI roi_frames={self.roi_frames} full_frames={self.full_frames} lost={self.lost}"
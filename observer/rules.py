@@ -0,0 +1,422 @@
+import json
+import math
+import re
+from typing import Optional
+
+import numpy as np
+
+from observer.constants import (
+    ACTIVITY_BY_GESTURE,
+    GESTURE_ILY,
+    GESTURE_ONE_FINGER,
+    GESTURE_OPEN_PALM,
+    GESTURE_TWO_FINGERS,
+)
+
+# Rule format (JSON or the equivalent Python dict):
+#
+#   "features": named predicates over landmark indices (0-20), built from
+#     {"above": [a, b], "by": t}      a.y is above b.y by more than t (default 0)
+#     {"left_of": [a, b], "by": t}    a.x is left of b.x by more than t
+#     {"near": [a, b, t]}             2D distance a-b is below t
+#     {"far": [a, b, t]}              2D distance a-b is above t
+#     {"sideways": [a, b], "ratio": k}  |dx| > k * |dy| for a-b (default k = 1)
+#     {"all": [...]}, {"any": [...]}, {"not": ...}, or another feature's name.
+#   "gestures": ordered list; the first whose checks all hold wins. Each has a
+#     "name", a debug "label", "checks" ({check label: predicate}) and either an
+#     "activity" it starts or "stop": true.
+#
+# Every distinct coordinate difference, distance and comparison is computed once
+# per frame no matter how many features share it.
+
+_FINGERS = {"index": (8, 6, 5), "middle": (12, 10, 9), "ring": (16, 14, 13), "pinky": (20, 18, 17)}
+
+
+def _default_rules() -> dict:
+    features = {}
+    for finger, (tip, pip, mcp) in _FINGERS.items():
+        features[f"{finger}_up"] = {
+            "all": [{"above": [tip, pip]}, {"above": [pip, mcp]}, {"above": [tip, mcp], "by": 0.05}]
+        }
+    for finger, (tip, pip, mcp) in list(_FINGERS.items())[1:]:
+        features[f"{finger}_curled"] = {"any": [{"above": [pip, tip]}, {"near": [tip, mcp, 0.11]}]}
+    features.update(
+        {
+            "thumb_near_palm": {"near": [4, 9, 0.20]},
+            "thumb_away_from_palm": {"far": [4, 9, 0.24]},
+            "thumb_side": {"all": [{"sideways": [4, 2]}, {"far": [4, 2, 0.14]}]},
+            "thumb_ily": {"all": [{"far": [4, 9, 0.16]}, {"sideways": [4, 2], "ratio": 0.6}]},
+            "four_fingers_up": {"all": ["index_up", "middle_up", "ring_up", "pinky_up"]},
+            "three_curled": {"all": ["middle_curled", "ring_curled", "pinky_curled"]},
+            "two_curled": {"all": ["ring_curled", "pinky_curled"]},
+        }
+    )
+    return {
+        "features": features,
+        "gestures": [
+            {
+                "name": GESTURE_OPEN_PALM,
+                "label": "OPEN",
+                "stop": True,
+                "checks": {"4UP": "four_fingers_up", "TH_AWAY": "thumb_away_from_palm"},
+            },
+            {
+                "name": GESTURE_ILY,
+                "label": "ILY",
+                "activity": ACTIVITY_BY_GESTURE[GESTURE_ILY],
+                "checks": {
+                    "IDX": "index_up",
+                    "PNK": "pinky_up",
+                    "MID_DN": {"not": "middle_up"},
+                    "RNG_DN": {"not": "ring_up"},
+                    "TH": {"any": ["thumb_side", "thumb_ily"]},
+                },
+            },
+            {
+                "name": GESTURE_ONE_FINGER,
+                "label": "ONE",
+                "activity": ACTIVITY_BY_GESTURE[GESTURE_ONE_FINGER],
+                "checks": {
+                    "IDX": "index_up",
+                    "3CURL": "three_curled",
+                    "TH_NEAR": "thumb_near_palm",
+                },
+            },
+            {
+                "name": GESTURE_TWO_FINGERS,
+                "label": "TWO",
+                "activity": ACTIVITY_BY_GESTURE[GESTURE_TWO_FINGERS],
+                "checks": {
+                    "IDX": "index_up",
+                    "MID": "middle_up",
+                    "2CURL": "two_curled",
+                    "TH_NEAR": "thumb_near_palm",
+                },
+            },
+        ],
+    }
+
+
+DEFAULT_RULES = _default_rules()
+
+_FEATURE_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+_CHECK_LABEL = re.compile(r"^[A-Za-z0-9_]+$")
+_AXES = "xy"
+
+
+def _landmark(value) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= 20:
+        raise ValueError(f"Landmark index must be an integer 0-20, got {value!r}")
+    return value
+
+
+def _args(node: dict, key: str, count: int) -> list:
+    value = node[key]
+    if not isinstance(value, list) or len(value) != count:
+        raise ValueError(f"'{key}' takes a list of {count} values, got {value!r}")
+    return value
+
+
+def _number(value) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"Threshold must be a finite number, got {value!r}")
+    return float(value)
+
+
+class _Compiler:
+    """Turns a rule spec into a comparison table plus generated evaluators."""
+
+    def __init__(self, spec: dict) -> None:
+        if not isinstance(spec, dict):
+            raise ValueError("Rules must be a mapping with 'features' and 'gestures'")
+        self.diffs: dict[tuple, int] = {}  # (axis, a, b) -> index: p[a][axis] - p[b][axis]
+        self.dists: dict[tuple, int] = {}  # (a, b) -> index
+        self.leans: dict[tuple, int] = {}  # (a, b, ratio) -> index
+        self.comparisons: dict[tuple, int] = {}  # (kind, index, sign, threshold) -> index
+        self.raw_features = spec.get("features", {})
+        if not isinstance(self.raw_features, dict):
+            raise ValueError("'features' must be a mapping of name -> predicate")
+        for name in self.raw_features:
+            if not isinstance(name, str) or not _FEATURE_NAME.match(name):
+                raise ValueError(f"Invalid feature name {name!r}")
+        self.features: dict[str, tuple] = {}
+        self._resolving: list[str] = []
+        for name in self.raw_features:
+            self._feature(name)
+        self.gestures = self._gestures(spec.get("gestures"))
+
+    def _diff(self, axis: int, a: int, b: int) -> int:
+        return self.diffs.setdefault((axis, a, b), len(self.diffs))
+
+    def _compare(self, kind: str, index: int, sign: float, threshold: float) -> tuple:
+        key = (kind, index, sign, threshold)
+        return ("cmp", self.comparisons.setdefault(key, len(self.comparisons)))
+
+    def _feature(self, name: str) -> tuple:
+        if name in self.features:
+            return ("ref", name)
+        if name not in self.raw_features:
+            raise ValueError(f"Unknown feature {name!r}")
+        if name in self._resolving:
+            raise ValueError(f"Feature cycle: {' -> '.join(self._resolving + [name])}")
+        self._resolving.append(name)
+        self.features[name] = self._expr(self.raw_features[name])
+        self._resolving.pop()
+        return ("ref", name)
+
+    def _expr(self, node) -> tuple:
+        if isinstance(node, str):
+            return self._feature(node)
+        if not isinstance(node, dict):
+            raise ValueError(f"Predicate must be a feature name or a mapping, got {node!r}")
+        if "all" in node or "any" in node:
+            op = "all" if "all" in node else "any"
+            parts = node[op]
+            if not isinstance(parts, list) or not parts:
+                raise ValueError(f"'{op}' needs a non-empty list")
+            return (op, [self._expr(part) for part in parts])
+        if "not" in node:
+            return ("not", self._expr(node["not"]))
+        if "above" in node or "left_of" in node:
+            kind = "above" if "above" in node else "left_of"
+            a, b = (_landmark(v) for v in _args(node, kind, 2))
+            axis = 1 if kind == "above" else 0
+            return self._compare("diff", self._diff(axis, b, a), 1.0, _number(node.get("by", 0.0)))
+        if "near" in node or "far" in node:
+            kind = "near" if "near" in node else "far"
+            a, b, threshold = _args(node, kind, 3)
+            a, b = sorted((_landmark(a), _landmark(b)))
+            self._diff(0, a, b)
+            self._diff(1, a, b)
+            index = self.dists.setdefault((a, b), len(self.dists))
+            threshold = _number(threshold)
+            if kind == "near":
+                return self._compare("dist", index, -1.0, -threshold)
+            return self._compare("dist", index, 1.0, threshold)
+        if "sideways" in node:
+            a, b = sorted(_landmark(v) for v in _args(node, "sideways", 2))
+            ratio = _number(node.get("ratio", 1.0))
+            self._diff(0, a, b)
+            self._diff(1, a, b)
+            index = self.leans.setdefault((a, b, ratio), len(self.leans))
+            return self._compare("lean", index, 1.0, 0.0)
+        raise ValueError(f"Unknown predicate {node!r}")
+
+    def _gestures(self, raw) -> list[dict]:
+        if not isinstance(raw, list) or not raw:
+            raise ValueError("'gestures' must be a non-empty list")
+        gestures = []
+        for entry in raw:
+            name = entry.get("name") if isinstance(entry, dict) else None
+            if not isinstance(name, str) or not name:
+                raise ValueError(f"Gesture needs a name: {entry!r}")
+            label = entry.get("label", name)
+            if not _CHECK_LABEL.match(label):
+                raise ValueError(f"Invalid label {label!r} for gesture {name}")
+            raw_checks = entry.get("checks")
+            if isinstance(raw_checks, dict):
+                raw_checks = list(raw_checks.items())
+            if not raw_checks:
+                raise ValueError(f"Gesture {name} needs at least one check")
+            checks = []
+            for check_label, predicate in raw_checks:
+                if not _CHECK_LABEL.match(check_label):
+                    raise ValueError(f"Invalid check label {check_label!r} for gesture {name}")
+                checks.append((check_label, self._expr(predicate)))
+            activity = entry.get("activity")
+            stop = bool(entry.get("stop", False))
+            if stop and activity is not None:
+                raise ValueError(f"Gesture {name} cannot both stop and start an activity")
+            if activity is not None and not isinstance(activity, str):
+                raise ValueError(f"Activity for gesture {name} must be a string")
+            gestures.append(
+                {"name": name, "label": label, "checks": checks, "activity": activity, "stop": stop}
+            )
+        if len({g["name"] for g in gestures}) != len(gestures):
+            raise ValueError("Gesture names must be unique")
+        return gestures
+
+
+class _Emitter:
+    """Writes the boolean part of the evaluators for scalar bools or NumPy arrays."""
+
+    def __init__(self, compiler: _Compiler, numpy: bool) -> None:
+        self.compiler = compiler
+        self.numpy = numpy
+
+    def expr(self, node) -> str:
+        kind = node[0]
+        if kind == "cmp":
+            return f"c{node[1]}"
+        if kind == "ref":
+            return f"f_{node[1]}"
+        if kind == "not":
+            return f"(~{self.expr(node[1])})" if self.numpy else f"(not {self.expr(node[1])})"
+        joiner = {"all": (" & ", " and "), "any": (" | ", " or ")}[kind][0 if self.numpy else 1]
+        return "(" + joiner.join(self.expr(part) for part in node[1]) + ")"
+
+    def features(self, names) -> list[str]:
+        # Dependencies first; features were resolved depth-first, so dict order works.
+        return [f"    f_{name} = {self.expr(self.compiler.features[name])}" for name in names]
+
+    def gestures(self, lines: bool) -> list[str]:
+        out = []
+        for i, gesture in enumerate(self.compiler.gestures):
+            for j, (_, predicate) in enumerate(gesture["checks"]):
+                out.append(f"    k{i}_{j} = {self.expr(predicate)}")
+            joiner = " & " if self.numpy else " and "
+            checks = (f"k{i}_{j}" for j in range(len(gesture["checks"])))
+            out.append(f"    g{i} = " + joiner.join(checks))
+        if self.numpy:
+            return out
+        gestures = enumerate(self.compiler.gestures)
+        chain = " else ".join(f"{g['name']!r} if g{i}" for i, g in gestures)
+        out.append(f"    gesture = {chain} else None")
+        if lines:
+            out.append("    lines = [")
+            for i, gesture in enumerate(self.compiler.gestures):
+                parts = [f"('*' if g{i} else '-')", repr(gesture["label"] + " ")]
+                for j, (check_label, _) in enumerate(gesture["checks"]):
+                    prefix = " " if j else ""
+                    parts.append(repr(f"{prefix}{check_label}:"))
+                    parts.append(f"('T' if k{i}_{j} else 'F')")
+                out.append("        " + " + ".join(parts) + ",")
+            out.append("    ]")
+        return out
+
+
+class RuleSet:
+    """Gesture rules compiled once into straight-line evaluators.
+
+    Landmark objects are evaluated by generated Python code that reads each
+    landmark once. Arrays go through one matrix product and one comparison table
+    (see ``comparisons``) and then the same generated boolean code.
+    """
+
+    def __init__(self, spec: dict) -> None:
+        compiler = _Compiler(spec)
+        self.feature_names = tuple(compiler.raw_features)
+        self.gesture_names = tuple(g["name"] for g in compiler.gestures)
+        self.stop_gestures = tuple(g["name"] for g in compiler.gestures if g["stop"])
+        self.activity_by_gesture = {
+            g["name"]: g["activity"] for g in compiler.gestures if g["activity"] is not None
+        }
+        self.activities = tuple(dict.fromkeys(self.activity_by_gesture.values()))
+        self._build_table(compiler)
+        self.source = self._generate(compiler)
+        namespace = {"_hypot": math.hypot, "_np": np}
+        exec(compile(self.source, "<observer.rules>", "exec"), namespace)
+        self._classify_objects = namespace["_classify_objects"]
+        self._detect_objects = namespace["_detect_objects"]
+        self._classify_flags = namespace["_classify_flags"]
+        self._batch = namespace["_batch"]
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                spec = json.load(f)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}: {exc}") from exc
+        return cls(spec)
+
+    def _build_table(self, compiler: _Compiler) -> None:
+        linear = np.zeros((63, max(1, len(compiler.diffs))))
+        for (axis, a, b), column in compiler.diffs.items():
+            linear[a * 3 + axis, column] += 1.0
+            linear[b * 3 + axis, column] -= 1.0
+        self._linear = linear
+        diffs = compiler.diffs
+        self._dist_x = np.array([diffs[(0, a, b)] for a, b in compiler.dists], dtype=np.intp)
+        self._dist_y = np.array([diffs[(1, a, b)] for a, b in compiler.dists], dtype=np.intp)
+        self._lean_x = np.array([diffs[(0, a, b)] for a, b, _ in compiler.leans], dtype=np.intp)
+        self._lean_y = np.array([diffs[(1, a, b)] for a, b, _ in compiler.leans], dtype=np.intp)
+        self._lean_ratio = np.array([ratio for _, _, ratio in compiler.leans])
+        offsets = {"diff": 0, "dist": len(diffs), "lean": len(diffs) + len(compiler.dists)}
+        self._cmp_index = np.array(
+            [offsets[kind] + index for kind, index, _, _ in compiler.comparisons], dtype=np.intp
+        )
+        self._cmp_sign = np.array([sign for _, _, sign, _ in compiler.comparisons])
+        self._cmp_threshold = np.array([threshold for _, _, _, threshold in compiler.comparisons])
+
+    def _generate(self, compiler: _Compiler) -> str:
+        scalar = _Emitter(compiler, numpy=False)
+        vector = _Emitter(compiler, numpy=True)
+        used = sorted({(i, axis) for axis, a, b in compiler.diffs for i in (a, b)})
+        points = sorted({i for i, _ in used})
+
+        load = [f"    p{i} = lm[{i}]" for i in points]
+        load += [f"    {_AXES[axis]}{i} = p{i}.{_AXES[axis]}" for i, axis in used]
+        for (axis, a, b), index in compiler.diffs.items():
+            load.append(f"    d{index} = {_AXES[axis]}{a} - {_AXES[axis]}{b}")
+        for (a, b), index in compiler.dists.items():
+            dx, dy = compiler.diffs[(0, a, b)], compiler.diffs[(1, a, b)]
+            load.append(f"    h{index} = _hypot(d{dx}, d{dy})")
+        for (a, b, ratio), index in compiler.leans.items():
+            dx, dy = compiler.diffs[(0, a, b)], compiler.diffs[(1, a, b)]
+            load.append(f"    s{index} = abs(d{dx}) - abs(d{dy}) * {ratio!r}")
+        prefix = {"diff": "d", "dist": "h", "lean": "s"}
+        for (kind, index, sign, threshold), c in compiler.comparisons.items():
+            if sign > 0:
+                load.append(f"    c{c} = {prefix[kind]}{index} > {threshold!r}")
+            else:
+                load.append(f"    c{c} = {prefix[kind]}{index} < {-threshold!r}")
+
+        unpack = [f"    c{i} = c[{i}]" for i in range(len(compiler.comparisons))]
+        names = list(compiler.features)
+        body_lines = scalar.features(names) + scalar.gestures(lines=True)
+        body_detect = scalar.features(names) + scalar.gestures(lines=False)
+        features_dict = ", ".join(f"{name!r}: f_{name}" for name in self.feature_names)
+        matches = ", ".join(f"g{i}" for i in range(len(compiler.gestures)))
+        source = (
+            ["def _classify_objects(lm):"] + load + body_lines + ["    return gesture, lines", ""]
+            + ["def _detect_objects(lm):"] + load + body_detect + ["    return gesture", ""]
+            + ["def _classify_flags(c):"] + unpack + body_lines + ["    return gesture, lines", ""]
+            + ["def _batch(c):"] + unpack + vector.features(names) + vector.gestures(lines=False)
+            + [f"    return [{matches}], {{{features_dict}}}", ""]
+        )
+        return "\n".join(source)
+
+    def comparisons(self, points: np.ndarray) -> np.ndarray:
+        """Every comparison for ``(..., 21, 3)`` points as a ``(..., K)`` bool array."""
+        points = np.asarray(points, dtype=np.float32)
+        linear = points.reshape(points.shape[:-2] + (63,)) @ self._linear
+        dists = np.hypot(linear[..., self._dist_x], linear[..., self._dist_y])
+        lean_dy = np.abs(linear[..., self._lean_y]) * self._lean_ratio
+        leans = np.abs(linear[..., self._lean_x]) - lean_dy
+        values = np.concatenate([linear, dists, leans], axis=-1)
+        return values[..., self._cmp_index] * self._cmp_sign > self._cmp_threshold
+
+    def classify(self, landmarks) -> tuple[Optional[str], list[str]]:
+        """Return the first matching gesture and one debug checkline per gesture."""
+        if isinstance(landmarks, np.ndarray):
+            return self._classify_flags(self.comparisons(landmarks).tolist())
+        return self._classify_objects(landmarks)
+
+    def classify_scored(self, landmarks) -> tuple[Optional[str], list[str], float]:
+        """``classify`` plus a score for the smoothers: rules either match or not, so 1.0."""
+        gesture, lines = self.classify(landmarks)
+        return gesture, lines, 1.0
+
+    def detect(self, landmarks) -> Optional[str]:
+        if isinstance(landmarks, np.ndarray):
+            return self._classify_flags(self.comparisons(landmarks).tolist())[0]
+        return self._detect_objects(landmarks)
+
+    def features_batch(self, points: np.ndarray) -> dict[str, np.ndarray]:
+        c = np.moveaxis(self.comparisons(points), -1, 0)
+        return self._batch(c)[1]
+
+    def detect_batch(self, points: np.ndarray) -> list[Optional[str]]:
+        c = np.moveaxis(self.comparisons(points), -1, 0)
+        matches = np.stack(self._batch(c)[0], axis=-1)
+        codes = np.where(matches.any(axis=-1), matches.argmax(axis=-1), -1)
+        names = self.gesture_names
+        return [names[code] if code >= 0 else None for code in codes.reshape(-1).tolist()]
+
+
+DEFAULT_RULESET = RuleSet(DEFAULT_RULES)
+
+
+def load_rules(path: Optional[str]) -> RuleSet:
+    return RuleSet.load(path) if path else DEFAULT_RULESET
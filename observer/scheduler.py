@@ -0,0 +1,116 @@
+from typing import Optional
+
+from observer.constants import ACTIVITY_BY_GESTURE, GESTURE_STOP
+
+MODE_FULL = "full"
+MODE_PROBE = "probe"
+MODE_STEADY = "steady"
+
+
+class SchedulerPolicy:
+    """Inference intervals per mode; ``0`` means every frame."""
+
+    def __init__(
+        self,
+        probe_interval: float = 0.5,
+        steady_interval: float = 0.25,
+        idle_after: float = 1.0,
+        steady_after: float = 5.0,
+    ) -> None:
+        self.probe_interval = probe_interval
+        self.steady_interval = steady_interval
+        self.idle_after = idle_after
+        self.steady_after = steady_after
+
+    def interval(self, mode: str) -> float:
+        if mode == MODE_PROBE:
+            return self.probe_interval
+        if mode == MODE_STEADY:
+            return self.steady_interval
+        return 0.0
+
+
+def switch_pending(
+    gesture: Optional[str],
+    active_activity: Optional[str],
+    activity_by_gesture: dict[str, str] = ACTIVITY_BY_GESTURE,
+    stop_gestures: tuple = (GESTURE_STOP,),
+) -> bool:
+    """True when ``gesture`` would move the tracker to a different activity."""
+    if gesture is None:
+        return False
+    if gesture in stop_gestures:
+        return active_activity is not None
+    target = activity_by_gesture.get(gesture)
+    return target is not None and target != active_activity
+
+
+class InferenceScheduler:
+    """Decides per frame whether to run the model, based on what the gates are doing.
+
+    No hand for ``idle_after`` seconds drops to a low-rate presence probe; a
+    gesture that could switch activity runs every frame; a visible hand with
+    nothing pending for ``steady_after`` seconds runs at the steady rate.
+    """
+
+    def __init__(self, policy: Optional[SchedulerPolicy] = None) -> None:
+        self.policy = policy or SchedulerPolicy()
+        self.mode = MODE_FULL
+        self.ran = 0
+        self.skipped = 0
+        self.inference_seconds = 0.0
+        self._last_run: Optional[float] = None
+        self._last_hand = 0.0
+        self._last_pending = 0.0
+        self._started: Optional[float] = None
+
+    def should_run(self, now: float) -> bool:
+        if self._started is None:
+            self._started = self._last_hand = self._last_pending = now
+        if self._last_run is None or now - self._last_run >= self.policy.interval(self.mode):
+            self._last_run = now
+            self.ran += 1
+            return True
+        self.skipped += 1
+        return False
+
+    def observe(self, now: float, hand_present: bool, pending: bool) -> None:
+        if hand_present:
+            self._last_hand = now
+        if pending:
+            self._last_pending = now
+            self.mode = MODE_FULL
+        elif not hand_present and now - self._last_hand >= self.policy.idle_after:
+            self.mode = MODE_PROBE
+        elif hand_present and now - self._last_pending >= self.policy.steady_after:
+            self.mode = MODE_STEADY
+        else:
+            self.mode = MODE_FULL
+
+    def record_inference(self, seconds: float) -> None:
+        self.inference_seconds += seconds
+
+    @property
+    def skipped_fraction(self) -> float:
+        total = self.ran + self.skipped
+        return self.skipped / total if total else 0.0
+
+    @property
+    def estimated_saved_seconds(self) -> float:
+        """Model time not spent, at the mean cost of the inferences that did run."""
+        if not self.ran:
+            return 0.0
+        return self.skipped * self.inference_seconds / self.ran
+
+    def hud_lines(self) -> list[str]:
+        return [
+            f"Sched: {self.mode}  ran/skip: {self.ran}/{self.skipped} "
+            f"({self.skipped_fraction:.0%} saved)"
+        ]
+
+    def summary(self) -> str:
+        return (
+            f"SCHEDULER ran={self.ran} skipped={self.skipped} "
+            f"saved={self.skipped_fraction:.1%} "
+            f"est_saved_inference_s={self.estimated_saved_seconds:.1f}"
+        )
@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import threading
+import time
+from typing import Optional
+
+_KEEPALIVE_SECONDS = 15.0
+_ROUTES = ("/snapshot", "/events")
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink a socket file left by a server that is gone; refuse anything else."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise FileExistsError(f"{path} is in use by another server")
+
+
+def parse_address(address: str) -> tuple[Optional[str], Optional[int], Optional[str]]:
+    """``unix:/path``, ``host:port`` or ``port`` -> ``(host, port, unix_path)``."""
+    if address.startswith("unix:"):
+        path = address[len("unix:"):]
+        if not path:
+            raise ValueError("unix: address needs a socket path")
+        return None, None, path
+    host, _, port = address.rpartition(":")
+    try:
+        number = int(port)
+    except ValueError:
+        raise ValueError(f"Invalid service address {address!r}") from None
+    if not 0 <= number <= 65535:
+        raise ValueError(f"Invalid port in service address {address!r}")
+    return host or "127.0.0.1", number, None
+
+
+class _Subscriber:
+    def __init__(self, queue_size: int) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+
+class EventService:
+    """Local HTTP API for headless runs, served by asyncio on its own thread.
+
+    ``GET /snapshot`` returns the current totals as JSON. ``GET /events`` is a
+    Server-Sent Events stream that starts with a ``snapshot`` event and then
+    pushes ``gesture`` and ``activity`` events as they happen. The frame loop only
+    hands copies over with ``call_soon_threadsafe``; it never waits on clients.
+    Each subscriber has a bounded queue, and a client that falls behind loses its
+    oldest events instead of holding up the others.
+    """
+
+    def __init__(self, address: str = "127.0.0.1:8765", queue_size: int = 256) -> None:
+        self.host, self.port, self.unix_path = parse_address(address)
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscribers: set[_Subscriber] = set()
+        # (totals, active activity, monotonic start of the active session)
+        self._state: tuple[dict, Optional[str], Optional[float]] = ({}, None, None)
+        self._last_gesture: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def url(self) -> str:
+        if self.unix_path is not None:
+            return f"unix:{self.unix_path}"
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._serve, name="observer-service", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Could not serve on {self.url}: {self._error}") from self._error
+
+    def _serve(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        try:
+            if self.unix_path is not None:
+                _remove_stale_socket(self.unix_path)
+                server = loop.run_until_complete(
+                    asyncio.start_unix_server(self._handle, path=self.unix_path)
+                )
+            else:
+                server = loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port)
+                )
+                self.port = server.sockets[0].getsockname()[1]
+        except OSError as exc:
+            self._error = exc
+            self._ready.set()
+            loop.close()
+            return
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(self._shutdown(server))
+            loop.close()
+
+    async def _shutdown(self, server: asyncio.AbstractServer) -> None:
+        server.close()
+        # Open event streams never finish on their own; each handler closes its writer.
+        tasks = asyncio.all_tasks() - {asyncio.current_task()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await server.wait_closed()
+
+    def close(self) -> None:
+        loop = self._loop
+        if loop is None or self._thread is None:
+            return
+        if self._error is None:
+            loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout=5.0)
+        self._thread = None
+        if self.unix_path is not None and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+    # Frame-loop side: cheap, thread-safe, never blocks.
+
+    def _call(self, callback, *args) -> None:
+        loop = self._loop
+        if loop is not None and self._error is None:
+            try:
+                loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                pass  # Loop already closed during shutdown.
+
+    def publish_state(self, tracker) -> None:
+        """Copy the tracker's totals so snapshots are answered without touching it."""
+        state = (dict(tracker.totals), tracker.active_activity, tracker.active_started_at)
+        self._call(self._set_state, state)
+
+    def publish_gesture(self, gesture: Optional[str]) -> None:
+        if gesture == self._last_gesture:
+            return
+        self._last_gesture = gesture
+        self._call(self._publish, {"type": "gesture", "ts": time.time(), "gesture": gesture})
+
+    def attach(self, tracker) -> None:
+        """Serve ``tracker``'s state and push an ``activity`` event on each of its switches."""
+        self.publish_state(tracker)
+        tracker.subscribe(self._on_tracker_event)
+
+    def _on_tracker_event(self, event: dict) -> None:
+        if event["type"] != "switch":
+            return
+        current = event["to"]
+        started_at = event["at"] if current is not None else None
+        self._call(self._set_state, (event["totals"], current, started_at))
+        activity = {
+            "type": "activity",
+            "ts": event["ts"],
+            "previous": event["from"],
+            "current": current,
+        }
+        self._call(self._publish, activity)
+
+    # Event-loop side.
+
+    def _set_state(self, state: tuple) -> None:
+        self._state = state
+
+    def snapshot(self) -> dict:
+        totals, active, started_at = self._state
+        values = dict(totals)
+        if active is not None and started_at is not None:
+            values[active] = values.get(active, 0.0) + max(0.0, time.monotonic() - started_at)
+        return {"ts": time.time(), "active": active, "totals": values}
+
+    def _publish(self, event: dict) -> None:
+        self.published += 1
+        for subscriber in self._subscribers:
+            if subscriber.queue.full():
+                subscriber.queue.get_nowait()
+                subscriber.dropped += 1
+            subscriber.queue.put_nowait(event)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            method, path = (parts[0], parts[1].split("?")[0]) if len(parts) >= 2 else ("", "")
+            if method != "GET" or path not in _ROUTES:
+                await _respond(writer, "404 Not Found", {"error": "not found", "routes": _ROUTES})
+            elif path == "/snapshot":
+                await _respond(writer, "200 OK", self.snapshot())
+            else:
+                await self._stream(writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            pass  # The service is shutting down; end the response quietly.
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        subscriber = _Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        try:
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n"
+            )
+            writer.write(_sse({"type": "snapshot", **self.snapshot()}))
+            await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), _KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    writer.write(b": keepalive\n\n")
+                else:
+                    if subscriber.dropped:
+                        writer.write(_sse({"type": "dropped", "count": subscriber.dropped}))
+                        subscriber.dropped = 0
+                    writer.write(_sse(event))
+                await writer.drain()
+        finally:
+            self._subscribers.discard(subscriber)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+
+def _sse(event: dict) -> bytes:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+
+async def _respond(writer: asyncio.StreamWriter, status: str, body: dict) -> None:
+    payload = json.dumps(body).encode()
+    writer.write(
+        f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+        + payload
+    )
+    await writer.drain()
@@ -0,0 +1,417 @@
+import os
+import threading
+import time
+from typing import Callable, Iterator, Optional, Sequence
+
+import numpy as np
+
+from observer.constants import HANDEDNESS_LABELS
+from observer.hands import HandObservation
+from observer.recording import Recording, open_recording
+from observer.roi import Point
+
+# (observations, timestamp_ms) from an asynchronous source's callback thread.
+ResultCallback = Callable[[list[HandObservation], int], None]
+
+
+class LandmarkSource:
+    """Where the frame engine gets its hands from.
+
+    Camera-backed sources (``needs_frames``) turn one RGB frame into hand
+    observations in camera orientation: ``detect`` returns them at once, or,
+    for ``asynchronous`` sources, ``detect_async`` hands them to the callback
+    given to ``open``. Sources without frames (recordings, synthetic streams)
+    yield ``(captured_at, observations)`` pairs from ``frames`` instead; with
+    ``selfie_view`` their landmarks are already mirrored for display.
+    ``asynchronous`` is only final once ``open`` has returned. ``warm_up``
+    runs after ``open`` so the first real frame does not pay one-off setup.
+    ``copies_input`` marks backends that copy every RGB frame they are given.
+    The engine releases the RGB buffer to its pool as soon as ``detect`` or
+    ``detect_async`` returns, so a source must not keep it.
+    """
+
+    needs_frames = True
+    asynchronous = False
+    selfie_view = False
+    copies_input = False
+
+    def open(self, on_result: Optional[ResultCallback] = None) -> None:
+        pass
+
+    def warm_up(self) -> None:
+        pass
+
+    def detect(self, rgb, timestamp_ms: int) -> list[HandObservation]:
+        raise NotImplementedError
+
+    def detect_async(self, rgb, timestamp_ms: int) -> None:
+        raise NotImplementedError
+
+    def frames(self) -> Iterator[tuple[float, list[HandObservation]]]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+def check_model_file(model_path: str) -> None:
+    if not os.path.exists(model_path):
+        raise RuntimeError(
+            "MediaPipe Tasks backend requires a model file.\n"
+            f"Missing: {model_path}\n"
+            "Download it with:\n"
+            "mkdir -p models && "
+            "wget -O models/hand_landmarker.task "
+            "https://storage.googleapis.com/mediapipe-models/"
+            "hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+        )
+    with open(model_path, "rb") as f:
+        header = f.read(32)
+    if header.startswith(b"<?xml"):
+        raise RuntimeError(
+            "Model file is XML, not a .task archive. Re-download with the full URL on one line:\n"
+            "wget -O models/hand_landmarker.task "
+            "https://storage.googleapis.com/mediapipe-models/"
+            "hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+        )
+
+
+def has_solutions() -> bool:
+    """Whether this MediaPipe build still has ``mp.solutions`` (imports MediaPipe)."""
+    import mediapipe as mp
+
+    return hasattr(mp, "solutions")
+
+
+# Warm-up input: no hand in it, but it runs the detector once at a typical size.
+_WARM_UP_SHAPE = (480, 640, 3)
+
+
+def _solutions_hands(result) -> list[HandObservation]:
+    observations = []
+    for i, hand in enumerate(result.multi_hand_landmarks or ()):
+        observation = HandObservation(hand.landmark)
+        if result.multi_handedness and i < len(result.multi_handedness):
+            classification = result.multi_handedness[i].classification[0]
+            observation.handedness = classification.label
+            observation.confidence = classification.score
+        observations.append(observation)
+    return observations
+
+
+def _tasks_hands(result) -> list[HandObservation]:
+    observations = []
+    for i, landmarks in enumerate(result.hand_landmarks or ()):
+        observation = HandObservation(landmarks)
+        if result.handedness and i < len(result.handedness) and result.handedness[i]:
+            observation.handedness = result.handedness[i][0].category_name
+            observation.confidence = result.handedness[i][0].score
+        observations.append(observation)
+    return observations
+
+
+class SolutionsSource(LandmarkSource):
+    """Legacy ``mp.solutions.hands`` pipeline."""
+
+    # ``process`` copies the frame into its input packet.
+    copies_input = True
+
+    def __init__(self, max_hands: int = 1) -> None:
+        self.max_hands = max_hands
+        self._hands = None
+
+    def open(self, on_result: Optional[ResultCallback] = None) -> None:
+        import mediapipe as mp
+
+        self._hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_hands,
+            min_detection_confidence=0.6,
+            min_tracking_confidence=0.6,
+        )
+
+    def warm_up(self) -> None:
+        self._hands.process(np.zeros(_WARM_UP_SHAPE, dtype=np.uint8))
+
+    def detect(self, rgb, timestamp_ms: int) -> list[HandObservation]:
+        return _solutions_hands(self._hands.process(rgb))
+
+    def close(self) -> None:
+        if self._hands is not None:
+            self._hands.close()
+            self._hands = None
+
+
+class TasksSource(LandmarkSource):
+    """MediaPipe Tasks ``HandLandmarker`` in VIDEO mode, or LIVE_STREAM with ``live_stream``."""
+
+    copies_input = True
+
+    def __init__(self, model_path: str, max_hands: int = 1, live_stream: bool = False) -> None:
+        check_model_file(model_path)
+        self.model_path = model_path
+        self.max_hands = max_hands
+        self.asynchronous = live_stream
+        self._landmarker = None
+        # VIDEO mode rejects timestamps that do not increase, warm-up included.
+        self._last_timestamp_ms = -1
+
+    def open(self, on_result: Optional[ResultCallback] = None) -> None:
+        import mediapipe as mp
+        from mediapipe.tasks.python.core.base_options import BaseOptions
+        from mediapipe.tasks.python.vision import (
+            HandLandmarker,
+            HandLandmarkerOptions,
+            RunningMode,
+        )
+
+        if self.asynchronous and on_result is None:
+            raise ValueError("LIVE_STREAM mode needs a result callback")
+        callback = None
+        if self.asynchronous:
+            # Runs on MediaPipe's callback thread.
+            def callback(result, output_image, timestamp_ms: int) -> None:
+                on_result(_tasks_hands(result), timestamp_ms)
+
+        self._mp = mp
+        options = HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=self.model_path),
+            running_mode=RunningMode.LIVE_STREAM if self.asynchronous else RunningMode.VIDEO,
+            num_hands=self.max_hands,
+            min_hand_detection_confidence=0.6,
+            min_hand_presence_confidence=0.6,
+            min_tracking_confidence=0.6,
+            result_callback=callback,
+        )
+        self._landmarker = HandLandmarker.create_from_options(options)
+
+    def _image(self, rgb):
+        # mp.Image copies the pixels (this MediaPipe has no constructor that wraps a
+        # caller's buffer), so the engine can release the RGB buffer at once. The
+        # copy is counted in the FRAMES summary.
+        return self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=rgb)
+
+    def warm_up(self) -> None:
+        # A LIVE_STREAM warm-up result would reach the engine's callback as a stray frame.
+        if not self.asynchronous:
+            self.detect(np.zeros(_WARM_UP_SHAPE, dtype=np.uint8), 0)
+
+    def detect(self, rgb, timestamp_ms: int) -> list[HandObservation]:
+        timestamp_ms = max(timestamp_ms, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        return _tasks_hands(self._landmarker.detect_for_video(self._image(rgb), timestamp_ms))
+
+    def detect_async(self, rgb, timestamp_ms: int) -> None:
+        self._landmarker.detect_async(self._image(rgb), timestamp_ms)
+
+    def close(self) -> None:
+        if self._landmarker is not None:
+            self._landmarker.close()
+            self._landmarker = None
+
+
+class BackendSource(LandmarkSource):
+    """The Solutions source when this MediaPipe build has it, otherwise Tasks.
+
+    The backend is picked in ``open``, which is the first time MediaPipe is
+    imported, so building the source is free and loading can run on a
+    background thread while the camera starts (see ``SourceLoader``).
+    """
+
+    def __init__(self, model_path: str, max_hands: int = 1, live_stream: bool = False) -> None:
+        self.model_path = model_path
+        self.max_hands = max_hands
+        self.live_stream = live_stream
+        self.backend: Optional[LandmarkSource] = None
+
+    def open(self, on_result: Optional[ResultCallback] = None) -> None:
+        if has_solutions():
+            backend = SolutionsSource(self.max_hands)
+        else:
+            backend = TasksSource(self.model_path, self.max_hands, self.live_stream)
+        backend.open(on_result)
+        self.backend = backend
+        self.asynchronous = backend.asynchronous
+        self.copies_input = backend.copies_input
+
+    def warm_up(self) -> None:
+        self.backend.warm_up()
+
+    def detect(self, rgb, timestamp_ms: int) -> list[HandObservation]:
+        return self.backend.detect(rgb, timestamp_ms)
+
+    def detect_async(self, rgb, timestamp_ms: int) -> None:
+        self.backend.detect_async(rgb, timestamp_ms)
+
+    def close(self) -> None:
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+
+
+def make_source(model_path: str, max_hands: int = 1, live_stream: bool = False) -> LandmarkSource:
+    """A camera source for whichever MediaPipe backend is installed, not yet loaded."""
+    return BackendSource(model_path, max_hands, live_stream)
+
+
+class SourceLoader(threading.Thread):
+    """Opens and warms up a source, usually on a background thread.
+
+    ``wait`` blocks until loading is done and re-raises its error, so a
+    missing model file still fails the run with the usual message.
+    """
+
+    def __init__(self, source: LandmarkSource, on_result: Optional[ResultCallback] = None) -> None:
+        super().__init__(name="observer-backend", daemon=True)
+        self.source = source
+        self.on_result = on_result
+        self.error: Optional[BaseException] = None
+        self.load_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.loaded_at: Optional[float] = None
+
+    def run(self) -> None:
+        started = time.perf_counter()
+        try:
+            self.source.open(self.on_result)
+            self.source.warm_up()
+        except BaseException as exc:
+            self.error = exc
+        self.load_seconds = time.perf_counter() - started
+        self.loaded_at = time.perf_counter()
+
+    def wait(self) -> None:
+        started = time.perf_counter()
+        if self.ident is not None:
+            self.join()
+        elif self.loaded_at is None:
+            self.run()
+        self.wait_seconds = time.perf_counter() - started
+        if self.error is not None:
+            raise self.error
+
+
+def _points(array) -> list[Point]:
+    return [Point(x, y, z) for x, y, z in array.tolist()]
+
+
+class RecordingSource(LandmarkSource):
+    """Hands from a landmark recording, at recorded speed with ``realtime``.
+
+    ``recording`` is a path, a ``Recording`` or a ``FRAME_DTYPE`` array.
+    Recorded landmarks are already in the mirrored (display) view; frames
+    still in camera orientation (``selfie_view=False``, as batch landmarking
+    produces) are mirrored by the engine like a camera source's. Without
+    ``realtime`` the frames keep their recorded timestamps; with it they are
+    re-stamped on the monotonic clock and paced like the original session.
+    """
+
+    needs_frames = False
+
+    def __init__(self, recording, realtime: bool = False, selfie_view: bool = True) -> None:
+        if isinstance(recording, np.ndarray):
+            self.frames_array = recording
+        else:
+            if not isinstance(recording, Recording):
+                recording = open_recording(recording)
+            self.frames_array = recording.frames
+        self.recording = recording
+        self.realtime = realtime
+        self.selfie_view = selfie_view
+
+    def frames(self) -> Iterator[tuple[float, list[HandObservation]]]:
+        frames = self.frames_array
+        if len(frames) == 0:
+            return
+        times = frames["t"].tolist()
+        present = frames["present"].tolist()
+        codes = frames["handedness"].tolist()
+        first = times[0]
+        began = time.monotonic()
+        for i, t in enumerate(times):
+            captured_at = t
+            if self.realtime:
+                captured_at = began + (t - first)
+                delay = captured_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            observations = []
+            if present[i]:
+                observations.append(
+                    HandObservation(_points(frames["landmarks"][i]), HANDEDNESS_LABELS[codes[i]])
+                )
+            yield captured_at, observations
+
+
+class SyntheticSource(LandmarkSource):
+    """A jittered stream of given poses, for benchmarks and soak runs without a camera.
+
+    ``poses`` are ``(21, 3)`` landmark arrays in the display view; each one is
+    shown for ``hold_frames`` frames at ``fps``, cycling until ``count`` frames
+    have been produced (forever when ``count`` is ``None``). A ``None`` pose is
+    a stretch with no hand in view.
+    """
+
+    needs_frames = False
+    selfie_view = True
+
+    def __init__(
+        self,
+        poses: Sequence[Optional[np.ndarray]],
+        count: Optional[int] = None,
+        fps: float = 30.0,
+        hold_frames: int = 90,
+        jitter: float = 0.003,
+        handedness: Optional[str] = None,
+        seed: int = 0,
+    ) -> None:
+        if not poses:
+            raise ValueError("SyntheticSource needs at least one pose")
+        self.poses = [None if p is None else np.asarray(p, dtype=np.float64) for p in poses]
+        self.count = count
+        self.fps = fps
+        self.hold_frames = hold_frames
+        self.jitter = jitter
+        self.handedness = handedness
+        self.rng = np.random.default_rng(seed)
+
+    def frames(self) -> Iterator[tuple[float, list[HandObservation]]]:
+        i = 0
+        while self.count is None or i < self.count:
+            pose = self.poses[(i // self.hold_frames) % len(self.poses)]
+            observations = []
+            if pose is not None:
+                points = pose + self.rng.normal(0.0, self.jitter, pose.shape)
+                observations.append(HandObservation(_points(points), self.handedness))
+            yield i / self.fps, observations
+            i += 1
+
+
+class StreamSource(LandmarkSource):
+    """The next ``duration`` seconds of a ``LandmarkStream`` (``observer.synthetic``), unpaced.
+
+    ``segment`` is the stream segment the last yielded frame belongs to.
+    """
+
+    needs_frames = False
+    selfie_view = True
+
+    def __init__(self, stream, duration: float) -> None:
+        self.stream = stream
+        self.duration = duration
+        self.segment = None
+
+    def frames(self) -> Iterator[tuple[float, list[HandObservation]]]:
+        for frames, self.segment in self.stream.blocks(self.duration):
+            times = frames["t"].tolist()
+            present = frames["present"].tolist()
+            codes = frames["handedness"].tolist()
+            for i, t in enumerate(times):
+                observations = []
+                if present[i]:
+                    observations.append(
+                        HandObservation(
+                            _points(frames["landmarks"][i]), HANDEDNESS_LABELS[codes[i]]
+                        )
+                    )
+                yield t, observations
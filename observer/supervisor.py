@@ -0,0 +1,302 @@
+import multiprocessing
+import queue
+import time
+from typing import Callable, Optional
+
+import cv2
+
+from observer.capture import CaptureSettings, open_camera
+from observer.engine import FrameEngine, RuntimeConfig
+from observer.filters import make_landmark_filter
+from observer.gates import make_smoother
+from observer.learned import load_classifier
+from observer.rules import load_rules
+from observer.sources import LandmarkSource, make_source
+
+
+class _WorkerReporter:
+    """Engine listener that turns gestures, switches and ticks into supervisor messages.
+
+    Messages are tuples tagged with ``generation`` so the supervisor can ignore
+    anything a replaced worker left in its queue.
+    """
+
+    def __init__(self, engine: FrameEngine, generation: int, events) -> None:
+        self.engine = engine
+        self.generation = generation
+        self.events = events
+        self.last_at = time.monotonic()
+        self.frames = 0
+
+    def on_gesture(self, gesture: Optional[str]) -> None:
+        self.events.put(("gesture", self.generation, time.time(), gesture))
+
+    def __call__(self, event: dict) -> None:
+        if event["type"] == "switch":
+            self.events.put(("switch", self.generation, event["ts"], event["from"], event["to"]))
+        elif event["type"] == "tick":
+            frames = self.engine.frames_processed
+            elapsed = event["at"] - self.last_at
+            fps = (frames - self.frames) / elapsed if elapsed > 0 else 0.0
+            self.last_at, self.frames = event["at"], frames
+            self.events.put(
+                ("heartbeat", self.generation, event["ts"], event["totals"], event["active"], fps)
+            )
+
+
+def _worker_engine(source: LandmarkSource, config: dict) -> FrameEngine:
+    """The CLI's frame engine for one camera, headless and silent."""
+    rules = load_classifier(load_rules(config.get("rules")), config.get("classifier"))
+    return FrameEngine(
+        source,
+        RuntimeConfig(
+            smoother=make_smoother(
+                config.get("smoothing", "count"), config.get("smoothing_window", 7)
+            ),
+            rules=rules,
+            landmark_filter=make_landmark_filter(config.get("landmark_filter", "none")),
+            hold_seconds=config.get("hold_seconds", 1.5),
+            headless=True,
+            console=False,
+        ),
+    )
+
+
+def _run_worker(engine: FrameEngine, cap, generation: int, events, config: dict) -> None:
+    """Report ready, run ``engine`` on ``cap`` until a read fails, then exit with an error."""
+    engine.tracker.tick_seconds = config.get("heartbeat_interval", 1.0)
+    reporter = _WorkerReporter(engine, generation, events)
+    engine.tracker.subscribe(reporter)
+    engine.subscribe_gestures(reporter.on_gesture)
+    events.put(("ready", generation, time.time()))
+    try:
+        engine.run(cap)
+    finally:
+        cap.release()
+    events.put(("error", generation, time.time(), "camera read failed"))
+    raise SystemExit(1)
+
+
+def _camera_worker(camera_index: int, generation: int, events, config: dict) -> None:
+    """Run one camera through ``FrameEngine`` and report to the supervisor."""
+    # Workers share the machine; one OpenCV pool per process would oversubscribe it.
+    cv2.setNumThreads(1)
+    try:
+        engine = _worker_engine(make_source(config["model_path"]), config)
+        # The model loads while the camera opens, as in the single-camera app.
+        engine.load(background=True)
+        cap = open_camera(camera_index, config.get("capture"))
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open camera index {camera_index}")
+        engine.wait_loaded()
+    except Exception as exc:
+        events.put(("error", generation, time.time(), str(exc)))
+        raise SystemExit(1)
+    _run_worker(engine, cap, generation, events, config)
+
+
+class FeedStatus:
+    """Supervisor-side view of one camera and its current worker process."""
+
+    def __init__(self, camera_index: int) -> None:
+        self.camera_index = camera_index
+        self.process = None
+        self.events = None
+        self.generation = -1
+        self.restarts = 0
+        self.failures = 0
+        self.ready = False
+        self.started_at = 0.0
+        self.last_seen = 0.0
+        self.next_start_at = 0.0
+        self.fps = 0.0
+        self.gesture: Optional[str] = None
+        self.active_activity: Optional[str] = None
+        self.last_error: Optional[str] = None
+        # Time from workers that have exited, and the running worker's latest totals.
+        self.banked: dict[str, float] = {}
+        self.current: dict[str, float] = {}
+
+    def totals(self) -> dict[str, float]:
+        totals = dict(self.banked)
+        for activity, seconds in self.current.items():
+            totals[activity] = totals.get(activity, 0.0) + seconds
+        return totals
+
+
+class CameraSupervisor:
+    """One worker process per camera, restarted when it crashes or stalls.
+
+    Each worker runs its camera through its own headless ``FrameEngine`` and
+    talks to the supervisor over its own queue, so a feed that hangs or dies
+    cannot block the others. A worker that sends nothing for ``stall_seconds``
+    (or is not ready within ``start_timeout``) is killed and restarted after
+    ``restart_delay``, doubling on each consecutive failure up to
+    ``max_backoff``. Totals are the sum of every worker's last reported totals;
+    a crash loses at most one heartbeat interval of the running activity.
+    """
+
+    def __init__(
+        self,
+        camera_indices: list[int],
+        model_path: str,
+        rules: Optional[str] = None,
+        classifier: Optional[str] = None,
+        smoothing: str = "count",
+        smoothing_window: int = 7,
+        landmark_filter: str = "none",
+        hold_seconds: float = 1.5,
+        capture: Optional[CaptureSettings] = None,
+        heartbeat_interval: float = 1.0,
+        stall_seconds: float = 10.0,
+        start_timeout: float = 60.0,
+        restart_delay: float = 1.0,
+        max_backoff: float = 30.0,
+        healthy_after: float = 60.0,
+        on_event: Optional[Callable[[int, tuple], None]] = None,
+        worker=_camera_worker,
+    ) -> None:
+        if len(set(camera_indices)) != len(camera_indices):
+            raise ValueError("Camera indices must be unique")
+        self.feeds = {index: FeedStatus(index) for index in camera_indices}
+        self.config = {
+            "model_path": model_path,
+            "rules": rules,
+            "classifier": classifier,
+            "smoothing": smoothing,
+            "smoothing_window": smoothing_window,
+            "landmark_filter": landmark_filter,
+            "hold_seconds": hold_seconds,
+            "capture": capture,
+            "heartbeat_interval": heartbeat_interval,
+        }
+        self.stall_seconds = stall_seconds
+        self.start_timeout = start_timeout
+        self.restart_delay = restart_delay
+        self.max_backoff = max_backoff
+        self.healthy_after = healthy_after
+        self.on_event = on_event
+        self.worker = worker
+        self._context = multiprocessing.get_context("spawn")
+
+    def _start(self, feed: FeedStatus, now: float) -> None:
+        feed.generation += 1
+        feed.events = self._context.Queue()
+        feed.process = self._context.Process(
+            target=self.worker,
+            args=(feed.camera_index, feed.generation, feed.events, self.config),
+            name=f"observer-camera-{feed.camera_index}",
+            daemon=True,
+        )
+        feed.process.start()
+        feed.ready = False
+        feed.started_at = feed.last_seen = now
+
+    def _retire(self, feed: FeedStatus, now: float, reason: str) -> None:
+        process = feed.process
+        if process.is_alive():
+            process.kill()
+        process.join(timeout=5.0)
+        feed.events.close()
+        feed.events.cancel_join_thread()
+        for activity, seconds in feed.current.items():
+            feed.banked[activity] = feed.banked.get(activity, 0.0) + seconds
+        feed.current = {}
+        feed.gesture = None
+        feed.active_activity = None
+        feed.process = None
+        feed.last_error = reason
+        if now - feed.started_at >= self.healthy_after:
+            feed.failures = 0
+        feed.failures += 1
+        feed.restarts += 1
+        feed.next_start_at = now + min(
+            self.max_backoff, self.restart_delay * 2.0 ** (feed.failures - 1)
+        )
+        self._emit(feed, ("restart", feed.generation, time.time(), reason))
+
+    def _emit(self, feed: FeedStatus, message: tuple) -> None:
+        if self.on_event is not None:
+            self.on_event(feed.camera_index, message)
+
+    def _drain(self, feed: FeedStatus, now: float) -> None:
+        while True:
+            try:
+                message = feed.events.get_nowait()
+            except queue.Empty:
+                return
+            if message[1] != feed.generation:
+                continue
+            kind = message[0]
+            feed.last_seen = now
+            if kind == "ready":
+                feed.ready = True
+            elif kind == "heartbeat":
+                _, _, _, totals, active, fps = message
+                feed.current = totals
+                feed.active_activity = active
+                feed.fps = fps
+            elif kind == "gesture":
+                feed.gesture = message[3]
+            elif kind == "switch":
+                feed.active_activity = message[4]
+            elif kind == "error":
+                feed.last_error = message[3]
+            self._emit(feed, message)
+
+    def start(self) -> None:
+        now = time.monotonic()
+        for feed in self.feeds.values():
+            self._start(feed, now)
+
+    def poll(self) -> None:
+        """Drain every feed's queue, then restart workers that died or stalled."""
+        now = time.monotonic()
+        for feed in self.feeds.values():
+            if feed.process is None:
+                if now >= feed.next_start_at:
+                    self._start(feed, now)
+                continue
+            self._drain(feed, now)
+            if feed.process.exitcode is not None:
+                # Pick up anything sent between the last drain and the exit.
+                self._drain(feed, now)
+                reason = feed.last_error or f"exit code {feed.process.exitcode}"
+                feed.last_error = None
+                self._retire(feed, now, reason)
+            elif now - feed.last_seen >= (self.stall_seconds if feed.ready else self.start_timeout):
+                self._retire(feed, now, f"no heartbeat for {now - feed.last_seen:.1f}s")
+
+    def stop(self) -> None:
+        for feed in self.feeds.values():
+            if feed.process is None:
+                continue
+            self._drain(feed, time.monotonic())
+            feed.process.terminate()
+            feed.process.join(timeout=5.0)
+            if feed.process.is_alive():
+                feed.process.kill()
+                feed.process.join()
+            feed.events.close()
+            feed.events.cancel_join_thread()
+            feed.process = None
+
+    def totals(self) -> dict[str, float]:
+        """Activity totals summed over every camera and every worker generation."""
+        combined: dict[str, float] = {}
+        for feed in self.feeds.values():
+            for activity, seconds in feed.totals().items():
+                combined[activity] = combined.get(activity, 0.0) + seconds
+        return combined
+
+    def status_lines(self) -> list[str]:
+        lines = []
+        for feed in self.feeds.values():
+            state = "up" if feed.process is not None and feed.ready else "starting"
+            if feed.process is None:
+                state = "restarting"
+            lines.append(
+                f"CAMERA {feed.camera_index} {state} fps={feed.fps:.1f} "
+                f"activity={feed.active_activity or 'IDLE'} restarts={feed.restarts}"
+            )
+        return lines
@@ -0,0 +1,251 @@
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from observer.constants import (
+    GESTURE_ILY,
+    GESTURE_ONE_FINGER,
+    GESTURE_OPEN_PALM,
+    GESTURE_TWO_FINGERS,
+)
+from observer.recording import FRAME_DTYPE, handedness_code
+from observer.rules import DEFAULT_RULESET, RuleSet
+
+# Finger tips/joints per finger: (MCP, PIP, TIP, x) in the unit-test hand geometry.
+_FINGERS = (
+    (5, 6, 8, 0.45),
+    (9, 10, 12, 0.50),
+    (13, 14, 16, 0.55),
+    (17, 18, 20, 0.60),
+)
+_THUMBS = {
+    "near": (0.52, 0.56, 0.00),
+    "away": (0.80, 0.40, -0.04),
+    "side": (0.74, 0.56, -0.01),
+}
+THUMB_POSITIONS = tuple(_THUMBS)
+
+# (index, middle, ring, pinky) up, thumb position; ``None`` is a loose fist.
+GESTURE_POSES = {
+    GESTURE_ILY: ((True, False, False, True), "side"),
+    GESTURE_ONE_FINGER: ((True, False, False, False), "near"),
+    GESTURE_TWO_FINGERS: ((True, True, False, False), "near"),
+    GESTURE_OPEN_PALM: ((True, True, True, True), "away"),
+    None: ((False, False, False, False), "near"),
+}
+
+
+def pose_array(index: bool, middle: bool, ring: bool, pinky: bool, thumb: str) -> np.ndarray:
+    """A ``(21, 3)`` palm-facing left hand in the display view, as in the unit tests."""
+    points = np.empty((21, 3), dtype=np.float64)
+    points[:] = (0.5, 0.7, 0.0)
+    points[0] = (0.5, 0.8, 0.0)
+    points[9] = (0.5, 0.55, 0.0)
+    for (mcp, pip, tip, x), up in zip(_FINGERS, (index, middle, ring, pinky)):
+        if up:
+            points[[mcp, pip, tip]] = ((x, 0.62, -0.02), (x, 0.46, -0.03), (x, 0.26, -0.05))
+        else:
+            points[[mcp, pip, tip]] = ((x, 0.62, 0.00), (x, 0.58, 0.01), (x, 0.68, 0.02))
+    points[2] = (0.40, 0.60, 0.00)
+    points[4] = _THUMBS[thumb]
+    return points
+
+
+def gesture_pose(gesture: Optional[str]) -> np.ndarray:
+    fingers, thumb = GESTURE_POSES[gesture]
+    return pose_array(*fingers, thumb)
+
+
+def back_of_hand(points: np.ndarray) -> np.ndarray:
+    """The same hand turned around: mirrored about the wrist, depth reversed."""
+    turned = points.copy()
+    turned[..., 0] = 2.0 * points[..., :1, 0] - points[..., 0]
+    turned[..., 2] = -points[..., 2]
+    return turned
+
+
+class Segment:
+    """``duration`` seconds from ``start`` of one gesture (``None``: a loose fist).
+
+    ``present`` is false while the hand is out of view; ``back`` shows the
+    back of the hand, which the palm check must reject.
+    """
+
+    __slots__ = ("gesture", "start", "duration", "present", "back")
+
+    def __init__(
+        self,
+        gesture: Optional[str],
+        start: float,
+        duration: float,
+        present: bool = True,
+        back: bool = False,
+    ) -> None:
+        self.gesture = gesture
+        self.start = start
+        self.duration = duration
+        self.present = present
+        self.back = back
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    @property
+    def shown(self) -> Optional[str]:
+        """The gesture the gates should accept from this segment, if any."""
+        return self.gesture if self.present and not self.back else None
+
+
+class LandmarkStream:
+    """Long, seeded landmark streams with the noise a real landmarker shows.
+
+    Segments follow each other at random: a gesture from ``gestures``, a loose
+    fist (``idle_share``), no hand in view (``away_share``) or the back of the
+    hand (``back_share``), each lasting a uniform draw from ``dwell`` seconds.
+    Within a segment the hand drifts across the frame (``wander``), changes
+    size a little, shakes (``jitter``) and blends from the previous pose over
+    ``transition_seconds``. Single frames drop out (``dropout_rate``) or carry
+    the wrong handedness label (``flip_rate``). Frames come in
+    ``FRAME_DTYPE`` blocks of at most ``max_block`` frames, so generation is
+    vectorized and rates of thousands of frames per second are cheap.
+    """
+
+    def __init__(
+        self,
+        fps: float = 30.0,
+        seed: int = 0,
+        gestures: Sequence[str] = (
+            GESTURE_ILY,
+            GESTURE_ONE_FINGER,
+            GESTURE_TWO_FINGERS,
+            GESTURE_OPEN_PALM,
+        ),
+        dwell: tuple[float, float] = (3.0, 60.0),
+        idle_share: float = 0.15,
+        away_share: float = 0.1,
+        back_share: float = 0.05,
+        transition_seconds: float = 0.25,
+        jitter: float = 0.003,
+        wander: float = 0.05,
+        dropout_rate: float = 0.01,
+        flip_rate: float = 0.002,
+        handedness: str = "Left",
+        max_block: int = 4096,
+        start: float = 0.0,
+    ) -> None:
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        if not gestures:
+            raise ValueError("LandmarkStream needs at least one gesture")
+        if idle_share + away_share + back_share >= 1.0:
+            raise ValueError("idle, away and back shares must leave room for gestures")
+        self.fps = fps
+        self.rng = np.random.default_rng(seed)
+        self.gestures = tuple(gestures)
+        self.poses = {gesture: gesture_pose(gesture) for gesture in self.gestures + (None,)}
+        self.dwell = dwell
+        self.shares = (idle_share, away_share, back_share)
+        self.transition_seconds = transition_seconds
+        self.jitter = jitter
+        self.wander = wander
+        self.dropout_rate = dropout_rate
+        self.flip_rate = flip_rate
+        self.handedness = handedness_code(handedness)
+        self.flipped = handedness_code({"Left": "Right", "Right": "Left"}.get(handedness))
+        self.max_block = max_block
+        self.start = start
+        # Frame index of the next frame; times are index / fps so they never drift.
+        self.position = 0
+        self._pose = self.poses[None]
+        self._offset = np.zeros(2)
+
+    def _next_segment(self, start: float) -> Segment:
+        rng = self.rng
+        idle, away, back = self.shares
+        duration = float(rng.uniform(*self.dwell))
+        roll = rng.random()
+        if roll < away:
+            return Segment(None, start, duration, present=False)
+        if roll < away + idle:
+            return Segment(None, start, duration)
+        gesture = self.gestures[int(rng.integers(len(self.gestures)))]
+        return Segment(gesture, start, duration, back=roll < away + idle + back)
+
+    def _render(self, segment: Segment, first: int, count: int) -> np.ndarray:
+        rng = self.rng
+        frames = np.zeros(count, dtype=FRAME_DTYPE)
+        frames["t"] = self.start + np.arange(first, first + count) / self.fps
+        if not segment.present:
+            return frames
+        target = self.poses[segment.gesture]
+        blend = np.ones(count)
+        steps = int(self.transition_seconds * self.fps)
+        if steps > 0:
+            blend = np.minimum(1.0, (np.arange(count) + 1) / steps)
+        points = self._pose + blend[:, None, None] * (target - self._pose)
+        if segment.back:
+            points = back_of_hand(points)
+        wrist = points[:, :1, :]
+        points = wrist + (points - wrist) * rng.uniform(0.9, 1.1)
+        destination = rng.uniform(-self.wander, self.wander, 2)
+        path = np.linspace(0.0, 1.0, count)[:, None]
+        points[..., :2] += (self._offset + path * (destination - self._offset))[:, None, :]
+        points += rng.normal(0.0, self.jitter, points.shape)
+        frames["landmarks"] = points
+        frames["present"] = rng.random(count) >= self.dropout_rate
+        frames["handedness"] = np.where(
+            rng.random(count) < self.flip_rate, self.flipped, self.handedness
+        )
+        self._pose = target
+        self._offset = destination
+        return frames
+
+    def blocks(self, duration: float) -> Iterator[tuple[np.ndarray, Segment]]:
+        """``(frames, segment)`` blocks covering the next ``duration`` seconds."""
+        end = self.position + int(round(duration * self.fps))
+        while self.position < end:
+            start = self.start + self.position / self.fps
+            segment = self._next_segment(start)
+            count = min(max(1, int(round(segment.duration * self.fps))), end - self.position)
+            segment.duration = count / self.fps
+            frames = self._render(segment, self.position, count)
+            for first in range(0, count, self.max_block):
+                yield frames[first:first + self.max_block], segment
+            self.position += count
+
+
+class ExpectedTotals:
+    """Per-activity time a stream's segments ask for, as if every gesture switched at once.
+
+    Segments are added as they are generated, so nothing accumulates over a
+    long run. The gates add the same smoothing and hold delay to the start and
+    the end of each activity, so tracked totals should match to within a frame
+    or two per switch, plus the odd hold restarted by a dropout or a flipped
+    handedness label.
+    """
+
+    def __init__(self, rules: RuleSet = DEFAULT_RULESET) -> None:
+        self.rules = rules
+        self.totals = {activity: 0.0 for activity in rules.activities}
+        self.active_activity: Optional[str] = None
+        self.active_started_at = 0.0
+
+    def add(self, segment: Segment) -> None:
+        gesture = segment.shown
+        if gesture is None:
+            return
+        stop = gesture in self.rules.stop_gestures
+        target = None if stop else self.rules.activity_by_gesture.get(gesture)
+        if (not stop and target is None) or target == self.active_activity:
+            return
+        if self.active_activity is not None:
+            self.totals[self.active_activity] += segment.start - self.active_started_at
+        self.active_activity = target
+        self.active_started_at = segment.start
+
+    def snapshot(self, now: float) -> dict[str, float]:
+        values = dict(self.totals)
+        if self.active_activity is not None:
+            values[self.active_activity] += now - self.active_started_at
+        return values
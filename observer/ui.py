@@ -1,18 +1,36 @@
+import math
+from typing import Optional
+
 import cv2
+import numpy as np
 
 from observer.activity import format_seconds
+from observer.constants import ACTIVITY_LABELS
 
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
 
-def draw_hud(frame, current_gesture, palm_ok: bool, tracker, now: float) -> None:
+
+def hud_lines(current_gesture, palm_ok: bool, tracker, now: float) -> list[str]:
     totals = tracker.snapshot(now)
     lines = [
         f"Gesture: {current_gesture or '-'}",
         f"Palm OK: {'YES' if palm_ok else 'NO'}",
         f"Activity: {tracker.active_activity or 'IDLE'}",
-        f"Studying: {format_seconds(totals['studying'])}",
-        f"YouTube : {format_seconds(totals['youtube'])}",
-        f"LoL     : {format_seconds(totals['lol'])}",
     ]
+    for activity, seconds in totals.items():
+        label = ACTIVITY_LABELS.get(activity, activity)
+        lines.append(f"{label:<8}: {format_seconds(seconds)}")
+    return lines
+
+
+def draw_hud(frame, current_gesture, palm_ok: bool, tracker, now: float) -> None:
+    lines = hud_lines(current_gesture, palm_ok, tracker, now)
     y = 35
     for line in lines:
         cv2.putText(
@@ -28,6 +46,36 @@ def draw_hud(frame, current_gesture, palm_ok: bool, tracker, now: float) -> None
         y += 30
 
 
+def draw_landmark_points(frame, landmarks) -> None:
+    """Hand skeleton (MediaPipe's 21-point topology) and landmark dots."""
+    height, width = frame.shape[:2]
+    points = [(int(lm.x * width), int(lm.y * height)) for lm in landmarks]
+    if len(points) == 21:
+        for a, b in HAND_CONNECTIONS:
+            cv2.line(frame, points[a], points[b], (255, 255, 255), 1, cv2.LINE_AA)
+    for point in points:
+        cv2.circle(frame, point, 3, (255, 255, 0), -1)
+
+
+def draw_hand_labels(frame, hands: list[tuple]) -> None:
+    """Landmarks plus ``#id activity`` at the wrist for each visible hand."""
+    for hand_id, landmarks, _, activity in hands:
+        draw_landmark_points(frame, landmarks)
+        wrist = landmarks[0]
+        x = int(wrist.x * frame.shape[1])
+        y = min(frame.shape[0] - 10, int(wrist.y * frame.shape[0]) + 25)
+        cv2.putText(
+            frame,
+            f"#{hand_id} {activity or 'IDLE'}",
+            (x, y),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.6,
+            (255, 255, 0),
+            2,
+            cv2.LINE_AA,
+        )
+
+
 def draw_gesture_debug(frame, lines: list[str]) -> None:
     y = 220
     for line in lines:
@@ -42,3 +90,178 @@ def draw_gesture_debug(frame, lines: list[str]) -> None:
             cv2.LINE_AA,
         )
         y += 20
+
+
+class TextOverlay:
+    """A block of text lines cached as a premultiplied tile.
+
+    ``draw`` re-rasterizes only the lines whose text changed, then blends the
+    whole tile onto the frame with two in-place OpenCV ops, so a mostly static
+    block costs about the same however many lines it has. When most lines
+    changed since the previous frame (live coordinates in the debug block) the
+    tile would be rebuilt anyway, so those frames are drawn straight onto the
+    frame with ``putText``. ``x``/``y`` are the first line's baseline origin, as
+    for ``cv2.putText``, and may be moved between frames without redrawing.
+    """
+
+    # Room for anti-aliasing that spills left of the origin.
+    _PAD = 2
+    # Tile band -> (premultiplied B, G, R, alpha x3).
+    _SPLIT = [0, 0, 1, 1, 2, 2, 3, 3, 3, 4, 3, 5]
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        line_height: int,
+        scale: float,
+        color: tuple[int, int, int],
+        thickness: int,
+        font: int = cv2.FONT_HERSHEY_SIMPLEX,
+    ) -> None:
+        self.x = x
+        self.y = y
+        self.line_height = line_height
+        self.scale = scale
+        self.color = color
+        self.thickness = thickness
+        self.font = font
+        (_, _), baseline = cv2.getTextSize("Ag", font, scale, thickness)
+        self.descent = min(line_height - 1, baseline + thickness)
+        self.lines: list[str] = []
+        self.rasterized = 0
+        self._previous: list[str] = []
+        self._band = np.zeros((line_height, 0, 4), dtype=np.uint8)
+        self._premultiplied = np.zeros((0, 0, 3), dtype=np.uint8)
+        self._inverse = np.zeros((0, 0, 3), dtype=np.uint8)
+
+    def _resize(self, rows: int, width: int) -> None:
+        height = rows * self.line_height
+        self._band = np.zeros((self.line_height, width, 4), dtype=np.uint8)
+        self._premultiplied = np.zeros((height, width, 3), dtype=np.uint8)
+        self._inverse = np.full((height, width, 3), 255, dtype=np.uint8)
+        self.lines = [""] * rows
+
+    def _rasterize(self, index: int, text: str) -> None:
+        band = self._band
+        band.fill(0)
+        if text:
+            cv2.putText(
+                band,
+                text,
+                (self._PAD, self.line_height - self.descent),
+                self.font,
+                self.scale,
+                (*self.color, 255),
+                self.thickness,
+                cv2.LINE_AA,
+            )
+        # putText blends onto transparent black, which leaves colour premultiplied by alpha.
+        rows = slice(index * self.line_height, (index + 1) * self.line_height)
+        inverse = self._inverse[rows]
+        cv2.mixChannels([band], [self._premultiplied[rows], inverse], self._SPLIT)
+        cv2.bitwise_not(inverse, dst=inverse)
+        self.lines[index] = text
+        self.rasterized += 1
+
+    def _update(self, lines: list[str]) -> None:
+        width = self._band.shape[1]
+        needed = max(
+            (cv2.getTextSize(text, self.font, self.scale, self.thickness)[0][0] for text in lines),
+            default=0,
+        ) + 2 * self._PAD + self.thickness
+        if needed > width or len(lines) > len(self.lines):
+            # Grow in steps so a ticking timer does not reallocate every second.
+            self._resize(max(len(lines), len(self.lines)), max(width, 64 * math.ceil(needed / 64)))
+        for index, text in enumerate(lines):
+            if self.lines[index] != text:
+                self._rasterize(index, text)
+        for index in range(len(lines), len(self.lines)):
+            if self.lines[index]:
+                self._rasterize(index, "")
+
+    def _put_lines(self, frame, lines: list[str]) -> None:
+        y = self.y
+        for line in lines:
+            cv2.putText(
+                frame,
+                line,
+                (self.x, y),
+                self.font,
+                self.scale,
+                self.color,
+                self.thickness,
+                cv2.LINE_AA,
+            )
+            y += self.line_height
+
+    def draw(self, frame, lines: list[str]) -> None:
+        previous, self._previous = self._previous, lines
+        changed = sum(a != b for a, b in zip(lines, previous)) + abs(len(lines) - len(previous))
+        if 2 * changed > len(lines):
+            self._put_lines(frame, lines)
+            return
+        if lines != self.lines[: len(lines)] or any(self.lines[len(lines):]):
+            self._update(lines)
+        height = len(lines) * self.line_height
+        top = self.y - self.line_height + self.descent
+        left = self.x - self._PAD
+        y0, x0 = max(0, top), max(0, left)
+        y1 = min(frame.shape[0], top + height)
+        x1 = min(frame.shape[1], left + self._band.shape[1])
+        if y1 <= y0 or x1 <= x0:
+            return
+        tile_rows = slice(y0 - top, y1 - top)
+        tile_cols = slice(x0 - left, x1 - left)
+        roi = frame[y0:y1, x0:x1]
+        cv2.multiply(roi, self._inverse[tile_rows, tile_cols], dst=roi, scale=1.0 / 255.0)
+        cv2.add(roi, self._premultiplied[tile_rows, tile_cols], dst=roi)
+
+
+class HudRenderer:
+    """Cached replacement for ``draw_hud`` and the other per-frame text blocks.
+
+    HUD text is rebuilt only when the gesture, palm state or activity changes, or
+    when the running activity's timer reaches its next whole second.
+    """
+
+    def __init__(self) -> None:
+        self.hud = TextOverlay(10, 35, 30, 0.8, (0, 255, 0), 2)
+        self.debug = TextOverlay(10, 220, 20, 0.5, (255, 220, 120), 1)
+        self.status = TextOverlay(10, 0, 20, 0.5, (120, 200, 255), 1)
+        self.metrics = TextOverlay(0, 25, 18, 1.0, (200, 200, 200), 1, cv2.FONT_HERSHEY_PLAIN)
+        self._hud_key: Optional[tuple] = None
+        self._hud_lines: list[str] = []
+        self._hud_valid_until = 0.0
+
+    def draw_hud(self, frame, current_gesture, palm_ok: bool, tracker, now: float) -> None:
+        activities = tracker.active_activities
+        key = (current_gesture, palm_ok, activities)
+        if key != self._hud_key or now >= self._hud_valid_until:
+            self._hud_lines = hud_lines(current_gesture, palm_ok, tracker, now)
+            self._hud_key = key
+            self._hud_valid_until = math.inf
+            running = {activity for activity in activities if activity is not None}
+            if running:
+                # Only running timers move, and their text changes on whole seconds.
+                totals = tracker.snapshot(now)
+                for activity in running:
+                    seconds = totals.get(activity)
+                    if seconds is None:
+                        self._hud_valid_until = now
+                        break
+                    self._hud_valid_until = min(
+                        self._hud_valid_until, now + (math.floor(seconds) + 1 - seconds)
+                    )
+        self.hud.draw(frame, self._hud_lines)
+
+    def draw_gesture_debug(self, frame, lines: list[str]) -> None:
+        self.debug.draw(frame, lines)
+
+    def draw_pipeline_stats(self, frame, lines: list[str]) -> None:
+        self.status.y = frame.shape[0] - 15 - 20 * (len(lines) - 1)
+        self.status.draw(frame, lines)
+
+    def draw_metrics(self, frame, lines: list[str]) -> None:
+        self.metrics.x = max(10, frame.shape[1] - 300)
+        self.metrics.draw(frame, lines)
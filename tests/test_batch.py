@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from observer import batch
+from observer.batch import VideoChunk, collect_videos, gate_frames, plan_chunks, summarize
+from observer.replay import replay_frames
+from observer.recording import FRAME_DTYPE
+from test_recording import ILY, ONE
+
+
+class _FrameIndexDetector:
+    """Reports the ILY pose for bright frames and no hand for dark ones."""
+
+    def detect(self, rgb, timestamp_ms):
+        if rgb.mean() > 127:
+            return ILY, "Left"
+        return None, None
+
+
+def _write_video(path: str, brightness: list[int], fps: float = 30.0) -> None:
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (64, 48))
+    for value in brightness:
+        writer.write(np.full((48, 64, 3), value, dtype=np.uint8))
+    writer.release()
+
+
+class ChunkPlanningTests(unittest.TestCase):
+    def test_splits_long_videos(self):
+        chunks = plan_chunks("a.mp4", frame_count=250, fps=25.0, chunk_seconds=4.0)
+        self.assertEqual([(c.start_frame, c.end_frame) for c in chunks], [(0, 100), (100, 200), (200, 250)])
+
+    def test_unknown_length_reads_to_end(self):
+        (chunk,) = plan_chunks("a.mp4", frame_count=0, fps=30.0, chunk_seconds=60.0)
+        self.assertEqual((chunk.start_frame, chunk.end_frame), (0, -1))
+
+    def test_collects_videos_from_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "day1"))
+            for name in ("day1/b.MP4", "a.mov", "notes.txt"):
+                open(os.path.join(tmp, name), "w").close()
+            found = [os.path.relpath(p, tmp) for p in collect_videos([tmp])]
+        self.assertEqual(found, ["a.mov", os.path.join("day1", "b.MP4")])
+
+
+class ChunkProcessingTests(unittest.TestCase):
+    def setUp(self):
+        self._detector = batch._detector
+        batch._detector = _FrameIndexDetector()
+
+    def tearDown(self):
+        batch._detector = self._detector
+
+    def test_chunks_concatenate_to_the_full_stream(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "clip.avi")
+            brightness = [0] * 30 + [255] * 90
+            _write_video(path, brightness)
+            whole = batch._process_chunk(VideoChunk(path, 0, 0, -1, 30.0))[2]
+            parts = [batch._process_chunk(c)[2] for c in plan_chunks(path, 120, 30.0, 1.0)]
+        joined = np.concatenate(parts)
+        self.assertEqual(len(whole), 120)
+        np.testing.assert_array_equal(joined["t"], whole["t"])
+        self.assertEqual(joined["present"].tolist(), [0] * 30 + [1] * 90)
+
+
+def _selfie_frames() -> np.ndarray:
+    frames = np.zeros(600, dtype=FRAME_DTYPE)
+    frames["t"] = np.arange(600) / 30.0
+    frames["present"] = 1
+    frames["handedness"] = 1
+    frames["landmarks"][:300] = [(lm.x, lm.y, lm.z) for lm in ILY]
+    frames["landmarks"][300:] = [(lm.x, lm.y, lm.z) for lm in ONE]
+    frames["present"][100:103] = 0
+    return frames
+
+
+class SummaryTests(unittest.TestCase):
+    def test_engine_gating_matches_replay(self):
+        selfie = _selfie_frames()
+        # What the landmarker reports: the unmirrored image and the other hand's label.
+        camera = selfie.copy()
+        camera["landmarks"][..., 0] = 1.0 - selfie["landmarks"][..., 0]
+        camera["handedness"] = 2
+        expected = replay_frames(selfie)
+        for result in (gate_frames(camera), gate_frames(selfie, selfie_view=True)):
+            self.assertEqual(result.switches, expected.switches)
+            self.assertEqual(result.totals, expected.totals)
+            self.assertEqual(result.sessions(), expected.sessions())
+
+    def test_summary_timeline_and_totals(self):
+        frames = _selfie_frames()
+        frames["present"] = 1
+        summary = summarize("clip.mp4", replay_frames(frames), 30.0)
+        json.dumps(summary)
+        self.assertEqual([s["activity"] for s in summary["timeline"]], ["studying", "youtube"])
+        self.assertEqual(summary["timeline"][0]["end"], summary["timeline"][1]["start"])
+        self.assertAlmostEqual(summary["timeline"][1]["end"], 599 / 30.0)
+        self.assertAlmostEqual(
+            sum(summary["totals"].values()),
+            summary["duration_seconds"] - summary["timeline"][0]["start"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
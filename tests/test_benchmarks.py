@@ -0,0 +1,34 @@
+import json
+import unittest
+
+from benchmarks.fixtures import synthetic_frames
+from benchmarks.hot_path import build_cases, compare, run_suite
+from observer.gestures import detect_gesture
+
+
+class BenchmarkSuiteTests(unittest.TestCase):
+    def test_fixtures_cover_every_gesture(self):
+        gestures = {detect_gesture(frame) for frame in synthetic_frames(48)}
+        self.assertEqual(len(gestures), 5)
+
+    def test_every_case_runs(self):
+        for case in build_cases(synthetic_frames(8), frame_shape=(120, 160, 3)):
+            for i in range(3):
+                case.body(i)
+
+    def test_report_is_json_and_comparable(self):
+        report = run_suite(synthetic_frames(8), min_time=0.001, repeats=1, only=["detect_gesture"])
+        json.dumps(report)
+        result = report["results"]["detect_gesture"]
+        self.assertGreater(result["ns_per_op"], 0)
+        self.assertIn("peak_alloc_bytes", result)
+
+        baseline = {"results": {"detect_gesture": dict(result, ns_per_op=result["ns_per_op"] / 2)}}
+        ((name, _, _, ratio, regressed),) = compare(report, baseline, threshold=0.10)
+        self.assertEqual(name, "detect_gesture")
+        self.assertAlmostEqual(ratio, 2.0)
+        self.assertTrue(regressed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from observer.capture import Capture, CaptureSettings, SyntheticCamera
+from observer.frames import FramePool
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _camera(clock: _Clock, **kwargs) -> SyntheticCamera:
+    return SyntheticCamera(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _frame_ages(drain: bool, busy_seconds: float, reads: int = 200) -> list[float]:
+    clock = _Clock()
+    camera = _camera(clock, fps=30.0, buffer_size=4)
+    capture = Capture(camera, CaptureSettings(buffer_size=None, drain=drain), clock=clock)
+    ages = []
+    for _ in range(reads):
+        ok, _ = capture.read()
+        ages.append(clock.now - camera.last_index / 30.0)
+        clock.now += busy_seconds
+    return ages[20:]
+
+
+class CaptureTests(unittest.TestCase):
+    def test_requested_mode_is_negotiated_and_reported(self):
+        clock = _Clock()
+        settings = CaptureSettings(640, 480, 15.0, "MJPG", buffer_size=1)
+        capture = Capture(_camera(clock), settings, clock=clock)
+        self.assertEqual(
+            capture.actual,
+            {"fourcc": "MJPG", "width": 640, "height": 480, "fps": 15.0, "buffer_size": 1},
+        )
+        self.assertTrue(capture.describe().startswith("CAMERA mode=640x480@15.0 fourcc=MJPG"))
+        ok, frame = capture.read()
+        self.assertTrue(ok)
+        self.assertEqual(frame.shape, (480, 640, 3))
+        with self.assertRaises(ValueError):
+            CaptureSettings(fourcc="MJ")
+
+    def test_slow_reader_gets_the_newest_frame(self):
+        for busy_seconds in (0.05, 0.1):
+            queued = _frame_ages(drain=False, busy_seconds=busy_seconds)
+            newest = _frame_ages(drain=True, busy_seconds=busy_seconds)
+            # Without draining the four-frame driver queue stays full of old frames.
+            self.assertGreater(min(queued), 0.15)
+            self.assertLessEqual(max(newest), 1.0 / 30.0 + 1e-9)
+
+    def test_duplicates_are_not_counted_as_delivered_frames(self):
+        clock = _Clock()
+        capture = Capture(_camera(clock, repeat_every=3), clock=clock)
+        for _ in range(90):
+            capture.read()
+        stats = capture.stats
+        self.assertEqual(stats.frames, 90)
+        self.assertEqual(stats.duplicates, 30)
+        self.assertAlmostEqual(stats.meter.fps, 20.0, delta=1.0)
+        self.assertIn("duplicates=30", stats.summary())
+
+    def test_file_backed_capture_reads_every_frame_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "clip.avi")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (64, 48))
+            for i in range(20):
+                writer.write(np.full((48, 64, 3), i * 12, dtype=np.uint8))
+            writer.release()
+            capture = Capture(cv2.VideoCapture(path), CaptureSettings(drain=False))
+            pool = FramePool()
+            levels = []
+            while True:
+                ok, frame = pool.read(capture)
+                if not ok:
+                    break
+                levels.append(int(frame.mean()))
+                pool.release(frame)
+            capture.release()
+        self.assertEqual(len(levels), 20)
+        self.assertEqual(levels, sorted(levels))
+        self.assertEqual(capture.stats.duplicates, 0)
+        self.assertLessEqual(pool.allocated, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
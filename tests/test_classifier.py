@@ -0,0 +1,77 @@
+import itertools
+import unittest
+
+import numpy as np
+
+from observer.gestures import (
+    _atomic_flags,
+    atomic_flags_array,
+    classify_landmarks,
+    detect_gesture,
+    detect_gesture_batch,
+    gesture_checklines,
+    landmarks_to_array,
+)
+from test_logic import _LM, _make_landmarks, _set_finger, _set_thumb
+
+
+def _pose_fixtures() -> list[np.ndarray]:
+    poses = []
+    fingers = ("index", "middle", "ring", "pinky")
+    for ups in itertools.product((True, False), repeat=4):
+        for thumb in ("near", "away", "side"):
+            points = _make_landmarks()
+            for finger, up in zip(fingers, ups):
+                _set_finger(points, finger, up)
+            _set_thumb(points, thumb)
+            poses.append(landmarks_to_array(points))
+    return poses
+
+
+def _to_objects(points: np.ndarray) -> list[_LM]:
+    return [_LM(float(x), float(y), float(z)) for x, y, z in points]
+
+
+def _frames(seed: int = 7, jittered: int = 40, random: int = 500) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    poses = np.stack(_pose_fixtures())
+    noisy = [poses + rng.normal(0.0, 0.03, poses.shape) for _ in range(jittered)]
+    uniform = rng.uniform(0.0, 1.0, (random, 21, 3))
+    return np.concatenate([poses, *noisy, uniform]).astype(np.float32)
+
+
+class VectorizedClassifierTests(unittest.TestCase):
+    def test_fixture_poses_cover_every_gesture(self):
+        gestures = {detect_gesture(_to_objects(p)) for p in _pose_fixtures()}
+        self.assertEqual(
+            gestures, {None, "OPEN_PALM", "ILY_SIGN", "ONE_FINGER", "TWO_FINGERS"}
+        )
+
+    def test_single_frame_matches_scalar_rules(self):
+        for points in _frames():
+            objects = _to_objects(points)
+            gesture, lines = classify_landmarks(points)
+            self.assertEqual(gesture, detect_gesture(objects))
+            self.assertEqual(lines, gesture_checklines(objects))
+            self.assertEqual(classify_landmarks(objects), (gesture, lines))
+
+    def test_batch_matches_scalar_rules(self):
+        frames = _frames(seed=11)
+        expected = [detect_gesture(_to_objects(p)) for p in frames]
+        self.assertEqual(detect_gesture_batch(frames), expected)
+
+    def test_batch_flags_match_scalar_flags(self):
+        frames = _frames(seed=3, jittered=5, random=50)
+        flags = atomic_flags_array(frames)
+        for i, points in enumerate(frames):
+            scalar = _atomic_flags(_to_objects(points))
+            self.assertEqual({k: bool(v[i]) for k, v in flags.items()}, scalar)
+
+    def test_batch_accepts_extra_leading_axes(self):
+        frames = _frames(jittered=1, random=0).reshape(2, -1, 21, 3)
+        flags = atomic_flags_array(frames)
+        self.assertEqual(flags["index_up"].shape, frames.shape[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from observer.constants import GESTURE_ILY, GESTURE_OPEN_PALM
+from observer.engine import FrameEngine, RuntimeConfig
+from observer.frames import mirror_handedness, mirror_landmarks
+from observer.gestures import landmarks_to_array
+from observer.hands import HandObservation, HandRegistry
+from observer.metrics import StartupReport
+from observer.recording import LandmarkRecorder, open_recording
+from observer.replay import replay_recording
+from observer.roi import RoiTracker
+from observer.sources import LandmarkSource, RecordingSource, SyntheticSource
+from test_hands import _hand
+
+_ILY = landmarks_to_array(_hand(GESTURE_ILY).landmarks)
+_OPEN = landmarks_to_array(_hand(GESTURE_OPEN_PALM).landmarks)
+
+
+class _CameraSource(LandmarkSource):
+    """Returns a fixed hand in camera orientation, as a landmarker would."""
+
+    def __init__(self, observation: HandObservation, asynchronous: bool = False) -> None:
+        self.observation = observation
+        self.asynchronous = asynchronous
+        self.calls = 0
+
+    def open(self, on_result=None) -> None:
+        self.on_result = on_result
+
+    def _hands(self) -> list[HandObservation]:
+        self.calls += 1
+        hand = self.observation
+        return [
+            HandObservation(
+                mirror_landmarks(hand.landmarks), mirror_handedness(hand.handedness), 0.9
+            )
+        ]
+
+    def detect(self, rgb, timestamp_ms: int) -> list[HandObservation]:
+        return self._hands()
+
+    def detect_async(self, rgb, timestamp_ms: int) -> None:
+        self.on_result(self._hands(), timestamp_ms)
+
+
+class _BufferCamera:
+    """Reads ``count`` frames into the buffer it is given, like ``cv2.VideoCapture``."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def read(self, image=None):
+        if self.count == 0:
+            return False, None
+        self.count -= 1
+        if image is None:
+            image = np.empty((48, 64, 3), dtype=np.uint8)
+        image[:] = self.count % 256
+        return True, image
+
+
+class _SlowSource(SyntheticSource):
+    """A synthetic stream whose backend takes a while to load."""
+
+    def __init__(self, *args, error: Exception = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.error = error
+        self.opened_on = None
+
+    def open(self, on_result=None) -> None:
+        time.sleep(0.05)
+        self.opened_on = threading.current_thread().name
+        if self.error is not None:
+            raise self.error
+
+
+def _run(engine: FrameEngine, cap=None) -> str:
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        engine.run(cap)
+    return out.getvalue()
+
+
+class FrameEngineTests(unittest.TestCase):
+    def test_synthetic_stream_switches_activities(self):
+        source = SyntheticSource([_ILY, None, _OPEN], count=270, hold_frames=90)
+        engine = FrameEngine(source, RuntimeConfig(hold_seconds=1.0))
+        printed = _run(engine)
+        self.assertEqual(printed.splitlines(), ["ACTIVE: studying", "STOPPED"])
+        self.assertEqual(engine.frames_processed, 270)
+        # Both switches land 1.0 s after the smoother settles (five frames in), so
+        # studying runs from the first ILY frame's settle to the open palm's.
+        self.assertAlmostEqual(engine.tracker.snapshot(9.0)["studying"], 6.0, places=6)
+
+    def test_recording_source_matches_batch_replay(self):
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.obsrec")
+            with LandmarkRecorder(path) as recorder:
+                for i in range(300):
+                    pose = _ILY if i < 150 else _OPEN
+                    hand = None if 100 <= i < 104 else pose + rng.normal(0.0, 0.002, pose.shape)
+                    recorder.write(100.0 + i / 30.0, hand, "Left")
+            recording = open_recording(path)
+            expected = replay_recording(recording)
+            engine = FrameEngine(RecordingSource(recording))
+            _run(engine)
+        self.assertEqual(
+            engine.tracker.snapshot(expected.end_time), expected.totals
+        )
+        self.assertGreater(expected.totals["studying"], 0.0)
+
+    def test_camera_sources_are_mirrored_before_the_gates(self):
+        ily = _hand(GESTURE_ILY, handedness="Left")
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for asynchronous in (False, True):
+            source = _CameraSource(ily, asynchronous)
+            engine = FrameEngine(source, RuntimeConfig())
+            source.open(engine.on_result)
+            process = engine.process_async if asynchronous else engine.process
+            states = [process(frame, engine.start + i / 30.0) for i in range(6)]
+            self.assertEqual(source.calls, 6)
+            self.assertEqual(engine.frames_processed, 6)
+            self.assertEqual(states[-1].stable_gesture, GESTURE_ILY)
+            self.assertTrue(states[-1].palm_ok)
+            # Drawn landmarks stay in camera orientation.
+            self.assertAlmostEqual(states[-1].hand[0].x, 1.0 - ily.landmarks[0].x)
+            self.assertEqual(engine.controls.frames.copied, 0)
+
+    def test_backend_input_copies_are_counted(self):
+        source = _CameraSource(_hand(GESTURE_ILY, handedness="Left"))
+        source.copies_input = True
+        engine = FrameEngine(source, RuntimeConfig())
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        for i in range(4):
+            engine.process(frame, engine.start + i / 30.0)
+        frames = engine.controls.frames
+        self.assertEqual((frames.copied, frames.copied_bytes), (4, 4 * frame.nbytes))
+        self.assertIn("copied=4 ", frames.summary())
+
+    def test_frame_buffers_go_back_to_the_pool(self):
+        for threaded in (False, True):
+            source = _CameraSource(_hand(GESTURE_ILY, handedness="Left"))
+            config = RuntimeConfig(headless=True, console=False, threaded=threaded)
+            engine = FrameEngine(source, config)
+            engine.run(_BufferCamera(200))
+            frames = engine.controls.frames
+            # Capture, model input and a frame or two still queued between threads.
+            self.assertLessEqual(frames.allocated, 6)
+            self.assertLessEqual(frames.in_use, 2 if threaded else 0)
+
+    def test_multi_hand_mode_runs_on_frameless_sources(self):
+        hands = HandRegistry(max_hands=2)
+        source = SyntheticSource([_ILY], count=60, hold_frames=60)
+        engine = FrameEngine(source, RuntimeConfig(hands=hands, hold_seconds=1.0))
+        printed = _run(engine)
+        self.assertIn("HAND 1 ACTIVE: studying", printed)
+
+    def test_silent_engine_prints_nothing_for_hands(self):
+        source = SyntheticSource([_ILY, None], count=240, hold_frames=60)
+        hands = HandRegistry(max_hands=2, forget_after=1.0)
+        config = RuntimeConfig(hands=hands, hold_seconds=1.0, console=False)
+        self.assertEqual(_run(FrameEngine(source, config)), "")
+        source = SyntheticSource([_ILY, None], count=240, hold_frames=60)
+        hands = HandRegistry(max_hands=2, forget_after=1.0)
+        printed = _run(FrameEngine(source, RuntimeConfig(hands=hands, hold_seconds=1.0)))
+        self.assertIn("HAND 1 GONE", printed)
+
+    def test_roi_needs_camera_frames(self):
+        with self.assertRaises(ValueError):
+            FrameEngine(SyntheticSource([_ILY]), RuntimeConfig(roi=RoiTracker()))
+
+
+class StartupTests(unittest.TestCase):
+    def test_background_load_overlaps_camera_start(self):
+        source = _SlowSource([_ILY], count=60, hold_frames=60)
+        startup = StartupReport()
+        engine = FrameEngine(source, RuntimeConfig(hold_seconds=1.0, startup=startup))
+        engine.load(background=True)
+        time.sleep(0.05)  # the camera opening meanwhile
+        startup.mark("camera")
+        printed = _run(engine).splitlines()
+        self.assertEqual(source.opened_on, "observer-backend")
+        self.assertTrue(printed[0].startswith("STARTUP camera_ms="))
+        self.assertIn("first_frame_ms=", printed[0])
+        self.assertEqual(printed[1:], ["ACTIVE: studying"])
+        self.assertLess(startup.values["backend_wait"], startup.values["backend_load"])
+
+    def test_load_errors_surface_in_run(self):
+        source = _SlowSource([_ILY], count=1, error=RuntimeError("missing model"))
+        engine = FrameEngine(source)
+        engine.load(background=True)
+        with self.assertRaisesRegex(RuntimeError, "missing model"):
+            _run(engine)
+
+    def test_app_imports_without_opencv_or_mediapipe(self):
+        code = "import sys, app; print(sorted({'cv2', 'mediapipe'} & set(sys.modules)))"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
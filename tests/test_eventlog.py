@@ -0,0 +1,173 @@
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from observer.activity import ActivityTracker
+from observer.constants import ACTIVITY_BY_GESTURE, GESTURE_ILY
+from observer.eventlog import EventLog, read_events, rebuild_totals
+from observer.history import HistoryStore
+
+
+def _write_lines(path, events, tail=""):
+    with open(path, "w") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+        f.write(tail)
+
+
+class RebuildTotalsTests(unittest.TestCase):
+    def test_closed_sessions_sum_per_activity(self):
+        state = rebuild_totals(
+            [
+                {"type": "switch", "ts": 100.0, "from": None, "to": "studying"},
+                {"type": "switch", "ts": 160.0, "from": "studying", "to": "reading"},
+                {"type": "switch", "ts": 190.0, "from": "reading", "to": None},
+                {"type": "switch", "ts": 200.0, "from": None, "to": "studying"},
+                {"type": "switch", "ts": 210.0, "from": "studying", "to": None},
+            ]
+        )
+        self.assertEqual(state.totals, {"studying": 70.0, "reading": 30.0})
+        self.assertIsNone(state.dangling)
+
+    def test_open_session_is_closed_at_last_heartbeat(self):
+        state = rebuild_totals(
+            [
+                {"type": "switch", "ts": 100.0, "from": None, "to": "studying"},
+                {"type": "heartbeat", "ts": 130.0, "active": "studying"},
+                {"type": "heartbeat", "ts": 160.0, "active": "studying"},
+            ]
+        )
+        self.assertEqual(state.totals, {"studying": 60.0})
+        self.assertEqual(state.dangling, "studying")
+        self.assertEqual(state.dangling_until, 160.0)
+
+
+class EventLogTests(unittest.TestCase):
+    def test_switches_round_trip_and_restore_tracker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            log = EventLog(path, fsync_interval=0.0)
+            log.record_switch(None, "studying", ts=10.0)
+            log.record_switch("studying", None, ts=25.0)
+            log.close()
+            self.assertIsNone(log.error)
+            self.assertEqual(len(list(read_events(path))), 2)
+
+            reopened = EventLog(path)
+            reopened.close()
+            tracker = ActivityTracker(initial_totals=reopened.recovered.totals)
+            self.assertEqual(tracker.totals["studying"], 15.0)
+            self.assertEqual(tracker.snapshot(0.0)["studying"], 15.0)
+
+    def test_crash_recovery_skips_torn_line_and_closes_session(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            _write_lines(
+                path,
+                [
+                    {"type": "switch", "ts": 50.0, "from": None, "to": "reading"},
+                    {"type": "heartbeat", "ts": 80.0, "active": "reading"},
+                ],
+                tail='{"type": "switch", "ts": 9',
+            )
+            log = EventLog(path)
+            log.close()
+            self.assertEqual(log.recovered.totals, {"reading": 30.0})
+            events = list(read_events(path))
+            self.assertEqual(events[-1]["to"], None)
+            self.assertTrue(events[-1]["recovered"])
+            # The recovery marker closes the session, so a second start adds nothing.
+            again = EventLog(path)
+            again.close()
+            self.assertEqual(again.recovered.totals, {"reading": 30.0})
+            self.assertIsNone(again.recovered.dangling)
+
+    def test_clean_close_ends_the_running_session(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            log = EventLog(path, heartbeat_interval=30.0)
+            started = time.time()
+            log.record_switch(None, "studying", ts=started - 2.0)
+            log.close()
+            events = list(read_events(path))
+            self.assertEqual((events[-1]["from"], events[-1]["to"]), ("studying", None))
+            self.assertNotIn("recovered", events[-1])
+
+            reopened = EventLog(path)
+            reopened.close()
+            self.assertIsNone(reopened.recovered.dangling)
+            self.assertGreaterEqual(reopened.recovered.totals["studying"], 2.0)
+            self.assertEqual(len(list(read_events(path))), 2)
+
+    def test_writer_failure_is_kept_and_later_switches_counted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = EventLog(os.path.join(tmp, "events.jsonl"), fsync_interval=0.0)
+            log._file.close()  # the next write fails on the writer thread
+            log.record_switch(None, "studying", ts=1.0)
+            log._thread.join(timeout=5.0)
+            self.assertIsInstance(log.error, ValueError)
+            log.record_switch("studying", None, ts=2.0)
+            log.close()
+            self.assertEqual(log.lost, 1)
+
+    def test_attached_tracker_switches_are_recorded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            log = EventLog(path, fsync_interval=0.0)
+            tracker = ActivityTracker()
+            log.attach(tracker)
+            tracker.apply_gesture(GESTURE_ILY, 1.0)
+            tracker.stop(4.0)
+            log.close()
+            events = list(read_events(path))
+            self.assertEqual(
+                [(e["from"], e["to"]) for e in events], [(None, "studying"), ("studying", None)]
+            )
+
+    def test_closed_sessions_reach_history_while_running(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            history = os.path.join(tmp, "history.sqlite")
+            log = EventLog(path, fsync_interval=0.0, history_path=history)
+            started = time.time() - 600.0
+            log.record_switch(None, "studying", ts=started)
+            log.record_switch("studying", "youtube", ts=started + 590.0)
+            deadline = time.monotonic() + 5.0
+            sessions = 0
+            while sessions == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+                if os.path.exists(history):
+                    # Read-only, so polling never holds the writer's lock.
+                    conn = sqlite3.connect(f"file:{history}?mode=ro", uri=True)
+                    try:
+                        sessions = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+                    except sqlite3.OperationalError:
+                        pass  # schema not created yet
+                    finally:
+                        conn.close()
+            self.assertEqual(sessions, 1)
+            log.close()
+            self.assertIsNone(log.history_error)
+            with HistoryStore(history) as store:
+                self.assertEqual(store.longest_session("studying"), (started, started + 590.0))
+                self.assertIsNotNone(store.longest_session("youtube"))
+                # The live log shares the report's cursor, so nothing is ingested twice.
+                self.assertEqual(store.ingest_event_log(path), 0)
+
+    def test_writer_emits_heartbeats_while_active(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            log = EventLog(path, fsync_interval=0.01, heartbeat_interval=0.02)
+            log.record_switch(None, ACTIVITY_BY_GESTURE[GESTURE_ILY])
+            time.sleep(0.15)
+            log.close()
+            types = [event["type"] for event in read_events(path)]
+            self.assertEqual(types[0], "switch")
+            self.assertIn("heartbeat", types)
+
+
+if __name__ == "__main__":
+    unittest.main()
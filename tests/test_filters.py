@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+from observer.filters import (
+    KalmanLandmarkFilter,
+    OneEuroFilter,
+    filter_landmarks,
+    filter_sequence,
+    make_landmark_filter,
+)
+from observer.gestures import detect_gesture, landmarks_to_array
+from observer.recording import FRAME_DTYPE
+from observer.replay import replay_frames
+from observer.roi import Point
+from test_recording import ILY, ONE
+
+_FPS = 30.0
+_ILY = landmarks_to_array(ILY).astype(np.float64)
+_ONE = landmarks_to_array(ONE).astype(np.float64)
+
+
+def _points(array: np.ndarray) -> list[Point]:
+    return [Point(x, y, z) for x, y, z in array.tolist()]
+
+
+def _boundary_pose() -> np.ndarray:
+    """A pose just on the ONE_FINGER side of the ILY/ONE_FINGER boundary."""
+    for w in np.linspace(0.0, 1.0, 101):
+        pose = _ILY * (1.0 - w) + _ONE * w
+        if detect_gesture(_points(pose)) != detect_gesture(ILY):
+            return _ILY * (1.0 - w - 0.01) + _ONE * (w + 0.01)
+    raise AssertionError("no boundary")
+
+
+class FilterResponseTests(unittest.TestCase):
+    def _run(self, landmark_filter, frames):
+        return np.array(
+            [landmark_filter.filter(points, i / _FPS) for i, points in enumerate(frames)]
+        )
+
+    def test_static_jitter_is_reduced(self):
+        rng = np.random.default_rng(0)
+        frames = [_ILY + rng.normal(0.0, 0.004, _ILY.shape) for _ in range(150)]
+        for landmark_filter in (OneEuroFilter(), KalmanLandmarkFilter()):
+            error = self._run(landmark_filter, frames)[30:] - _ILY
+            self.assertLess(error.std(), 0.004 * 0.8, type(landmark_filter).__name__)
+
+    def test_moving_hand_is_followed(self):
+        # 0.5 image widths per second, noiseless: the lag must stay small.
+        frames = [_ILY + np.array([0.5 * i / _FPS, 0.0, 0.0]) for i in range(60)]
+        for landmark_filter in (OneEuroFilter(), KalmanLandmarkFilter()):
+            lag = np.abs(self._run(landmark_filter, frames)[-1] - frames[-1]).max()
+            self.assertLess(lag, 0.01, type(landmark_filter).__name__)
+
+    def test_gap_and_lost_hand_restart_the_filter(self):
+        landmark_filter = OneEuroFilter(max_gap=0.5)
+        landmark_filter.filter(_ILY, 0.0)
+        np.testing.assert_array_equal(landmark_filter.filter(_ONE, 1.0), _ONE)
+        self.assertIsNone(filter_landmarks(landmark_filter, None, 1.1))
+        filtered = filter_landmarks(landmark_filter, ILY, 1.2)
+        np.testing.assert_allclose(landmarks_to_array(filtered), _ILY, atol=1e-6)
+
+    def test_boundary_flicker_drops(self):
+        rng = np.random.default_rng(1)
+        pose = _boundary_pose()
+        frames = [pose + rng.normal(0.0, 0.004, pose.shape) for _ in range(150)]
+
+        def changes(sequence):
+            gestures = [detect_gesture(_points(points)) for points in sequence]
+            return sum(a != b for a, b in zip(gestures, gestures[1:]))
+
+        raw = changes(frames)
+        filtered = changes(self._run(make_landmark_filter("one-euro"), frames))
+        self.assertGreater(raw, 20)
+        self.assertLess(filtered, raw / 4)
+
+
+class ReplayFilterTests(unittest.TestCase):
+    def test_replay_filters_frames_in_order(self):
+        rng = np.random.default_rng(2)
+        frames = np.zeros(90, dtype=FRAME_DTYPE)
+        frames["t"] = np.arange(90) / _FPS
+        frames["present"] = 1
+        frames["present"][40] = 0
+        frames["handedness"] = 1
+        frames["landmarks"] = _ILY + rng.normal(0.0, 0.004, (90, 21, 3))
+        times, present = frames["t"].tolist(), frames["present"].astype(bool).tolist()
+        expected = filter_sequence(OneEuroFilter(), times, present, frames["landmarks"])
+        stepwise = OneEuroFilter()
+        for i in (0, 1, 41, 42):
+            if i == 41:
+                stepwise.reset()
+            step = stepwise.filter(frames["landmarks"][i].astype(np.float64), times[i])
+            np.testing.assert_allclose(expected[i], step)
+        result = replay_frames(frames, landmark_filter=OneEuroFilter())
+        self.assertEqual(result.switches[0][1], "studying")
+        with self.assertRaises(ValueError):
+            make_landmark_filter("median")
+
+
+if __name__ == "__main__":
+    unittest.main()
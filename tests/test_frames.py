@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from observer.frames import FramePool, mirror_handedness, mirror_landmarks
+from observer.gestures import detect_gesture, palm_facing_camera
+from test_hands import _hand
+from test_logic import _LM
+
+
+class FramePoolTests(unittest.TestCase):
+    def test_buffers_are_reused_once_released(self):
+        pool = FramePool()
+        first = pool.take((48, 64, 3))
+        second = pool.take((48, 64, 3))
+        self.assertIsNot(first, second)
+        pool.release(first)
+        self.assertIs(pool.take((48, 64, 3)), first)
+        self.assertEqual((pool.allocated, pool.in_use), (2, 2))
+
+    def test_unreleased_buffers_and_their_views_stay_taken(self):
+        pool = FramePool()
+        buffer = pool.take((48, 64, 3))
+        crop = buffer[10:20, 10:20]
+        del buffer  # dropping the last reference does not give the buffer back
+        self.assertIsNot(pool.take((48, 64, 3)), crop.base)
+        self.assertEqual(pool.allocated, 2)
+
+    def test_foreign_arrays_and_double_releases_are_ignored(self):
+        pool = FramePool()
+        buffer = pool.take((4, 4, 3))
+        pool.release(np.empty((4, 4, 3), dtype=np.uint8))
+        pool.release(None)
+        pool.release(buffer)
+        pool.release(buffer)
+        self.assertEqual((pool.in_use, len(pool.free)), (0, 1))
+
+    def test_full_pool_replaces_idle_buffers_and_counts_overflow(self):
+        pool = FramePool(max_buffers=2)
+        held = [pool.take((4, 4, 3)), pool.take((4, 4, 3))]
+        extra = pool.take((4, 4, 3))
+        self.assertEqual((pool.unpooled, len(pool.buffers)), (1, 2))
+        pool.release(extra)  # a one-off; nothing to give back
+        pool.release(held[0])
+        resized = pool.take((8, 8, 3))
+        self.assertIs(pool.buffers[-1], resized)
+        self.assertFalse(any(b is held[0] for b in pool.buffers))
+        self.assertEqual((pool.unpooled, len(pool.buffers)), (1, 2))
+
+    def test_steady_state_capture_allocates_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "clip.avi")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (64, 48))
+            for value in range(0, 250, 10):
+                writer.write(np.full((48, 64, 3), value, dtype=np.uint8))
+            writer.release()
+            pool = FramePool()
+            cap = cv2.VideoCapture(path)
+            allocated = []
+            try:
+                while True:
+                    ok, frame = pool.read(cap)
+                    if not ok:
+                        break
+                    rgb = pool.to_rgb(frame)
+                    display = pool.mirror(frame)
+                    np.testing.assert_array_equal(display, cv2.flip(frame, 1))
+                    np.testing.assert_array_equal(rgb, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                    allocated.append(pool.allocated)
+                    for buffer in (frame, rgb, display):
+                        pool.release(buffer)
+            finally:
+                cap.release()
+        # Nothing is allocated once the previous frame's buffers come back.
+        self.assertEqual(len(allocated), 25)
+        self.assertEqual(len(set(allocated[2:])), 1)
+        self.assertEqual(pool.in_use, 0)
+        self.assertIn("reuse=", pool.summary())
+
+
+class MirrorTests(unittest.TestCase):
+    def test_mirrored_landmarks_keep_gesture_and_palm_check(self):
+        for gesture in ("ILY_SIGN", "ONE_FINGER", "OPEN_PALM"):
+            landmarks = _hand(gesture).landmarks
+            mirrored = mirror_landmarks(landmarks)
+            self.assertEqual(detect_gesture(mirrored), detect_gesture(landmarks))
+            for handedness in ("Left", "Right"):
+                self.assertEqual(
+                    palm_facing_camera(mirrored, mirror_handedness(handedness)),
+                    palm_facing_camera(landmarks, handedness),
+                )
+
+    def test_mirror_coordinates(self):
+        (point,) = mirror_landmarks([_LM(0.25, 0.5, -0.1)])
+        self.assertEqual((point.x, point.y, point.z), (0.75, 0.5, -0.1))
+        self.assertIsNone(mirror_landmarks(None))
+        self.assertEqual([mirror_handedness(h) for h in ("Left", None)], ["Right", None])
+
+
+if __name__ == "__main__":
+    unittest.main()
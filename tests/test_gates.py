@@ -0,0 +1,95 @@
+import random
+import unittest
+from collections import Counter, deque
+
+from observer.constants import GESTURE_ILY, GESTURE_ONE_FINGER, GESTURE_OPEN_PALM
+from observer.gates import (
+    DecayedGestureSmoother,
+    GestureSmoother,
+    WeightedGestureSmoother,
+    make_smoother,
+)
+
+
+def _reference_vote(history, min_count):
+    # The original full-recount rule.
+    votes = Counter(g for g in history if g is not None)
+    if not votes:
+        return None
+    winner, count = votes.most_common(1)[0]
+    return winner if count >= min_count else None
+
+
+class GestureSmootherTests(unittest.TestCase):
+    def test_running_counts_match_full_recount(self):
+        rng = random.Random(7)
+        choices = [None, GESTURE_ILY, GESTURE_ONE_FINGER, GESTURE_OPEN_PALM]
+        for window, min_count in ((7, 5), (31, 20), (1, 1)):
+            smoother = GestureSmoother(window, min_count)
+            history = deque(maxlen=window)
+            for _ in range(2000):
+                # Runs of the same gesture, like a real stream.
+                gesture = rng.choice(choices) if rng.random() < 0.3 else (history[-1] if history else None)
+                history.append(gesture)
+                self.assertEqual(smoother.update(gesture), _reference_vote(history, min_count))
+            self.assertEqual(sum(smoother.counts.values()), sum(g is not None for g in history))
+
+    def test_evicted_gestures_leave_no_counts(self):
+        smoother = GestureSmoother(window=3, min_count=2)
+        for gesture in (GESTURE_ILY, GESTURE_ILY, None, None, None):
+            smoother.update(gesture)
+        self.assertEqual(smoother.counts, {})
+
+
+class WeightedGestureSmootherTests(unittest.TestCase):
+    def test_low_confidence_frames_need_more_votes(self):
+        smoother = WeightedGestureSmoother(window=7, min_weight=4.0)
+        results = [smoother.update(GESTURE_ILY, 0.5) for _ in range(7)]
+        self.assertEqual(results, [None] * 7)
+        confident = WeightedGestureSmoother(window=7, min_weight=4.0)
+        results = [confident.update(GESTURE_ILY, 1.0) for _ in range(4)]
+        self.assertEqual(results, [None, None, None, GESTURE_ILY])
+
+
+class DecayedGestureSmootherTests(unittest.TestCase):
+    def test_accepts_after_a_short_run_and_fades(self):
+        smoother = DecayedGestureSmoother(half_life=3.0, min_share=0.6)
+        results = [smoother.update(GESTURE_ONE_FINGER) for _ in range(10)]
+        self.assertEqual(results.index(GESTURE_ONE_FINGER), 3)
+        fading = [smoother.update(None) for _ in range(6)]
+        self.assertEqual(fading[0], GESTURE_ONE_FINGER)
+        self.assertIsNone(fading[-1])
+
+    def test_switches_to_a_new_gesture(self):
+        smoother = DecayedGestureSmoother()
+        for _ in range(20):
+            smoother.update(GESTURE_ILY)
+        results = [smoother.update(GESTURE_OPEN_PALM) for _ in range(10)]
+        self.assertEqual(results[-1], GESTURE_OPEN_PALM)
+
+
+class MakeSmootherTests(unittest.TestCase):
+    def test_strategies(self):
+        default = make_smoother("count", 7)
+        self.assertEqual((default.history.maxlen, default.min_count), (7, 5))
+        self.assertIsInstance(make_smoother("weighted"), WeightedGestureSmoother)
+        self.assertIsInstance(make_smoother("decay"), DecayedGestureSmoother)
+        with self.assertRaises(ValueError):
+            make_smoother("median")
+
+    def test_windows_below_one_frame_are_rejected(self):
+        for strategy in ("count", "weighted", "decay"):
+            for window in (0, -3):
+                with self.assertRaises(ValueError):
+                    make_smoother(strategy, window)
+        with self.assertRaises(ValueError):
+            GestureSmoother(0)
+        with self.assertRaises(ValueError):
+            WeightedGestureSmoother(-1)
+        with self.assertRaises(ValueError):
+            DecayedGestureSmoother(half_life=0.0)
+        self.assertEqual(make_smoother("count", 1).update(GESTURE_ILY), GESTURE_ILY)
+
+
+if __name__ == "__main__":
+    unittest.main()
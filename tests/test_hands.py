@@ -0,0 +1,93 @@
+import unittest
+
+from observer.constants import GESTURE_ILY, GESTURE_ONE_FINGER, GESTURE_OPEN_PALM
+from observer.hands import HandObservation, HandRegistry
+from test_logic import _LM, _make_landmarks, _set_finger, _set_thumb
+
+_POSES = {
+    GESTURE_ILY: ({"index": True, "middle": False, "ring": False, "pinky": True}, "side"),
+    GESTURE_ONE_FINGER: ({"index": True, "middle": False, "ring": False, "pinky": False}, "near"),
+    GESTURE_OPEN_PALM: ({"index": True, "middle": True, "ring": True, "pinky": True}, "away"),
+}
+
+
+def _hand(gesture, dx=0.0, handedness=None, confidence=1.0) -> HandObservation:
+    """A hand showing ``gesture`` shifted ``dx`` across the frame (palm length ~0.25)."""
+    points = _make_landmarks()
+    fingers, thumb = _POSES[gesture]
+    for finger, up in fingers.items():
+        _set_finger(points, finger, up)
+    _set_thumb(points, thumb)
+    return HandObservation([_LM(p.x + dx, p.y, p.z) for p in points], handedness, confidence)
+
+
+class HandMatchingTests(unittest.TestCase):
+    def test_identity_follows_position_not_list_order(self):
+        registry = HandRegistry(max_hands=2)
+        first = registry.match([_hand(GESTURE_ILY, -0.3), _hand(GESTURE_ILY, 0.3)], 0.0)
+        left_id, right_id = (hand.hand_id for hand, _ in first)
+        swapped = registry.match([_hand(GESTURE_ILY, 0.32), _hand(GESTURE_ILY, -0.28)], 0.1)
+        self.assertEqual([hand.hand_id for hand, _ in swapped], [right_id, left_id])
+
+    def test_distant_hand_gets_new_identity(self):
+        registry = HandRegistry(max_hands=2, max_jump=1.0)
+        ((hand, _),) = registry.match([_hand(GESTURE_ILY, -0.3)], 0.0)
+        ((moved, _),) = registry.match([_hand(GESTURE_ILY, 0.3)], 0.1)
+        self.assertNotEqual(moved.hand_id, hand.hand_id)
+        self.assertEqual(len(registry.hands), 2)
+
+    def test_extra_hands_and_identities_are_capped(self):
+        registry = HandRegistry(max_hands=2, max_jump=0.1)
+        spread = ((-0.4, 0.5), (0.0, 0.9), (0.4, 0.8))
+        hands = [_hand(GESTURE_ILY, dx, confidence=c) for dx, c in spread]
+        matched = registry.match(hands, 0.0)
+        self.assertEqual([o.confidence for _, o in matched], [0.9, 0.8])
+        for step in range(1, 10):
+            registry.match([_hand(GESTURE_ILY, -0.45 + step * 0.1)], float(step))
+        self.assertLessEqual(len(registry.hands), registry.max_identities)
+
+
+class PerHandGateTests(unittest.TestCase):
+    def test_each_hand_drives_its_own_activity(self):
+        registry = HandRegistry(max_hands=2, hold_seconds=1.0)
+        switched = {}
+        for step in range(40):
+            now = step * 0.1
+            frame = [_hand(GESTURE_ILY, -0.3, "Left"), _hand(GESTURE_ONE_FINGER, 0.3, "Left")]
+            held, _ = registry.update(frame, now)
+            for hand, gesture in held:
+                if hand.tracker.apply_gesture(gesture, now):
+                    switched[hand.hand_id] = hand.tracker.active_activity
+        self.assertEqual(sorted(switched.values()), ["studying", "youtube"])
+        self.assertEqual(registry.active_activity, "studying, youtube")
+        totals = registry.snapshot(4.0)
+        self.assertGreater(totals["studying"], 2.0)
+        self.assertGreater(totals["youtube"], 2.0)
+
+    def test_lost_hand_keeps_identity_then_retires(self):
+        registry = HandRegistry(max_hands=2, hold_seconds=0.0, forget_after=2.0)
+        events = []
+        registry.listener_factory = lambda hand_id: events.append
+        for step in range(10):
+            held, _ = registry.update([_hand(GESTURE_ILY)], step * 0.1)
+            for hand, gesture in held:
+                hand.tracker.apply_gesture(gesture, step * 0.1)
+        (hand_id,) = registry.hands
+        held, retired = registry.update([], 1.5)
+        self.assertEqual((held[0][0].hand_id, held[0][1], retired), (hand_id, None, []))
+        ((back, _),) = registry.match([_hand(GESTURE_ILY, 0.05)], 1.6)
+        self.assertEqual(back.hand_id, hand_id)
+        _, retired = registry.update([], 3.7)
+        self.assertEqual([hand.hand_id for hand in retired], [hand_id])
+        self.assertEqual(registry.hands, {})
+        # Started once the vote settled (0.4s) and ran until the hand was last seen (1.6s).
+        self.assertAlmostEqual(registry.retired_totals["studying"], 1.2)
+        self.assertAlmostEqual(registry.snapshot(10.0)["studying"], 1.2)
+        # Retiring stops the tracker, so its listeners see the session end.
+        self.assertEqual((events[-1]["from"], events[-1]["to"]), ("studying", None))
+        self.assertTrue(events[-1]["final"])
+        self.assertAlmostEqual(events[-1]["at"], 1.6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import datetime
+import json
+import os
+import tempfile
+import unittest
+
+from observer.history import HistoryStore, hour_slices
+
+
+def _ts(*args):
+    return datetime.datetime(*args).timestamp()
+
+
+def _switch(ts, previous, current):
+    return json.dumps({"type": "switch", "ts": ts, "from": previous, "to": current}) + "\n"
+
+
+class HourSlicesTests(unittest.TestCase):
+    def test_session_is_split_at_hour_boundaries(self):
+        slices = hour_slices(_ts(2026, 3, 1, 9, 30), _ts(2026, 3, 1, 11, 15))
+        self.assertEqual([hour.hour for hour, _ in slices], [9, 10, 11])
+        self.assertEqual([round(s) for _, s in slices], [1800, 3600, 900])
+
+
+class HistoryStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(os.path.join(self.tmp.name, "history.sqlite"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_rollups_split_sessions_across_midnight(self):
+        self.store.add_session("studying", _ts(2026, 3, 1, 23, 0), _ts(2026, 3, 2, 1, 0))
+        self.store.add_session("youtube", _ts(2026, 3, 2, 8, 0), _ts(2026, 3, 2, 8, 30))
+        self.assertEqual(
+            self.store.daily("2026-03-01", "2026-03-02", "studying"),
+            [("2026-03-01", "studying", 3600.0), ("2026-03-02", "studying", 3600.0)],
+        )
+        self.assertEqual(
+            self.store.totals("2026-03-02", "2026-03-02"), {"studying": 3600.0, "youtube": 1800.0}
+        )
+        self.assertEqual(len(self.store.hourly("2026-03-02T00", "2026-03-02T23")), 2)
+
+    def test_longest_session_and_streak(self):
+        for day in (1, 2, 3, 5):
+            self.store.add_session("studying", _ts(2026, 3, day, 9), _ts(2026, 3, day, 10))
+        self.store.add_session("studying", _ts(2026, 3, 6, 9), _ts(2026, 3, 6, 13))
+        start, end = self.store.longest_session("studying")
+        self.assertEqual(end - start, 4 * 3600)
+        self.assertEqual(self.store.longest_streak("studying"), ("2026-03-01", "2026-03-03", 3))
+        self.assertIsNone(self.store.longest_streak("lol"))
+
+    def test_ingest_reads_only_new_events(self):
+        log_path = os.path.join(self.tmp.name, "events.jsonl")
+        with open(log_path, "w") as f:
+            f.write(_switch(_ts(2026, 3, 1, 9), None, "studying"))
+            f.write(_switch(_ts(2026, 3, 1, 10), "studying", "youtube"))
+        self.assertEqual(self.store.ingest_event_log(log_path), 1)
+        self.assertEqual(self.store.ingest_event_log(log_path), 0)
+
+        with open(log_path, "a") as f:
+            f.write(_switch(_ts(2026, 3, 1, 10, 30), "youtube", None))
+            f.write('{"type": "switch", "ts": 1')  # torn line, not consumed yet
+        self.assertEqual(self.store.ingest_event_log(log_path), 1)
+        self.assertEqual(
+            self.store.totals("2026-03-01", "2026-03-01"), {"studying": 3600.0, "youtube": 1800.0}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from benchmarks.fixtures import labeled_hands
+from observer.engine import FrameEngine, RuntimeConfig
+from observer.gates import WeightedGestureSmoother
+from observer.gestures import landmarks_to_array
+from observer.learned import (
+    LearnedClassifier,
+    evaluate,
+    load_classifier,
+    load_labeled_recordings,
+    train_classifier,
+)
+from observer.recording import FRAME_DTYPE, LandmarkRecorder
+from observer.replay import replay_frames
+from observer.rules import DEFAULT_RULESET, RuleSet
+from observer.sources import SyntheticSource
+from test_logic import _LM
+from test_recording import ILY, ONE, _pose
+
+_MODEL = None
+
+
+def _model() -> LearnedClassifier:
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = train_classifier(*labeled_hands(2048, seed=0), epochs=30)
+    return _MODEL
+
+
+class LearnedClassifierTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_small_hands_beat_the_fixed_thresholds(self):
+        points, labels = labeled_hands(512, seed=3, scales=(0.5, 0.75))
+        learned = evaluate(_model(), points, labels)["accuracy"]
+        self.assertGreater(learned, 0.98)
+        self.assertGreater(learned, evaluate(DEFAULT_RULESET, points, labels)["accuracy"])
+
+    def test_single_frame_batch_and_objects_agree(self):
+        model = _model()
+        points, _ = labeled_hands(64, seed=4)
+        batch = model.detect_batch(points)
+        for hand, expected in zip(points, batch):
+            objects = [_LM(float(x), float(y), float(z)) for x, y, z in hand]
+            self.assertEqual(model.detect(hand), expected)
+            self.assertEqual(model.classify(objects)[0], expected)
+            np.testing.assert_allclose(
+                model.probabilities(objects), model.probabilities_batch(hand), atol=1e-9
+            )
+        confidences = model.confidences(ILY)
+        self.assertEqual(tuple(confidences), model.classes)
+        self.assertAlmostEqual(sum(confidences.values()), 1.0)
+        self.assertEqual(len(model.classify(ILY)[1]), len(model.classes))
+
+    def test_class_probability_weights_the_smoother(self):
+        model = _model()
+        gesture, _, score = model.classify_scored(ILY)
+        self.assertEqual(gesture, "ILY_SIGN")
+        self.assertAlmostEqual(score, max(model.probabilities(ILY)))
+        self.assertEqual(DEFAULT_RULESET.classify_scored(ILY)[2], 1.0)
+
+        weights = []
+
+        class _Spy(WeightedGestureSmoother):
+            def update(self, gesture, confidence=1.0):
+                weights.append(confidence)
+                return super().update(gesture, confidence)
+
+        source = SyntheticSource([landmarks_to_array(ILY)], count=3, hold_frames=3, jitter=0.0)
+        engine = FrameEngine(source, RuntimeConfig(rules=model, smoother=_Spy()))
+        for captured_at, observations in source.frames():
+            engine.process_observations(observations, captured_at)
+        self.assertEqual(len(weights), 3)
+        for weight in weights:
+            self.assertAlmostEqual(weight, score)
+
+    def test_min_confidence_reports_no_gesture(self):
+        model = _model()
+        self.assertEqual(model.detect(ILY), "ILY_SIGN")
+        model_path = os.path.join(self.tmp.name, "model.npz")
+        model.save(model_path)
+        strict = LearnedClassifier.load(model_path)
+        strict.min_confidence = 1.01
+        self.assertIsNone(strict.detect(ILY))
+        np.testing.assert_allclose(strict.probabilities(ONE), model.probabilities(ONE))
+        self.assertIs(load_classifier(DEFAULT_RULESET, None), DEFAULT_RULESET)
+
+    def test_rules_must_define_the_model_classes(self):
+        model_path = os.path.join(self.tmp.name, "model.npz")
+        _model().save(model_path)
+        only_palm = RuleSet(
+            {
+                "features": {"up": {"above": [8, 5]}},
+                "gestures": [{"name": "OPEN_PALM", "stop": True, "checks": {"UP": "up"}}],
+            }
+        )
+        with self.assertRaises(ValueError):
+            LearnedClassifier.load(model_path, only_palm)
+        with self.assertRaises(ValueError):
+            train_classifier(labeled_hands(8)[0], ["ILY_SIGN"] * 8, only_palm, epochs=1)
+        np.savez(model_path, w1=np.zeros(3))
+        with self.assertRaises(ValueError):
+            LearnedClassifier.load(model_path)
+
+
+class TrainingPipelineTests(unittest.TestCase):
+    def test_labeled_recordings_train_a_replayable_model(self):
+        rng = np.random.default_rng(5)
+        fist = _pose(False, False, False, False, thumb="near")
+        with tempfile.TemporaryDirectory() as tmp:
+            labeled = []
+            for label, pose in (("ILY_SIGN", ILY), ("ONE_FINGER", ONE), ("none", fist)):
+                path = os.path.join(tmp, f"{label}.obsrec")
+                base = landmarks_to_array(pose)
+                with LandmarkRecorder(path) as recorder:
+                    for i in range(50):
+                        recorder.write(i / 30.0, None if i == 10 else base, "Left")
+                        base = base + rng.normal(0.0, 0.002, base.shape)
+                labeled.append((label, path))
+            (points, labels), (test_points, test_labels) = load_labeled_recordings(labeled, 0.2)
+            self.assertEqual((len(points), len(test_points)), (3 * 39, 3 * 10))
+            self.assertEqual(test_labels[:10], ["ILY_SIGN"] * 10)
+
+            model = train_classifier(points, labels, epochs=40)
+            self.assertEqual(model.classes, ("none", "ILY_SIGN", "ONE_FINGER"))
+            self.assertEqual(evaluate(model, test_points, test_labels)["accuracy"], 1.0)
+
+        frames = np.zeros(90, dtype=FRAME_DTYPE)
+        frames["t"] = np.arange(90) / 30.0
+        frames["present"] = 1
+        frames["handedness"] = 1
+        frames["landmarks"] = landmarks_to_array(ILY)
+        result = replay_frames(frames, rules=model)
+        self.assertEqual(result.switches[0][1], "studying")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from observer.metrics import NULL_CLOCK, LatencyMetrics, RingHistogram
+
+
+class RingHistogramTests(unittest.TestCase):
+    def test_percentiles_cover_only_recent_samples(self):
+        histogram = RingHistogram(capacity=100)
+        self.assertIsNone(histogram.percentiles())
+        for value in range(1000):
+            histogram.record(float(value))
+        p50, p95, p99 = histogram.percentiles()
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(p50, 949.5)
+        self.assertGreater(p99, p95)
+        self.assertGreaterEqual(min(histogram.samples), 900.0)
+
+
+class LatencyMetricsTests(unittest.TestCase):
+    def test_clock_laps_record_stage_durations(self):
+        metrics = LatencyMetrics(report_interval=3600)
+        clock = metrics.clock()
+        clock.lap("convert")
+        clock.lap("inference")
+        stats = metrics.snapshot()
+        self.assertEqual(set(stats), {"convert", "inference"})
+        self.assertEqual(stats["convert"]["count"], 1)
+        NULL_CLOCK.lap("convert")
+        self.assertEqual(metrics.snapshot()["convert"]["count"], 1)
+
+    def test_hud_lines_are_cached_between_refreshes(self):
+        metrics = LatencyMetrics(hud_refresh=1.0)
+        metrics.record("inference", 0.010)
+        lines = metrics.hud_lines(now=100.0)
+        self.assertEqual(len(lines), 2)
+        metrics.record("hud", 0.001)
+        self.assertEqual(metrics.hud_lines(now=100.5), lines)
+        self.assertEqual(len(metrics.hud_lines(now=101.0)), 3)
+
+    def test_periodic_report_to_file_with_alert(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.jsonl")
+            metrics = LatencyMetrics(report_interval=5.0, metrics_file=path, alert_ms=50.0)
+            for _ in range(10):
+                metrics.record("end_to_end", 0.080)
+            out = StringIO()
+            with redirect_stdout(out):
+                metrics.maybe_report(now=0.0)
+                metrics.maybe_report(now=metrics._next_report)
+                metrics.maybe_report(now=metrics._next_report - 1.0)
+            metrics.close()
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 1)
+        self.assertAlmostEqual(records[0]["stages"]["end_to_end"]["p95"], 80.0)
+        self.assertIn("alert", records[0])
+        self.assertIn("ALERT", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
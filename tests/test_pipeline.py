@@ -0,0 +1,118 @@
+import unittest
+
+from observer.pipeline import InFlightTracker, LatestQueue, RateMeter, run_pipeline
+
+
+class _FakeCapture:
+    def __init__(self, frames: int):
+        self.remaining = frames
+        self.index = 0
+
+    def read(self):
+        if self.remaining <= 0:
+            return False, None
+        self.remaining -= 1
+        self.index += 1
+        return True, self.index
+
+
+class LatestQueueTests(unittest.TestCase):
+    def test_put_evicts_oldest_when_full(self):
+        queue = LatestQueue(maxsize=1)
+        queue.put(1)
+        queue.put(2)
+        queue.put(3)
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual(queue.get(timeout=0), 3)
+        self.assertIsNone(queue.get(timeout=0))
+
+    def test_close_drains_remaining_items(self):
+        queue = LatestQueue(maxsize=2)
+        queue.put("a")
+        queue.close()
+        self.assertFalse(queue.drained)
+        self.assertEqual(queue.get(timeout=0), "a")
+        self.assertTrue(queue.drained)
+        self.assertIsNone(queue.get())
+
+
+class RateMeterTests(unittest.TestCase):
+    def test_reports_rate_per_window(self):
+        meter = RateMeter(window_seconds=1.0)
+        for i in range(31):
+            meter.tick(i / 30.0)
+        self.assertAlmostEqual(meter.fps, 30.0, places=3)
+        self.assertEqual(meter.total, 31)
+
+
+class InFlightTrackerTests(unittest.TestCase):
+    def test_skips_submission_when_saturated(self):
+        in_flight = InFlightTracker(max_in_flight=2, max_age_ms=250)
+        self.assertEqual(in_flight.try_submit(0), 0)
+        self.assertEqual(in_flight.try_submit(10), 10)
+        self.assertIsNone(in_flight.try_submit(20))
+        self.assertEqual(in_flight.skipped, 1)
+        self.assertTrue(in_flight.complete(0, now_ms=30))
+        self.assertEqual(in_flight.try_submit(30), 30)
+
+    def test_timestamps_stay_strictly_increasing(self):
+        in_flight = InFlightTracker(max_in_flight=4)
+        self.assertEqual(in_flight.try_submit(5), 5)
+        self.assertEqual(in_flight.try_submit(5), 6)
+        self.assertEqual(in_flight.try_submit(3), 7)
+
+    def test_rejects_out_of_order_and_late_results(self):
+        in_flight = InFlightTracker(max_in_flight=4, max_age_ms=100)
+        for ts in (0, 10, 20):
+            in_flight.try_submit(ts)
+        self.assertTrue(in_flight.complete(10, now_ms=15))
+        self.assertEqual(in_flight.lost, 1)
+        self.assertFalse(in_flight.complete(0, now_ms=20))
+        self.assertFalse(in_flight.complete(20, now_ms=500))
+        self.assertEqual(in_flight.stale, 2)
+        self.assertEqual(in_flight.in_flight, 0)
+
+    def test_expires_requests_that_never_complete(self):
+        in_flight = InFlightTracker(max_in_flight=1, max_age_ms=100)
+        in_flight.try_submit(0)
+        self.assertIsNone(in_flight.try_submit(50))
+        self.assertEqual(in_flight.try_submit(200), 200)
+        self.assertEqual(in_flight.lost, 1)
+
+
+class RunPipelineTests(unittest.TestCase):
+    def test_processes_until_capture_ends(self):
+        rendered = []
+
+        def process(frame, captured_at):
+            return frame * 10
+
+        def render(packet, stats):
+            rendered.append(packet)
+            return True
+
+        stats = run_pipeline(_FakeCapture(50), process, render)
+        self.assertGreater(len(rendered), 0)
+        self.assertEqual(rendered, sorted(rendered))
+        self.assertEqual(stats.capture.total, 50)
+        self.assertEqual(
+            stats.inference.total + stats.frames.dropped, stats.capture.total
+        )
+
+    def test_render_can_stop_pipeline(self):
+        def render(packet, stats):
+            return False
+
+        stats = run_pipeline(_FakeCapture(10_000), lambda f, t: f, render)
+        self.assertEqual(stats.render.total, 1)
+
+    def test_worker_errors_are_raised(self):
+        def process(frame, captured_at):
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            run_pipeline(_FakeCapture(5), process, lambda p, s: True)
+
+
+if __name__ == "__main__":
+    unittest.main()
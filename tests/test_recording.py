@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from observer.gestures import (
+    landmarks_to_array,
+    outside_of_hand_showing,
+    outside_of_hand_showing_batch,
+)
+from observer.recording import FRAME_DTYPE, HEADER_SIZE, LandmarkRecorder, open_recording
+from observer.replay import replay_recording
+from test_logic import _LM, _make_landmarks, _set_finger, _set_thumb
+
+
+def _pose(*ups: bool, thumb: str) -> list[_LM]:
+    points = _make_landmarks()
+    for finger, up in zip(("index", "middle", "ring", "pinky"), ups):
+        _set_finger(points, finger, up)
+    _set_thumb(points, thumb)
+    return points
+
+
+ILY = _pose(True, False, False, True, thumb="side")
+ONE = _pose(True, False, False, False, thumb="near")
+OPEN = _pose(True, True, True, True, thumb="away")
+
+
+class RecordingFormatTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.obsrec")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        with LandmarkRecorder(self.path) as recorder:
+            recorder.write(10.0, ILY, "Left")
+            recorder.write(10.1, None, None)
+            recorder.write(10.2, landmarks_to_array(ONE), "Right")
+        recording = open_recording(self.path)
+        self.assertEqual(len(recording), 3)
+        self.assertAlmostEqual(recording.duration, 0.2)
+        self.assertEqual(recording.frames["present"].tolist(), [1, 0, 1])
+        self.assertEqual(recording.frames["handedness"].tolist(), [1, 0, 2])
+        np.testing.assert_array_equal(recording.frames["landmarks"][0], landmarks_to_array(ILY))
+
+    def test_truncated_file_recovers_complete_frames(self):
+        recorder = LandmarkRecorder(self.path)
+        for i in range(5):
+            recorder.write(float(i), ONE, None)
+        recorder._file.close()  # a crash: the header is never rewritten
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER_SIZE + 3 * FRAME_DTYPE.itemsize + 10)
+        recording = open_recording(self.path)
+        self.assertEqual(len(recording), 3)
+        self.assertEqual(recording.frames["t"].tolist(), [0.0, 1.0, 2.0])
+
+    def test_rejects_foreign_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"x" * 128)
+        with self.assertRaises(ValueError):
+            open_recording(self.path)
+
+
+class ReplayTests(unittest.TestCase):
+    def test_replay_drives_gates_and_tracker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.obsrec")
+            with LandmarkRecorder(path) as recorder:
+                t = 0.0
+                for pose, seconds in ((ILY, 10.0), (None, 2.0), (ONE, 5.0), (OPEN, 3.0)):
+                    for _ in range(int(seconds * 30)):
+                        recorder.write(t, pose, "Left" if pose is not None else None)
+                        t += 1.0 / 30.0
+            result = replay_recording(open_recording(path))
+        self.assertEqual(result.frames, 600)
+        self.assertEqual([activity for _, activity in result.switches], ["studying", "youtube", None])
+        # Each switch lands after the smoother window plus the 1.5 s hold.
+        self.assertAlmostEqual(result.switches[0][0], 1.5 + 4 / 30.0, delta=1 / 30.0)
+        self.assertAlmostEqual(result.totals["studying"], 12.0, delta=1 / 30.0)
+        self.assertGreater(result.totals["youtube"], 4.0)
+        self.assertEqual(result.totals["lol"], 0.0)
+
+    def test_batch_outside_hand_matches_scalar(self):
+        rng = np.random.default_rng(5)
+        frames = rng.uniform(-0.5, 1.0, (300, 21, 3)).astype(np.float32)
+        codes = rng.integers(0, 3, 300)
+        labels = (None, "Left", "Right")
+        expected = [
+            outside_of_hand_showing([_LM(*map(float, p)) for p in frame], labels[code])
+            for frame, code in zip(frames, codes)
+        ]
+        self.assertEqual(outside_of_hand_showing_batch(frames, codes).tolist(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from observer.roi import Point, RoiTracker, RoiWindow
+
+
+def _square_hand(x0, y0, x1, y1):
+    return [Point(x0, y0, 0.0), Point(x1, y1, -0.1)] + [Point((x0 + x1) / 2, (y0 + y1) / 2, 0.0)] * 19
+
+
+class RoiWindowTests(unittest.TestCase):
+    def test_maps_crop_coordinates_to_full_frame(self):
+        window = RoiWindow(320, 180, 400, 400, 1280, 720)
+        (point,) = window.to_frame([Point(0.5, 0.25, -0.2)])
+        self.assertAlmostEqual(point.x, (320 + 200) / 1280)
+        self.assertAlmostEqual(point.y, (180 + 100) / 720)
+        self.assertAlmostEqual(point.z, -0.2 * 400 / 1280)
+
+
+class RoiTrackerTests(unittest.TestCase):
+    def test_full_frame_until_hand_found_then_cropped_and_downscaled(self):
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        roi = RoiTracker(margin=0.25, min_side=100, max_side=200)
+        image, window = roi.prepare(frame)
+        self.assertIs(image, frame)
+        self.assertIsNone(window)
+
+        roi.update(_square_hand(0.5, 0.5, 0.6, 0.7), frame.shape)
+        image, window = roi.prepare(frame)
+        self.assertEqual(window.width, window.height)
+        self.assertLessEqual(max(image.shape[:2]), 200)
+        # The whole hand lies inside the crop.
+        self.assertLessEqual(window.x0, 0.5 * 1920)
+        self.assertGreaterEqual(window.x0 + window.width, 0.6 * 1920)
+        self.assertLessEqual(window.y0, 0.5 * 1080)
+        self.assertGreaterEqual(window.y0 + window.height, 0.7 * 1080)
+
+    def test_box_shifts_inside_frame_at_edges(self):
+        roi = RoiTracker(margin=0.5, min_side=100)
+        roi.update(_square_hand(0.0, 0.9, 0.05, 1.0), (720, 1280, 3))
+        x0, y0, x1, y1 = roi.box
+        self.assertEqual(x0, 0)
+        self.assertLessEqual(y1, 720)
+        self.assertEqual(x1 - x0, y1 - y0)
+
+    def test_lost_hand_falls_back_to_full_frame(self):
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        roi = RoiTracker()
+        roi.update(_square_hand(0.4, 0.4, 0.5, 0.5), frame.shape)
+        roi.prepare(frame)
+        roi.update(None, frame.shape)
+        image, window = roi.prepare(frame)
+        self.assertIsNone(window)
+        self.assertEqual((roi.roi_frames, roi.full_frames, roi.lost), (1, 1, 1))
+
+    def test_hand_filling_frame_uses_full_search(self):
+        roi = RoiTracker()
+        roi.update(_square_hand(0.05, 0.05, 0.95, 0.95), (480, 640, 3))
+        self.assertIsNone(roi.box)
+
+
+if __name__ == "__main__":
+    unittest.main()
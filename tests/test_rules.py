@@ -0,0 +1,111 @@
+import copy
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from observer.activity import ActivityTracker
+from observer.gestures import _atomic_flags
+from observer.rules import DEFAULT_RULES, DEFAULT_RULESET, RuleSet, load_rules
+from test_classifier import _frames, _pose_fixtures, _to_objects
+from test_logic import _make_landmarks, _set_finger, _set_thumb
+
+
+def _rock_rules() -> dict:
+    # Index and pinky up, thumb tucked: a new gesture ahead of the defaults.
+    spec = copy.deepcopy(DEFAULT_RULES)
+    spec["features"]["rock"] = {
+        "all": ["index_up", "pinky_up", {"not": "middle_up"}, "thumb_near_palm"]
+    }
+    spec["gestures"].insert(
+        0, {"name": "ROCK", "label": "ROCK", "activity": "music", "checks": {"ROCK": "rock"}}
+    )
+    return spec
+
+
+def _rock_pose():
+    points = _make_landmarks()
+    for finger, up in (("index", True), ("middle", False), ("ring", False), ("pinky", True)):
+        _set_finger(points, finger, up)
+    _set_thumb(points, "near")
+    return points
+
+
+class DefaultRuleSetTests(unittest.TestCase):
+    def test_features_match_reference_flags(self):
+        frames = _frames(random=200)
+        features = DEFAULT_RULESET.features_batch(frames)
+        for i, frame in enumerate(frames):
+            flags = _atomic_flags(_to_objects(frame))
+            for name, value in flags.items():
+                self.assertEqual(bool(features[name][i]), value, (i, name))
+
+    def test_object_and_array_paths_agree(self):
+        for points in _pose_fixtures():
+            objects = _to_objects(points)
+            self.assertEqual(DEFAULT_RULESET.classify(objects), DEFAULT_RULESET.classify(points))
+            self.assertEqual(DEFAULT_RULESET.detect(objects), DEFAULT_RULESET.detect(points))
+
+    def test_shared_comparisons_are_computed_once(self):
+        spec = copy.deepcopy(DEFAULT_RULES)
+        spec["features"]["index_up_again"] = copy.deepcopy(spec["features"]["index_up"])
+        points = np.stack(_pose_fixtures())
+        self.assertEqual(
+            RuleSet(spec).comparisons(points).shape, DEFAULT_RULESET.comparisons(points).shape
+        )
+
+
+class CustomRuleTests(unittest.TestCase):
+    def test_new_gesture_starts_new_activity(self):
+        rules = RuleSet(_rock_rules())
+        self.assertEqual(rules.detect(_rock_pose()), "ROCK")
+        self.assertIsNone(DEFAULT_RULESET.detect(_rock_pose()))
+        self.assertEqual(rules.activities, ("music", "studying", "youtube", "lol"))
+
+        tracker = ActivityTracker(
+            0.0, activity_by_gesture=rules.activity_by_gesture, stop_gestures=rules.stop_gestures
+        )
+        tracker.apply_gesture(rules.detect(_rock_pose()), 0.0)
+        tracker.apply_gesture("OPEN_PALM", 5.0)
+        self.assertEqual(tracker.snapshot(9.0)["music"], 5.0)
+
+    def test_load_from_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rules.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(_rock_rules(), f)
+            rules = load_rules(path)
+            self.assertEqual(rules.gesture_names[0], "ROCK")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("{not json")
+            with self.assertRaises(ValueError):
+                load_rules(path)
+        self.assertIs(load_rules(None), DEFAULT_RULESET)
+
+    def test_invalid_specs_are_rejected(self):
+        broken = []
+        spec = _rock_rules()
+        spec["features"]["rock"] = "missing_feature"
+        broken.append(spec)
+        spec = _rock_rules()
+        spec["features"]["a"], spec["features"]["b"] = "b", "a"
+        spec["gestures"][0]["checks"] = {"A": "a"}
+        broken.append(spec)
+        spec = _rock_rules()
+        spec["features"]["rock"] = {"above": [8, 21]}
+        broken.append(spec)
+        spec = _rock_rules()
+        spec["gestures"][0]["stop"] = True
+        broken.append(spec)
+        spec = _rock_rules()
+        spec["gestures"].append(dict(spec["gestures"][0]))
+        broken.append(spec)
+        for spec in broken:
+            with self.assertRaises(ValueError):
+                RuleSet(spec)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from observer.constants import GESTURE_ILY, GESTURE_ONE_FINGER, GESTURE_OPEN_PALM
+from observer.scheduler import (
+    MODE_FULL,
+    MODE_PROBE,
+    MODE_STEADY,
+    InferenceScheduler,
+    SchedulerPolicy,
+    switch_pending,
+)
+
+
+def _run(scheduler, start, end, hand_present, pending, fps=30):
+    """Drive ``scheduler`` like the frame loop; returns how many frames ran."""
+    ran = 0
+    for i in range(int((end - start) * fps)):
+        now = start + i / fps
+        if scheduler.should_run(now):
+            ran += 1
+            scheduler.observe(now, hand_present, pending)
+    return ran
+
+
+class SwitchPendingTests(unittest.TestCase):
+    def test_only_gestures_that_change_activity_are_pending(self):
+        self.assertTrue(switch_pending(GESTURE_ILY, None))
+        self.assertFalse(switch_pending(GESTURE_ILY, "studying"))
+        self.assertTrue(switch_pending(GESTURE_ONE_FINGER, "studying"))
+        self.assertTrue(switch_pending(GESTURE_OPEN_PALM, "studying"))
+        self.assertFalse(switch_pending(GESTURE_OPEN_PALM, None))
+        self.assertFalse(switch_pending(None, "studying"))
+
+
+class InferenceSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        policy = SchedulerPolicy(probe_interval=0.5, steady_interval=0.25, idle_after=1.0, steady_after=5.0)
+        self.scheduler = InferenceScheduler(policy)
+
+    def test_no_hand_drops_to_presence_probe(self):
+        ran = _run(self.scheduler, 0.0, 1.0, hand_present=False, pending=False)
+        self.assertEqual(ran, 30)
+        _run(self.scheduler, 1.0, 2.0, hand_present=False, pending=False)
+        self.assertEqual(self.scheduler.mode, MODE_PROBE)
+        ran = _run(self.scheduler, 2.0, 12.0, hand_present=False, pending=False)
+        self.assertAlmostEqual(ran, 20, delta=2)
+
+    def test_pending_switch_runs_every_frame(self):
+        _run(self.scheduler, 0.0, 3.0, hand_present=False, pending=False)
+        # The probe finds a hand showing a new gesture: back to full rate.
+        self.scheduler.observe(3.0, hand_present=True, pending=True)
+        ran = _run(self.scheduler, 3.0, 5.0, hand_present=True, pending=True)
+        self.assertEqual(ran, 60)
+        self.assertEqual(self.scheduler.mode, MODE_FULL)
+
+    def test_steady_activity_runs_at_reduced_rate(self):
+        _run(self.scheduler, 0.0, 6.0, hand_present=True, pending=False)
+        self.assertEqual(self.scheduler.mode, MODE_STEADY)
+        ran = _run(self.scheduler, 6.0, 16.0, hand_present=True, pending=False)
+        self.assertAlmostEqual(ran, 40, delta=4)
+
+    def test_reports_savings(self):
+        self.scheduler.mode = MODE_PROBE
+        self.assertTrue(self.scheduler.should_run(0.0))
+        self.scheduler.record_inference(0.02)
+        for _ in range(9):
+            self.assertFalse(self.scheduler.should_run(0.1))
+        self.assertEqual((self.scheduler.ran, self.scheduler.skipped), (1, 9))
+        self.assertAlmostEqual(self.scheduler.skipped_fraction, 0.9)
+        self.assertAlmostEqual(self.scheduler.estimated_saved_seconds, 0.18)
+        self.assertIn("skipped=9", self.scheduler.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
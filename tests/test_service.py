@@ -0,0 +1,157 @@
+import json
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+from observer.activity import ActivityTracker
+from observer.service import EventService, parse_address
+
+
+def _connect(service: EventService) -> socket.socket:
+    if service.unix_path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(service.unix_path)
+    else:
+        sock = socket.create_connection((service.host, service.port))
+    sock.settimeout(5.0)
+    return sock
+
+
+def _get(service: EventService, path: str) -> tuple[str, dict]:
+    with _connect(service) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+        data = b""
+        while chunk := sock.recv(4096):
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), json.loads(body)
+
+
+class _Stream:
+    def __init__(self, service: EventService) -> None:
+        self.sock = _connect(service)
+        self.sock.sendall(b"GET /events HTTP/1.1\r\n\r\n")
+        self.file = self.sock.makefile("rb")
+        while self.file.readline() not in (b"\r\n", b""):
+            pass
+
+    def next_event(self) -> dict:
+        data = None
+        for line in self.file:
+            if line.startswith(b"data: "):
+                data = json.loads(line[len(b"data: "):])
+            elif line == b"\n" and data is not None:
+                return data
+        raise EOFError
+
+    def close(self) -> None:
+        self.file.close()
+        self.sock.close()
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+
+class EventServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.service = EventService("127.0.0.1:0", queue_size=4)
+        self.service.start()
+        self.addCleanup(self.service.close)
+
+    def test_snapshot_counts_running_activity(self):
+        tracker = ActivityTracker(initial_totals={"lol": 5.0})
+        tracker.apply_gesture("ILY_SIGN", time.monotonic() - 2.0)
+        self.service.publish_state(tracker)
+        _wait_for(lambda: self.service.snapshot()["active"] == "studying")
+        status, body = _get(self.service, "/snapshot")
+        self.assertEqual(status, "HTTP/1.1 200 OK")
+        self.assertEqual(body["active"], "studying")
+        self.assertEqual(body["totals"]["lol"], 5.0)
+        self.assertGreaterEqual(body["totals"]["studying"], 2.0)
+        status, _ = _get(self.service, "/missing")
+        self.assertEqual(status, "HTTP/1.1 404 Not Found")
+
+    def test_every_subscriber_gets_pushed_events(self):
+        streams = [_Stream(self.service) for _ in range(20)]
+        self.addCleanup(lambda: [stream.close() for stream in streams])
+        for stream in streams:
+            self.assertEqual(stream.next_event()["type"], "snapshot")
+        _wait_for(lambda: self.service.subscribers == 20)
+        tracker = ActivityTracker()
+        self.service.attach(tracker)
+        self.service.publish_gesture("ONE_FINGER")
+        self.service.publish_gesture("ONE_FINGER")  # Unchanged: not sent again.
+        tracker.apply_gesture("ONE_FINGER", time.monotonic())
+        for stream in streams:
+            gesture, switch = stream.next_event(), stream.next_event()
+            self.assertEqual((gesture["type"], gesture["gesture"]), ("gesture", "ONE_FINGER"))
+            self.assertEqual((switch["type"], switch["current"]), ("activity", "youtube"))
+        self.assertEqual(self.service.published, 2)
+
+    def test_slow_subscriber_drops_oldest_events(self):
+        stream = _Stream(self.service)
+        self.addCleanup(stream.close)
+        stream.next_event()
+        _wait_for(lambda: self.service.subscribers == 1)
+        # Queue events faster than the stream task can run: publish from the loop itself.
+        events = [{"type": "gesture", "gesture": str(i)} for i in range(10)]
+        self.service._loop.call_soon_threadsafe(lambda: [self.service._publish(e) for e in events])
+        first = stream.next_event()
+        self.assertEqual((first["type"], first["count"]), ("dropped", 6))
+        self.assertEqual([stream.next_event()["gesture"] for _ in range(4)], ["6", "7", "8", "9"])
+
+
+class UnixSocketTests(unittest.TestCase):
+    def test_serves_on_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "observer.sock")
+            service = EventService(f"unix:{path}")
+            service.start()
+            try:
+                status, body = _get(service, "/snapshot")
+            finally:
+                service.close()
+            self.assertEqual((status, body["active"]), ("HTTP/1.1 200 OK", None))
+            self.assertFalse(os.path.exists(path))
+
+    def test_replaces_only_stale_sockets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "observer.sock")
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(path)
+            stale.close()
+            service = EventService(f"unix:{path}")
+            service.start()
+            try:
+                # A second server must not take over the live socket.
+                with self.assertRaises(RuntimeError):
+                    EventService(f"unix:{path}").start()
+                self.assertEqual(_get(service, "/snapshot")[0], "HTTP/1.1 200 OK")
+            finally:
+                service.close()
+
+            with open(path, "w") as f:
+                f.write("notes")
+            with self.assertRaises(RuntimeError):
+                EventService(f"unix:{path}").start()
+            with open(path) as f:
+                self.assertEqual(f.read(), "notes")
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("8765"), ("127.0.0.1", 8765, None))
+        self.assertEqual(parse_address("0.0.0.0:80"), ("0.0.0.0", 80, None))
+        self.assertEqual(parse_address("unix:/tmp/o.sock"), (None, None, "/tmp/o.sock"))
+        for bad in ("unix:", "host:port", "1:99999"):
+            with self.assertRaises(ValueError):
+                parse_address(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
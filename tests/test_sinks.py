@@ -0,0 +1,257 @@
+import contextlib
+import http.server
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from observer.activity import ActivityTracker
+from observer.constants import GESTURE_ILY, GESTURE_ONE_FINGER, GESTURE_OPEN_PALM
+from observer.engine import FrameEngine, RuntimeConfig
+from observer.gestures import landmarks_to_array
+from observer.sinks import (
+    EventSink,
+    FileSink,
+    NotifySink,
+    SinkDispatcher,
+    SocketSink,
+    WebhookSink,
+    parse_sink,
+)
+from observer.sources import SyntheticSource
+from test_hands import _hand
+
+
+class _ListSink(EventSink):
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.batches: list[list[dict]] = []
+        self.closed = False
+
+    def write(self, events: list[dict]) -> None:
+        time.sleep(self.delay)
+        self.batches.append(events)
+
+    @property
+    def events(self) -> list[dict]:
+        return [event for batch in self.batches for event in batch]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class _BrokenSink(EventSink):
+    def write(self, events: list[dict]) -> None:
+        raise OSError("unreachable")
+
+
+def _read_lines(path: str) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TrackerEventTests(unittest.TestCase):
+    def test_switches_and_ticks_reach_listeners(self):
+        tracker = ActivityTracker(tick_seconds=10.0)
+        self.assertTrue(tracker.apply_gesture(GESTURE_ILY, 0.0))  # no listener, no event
+        events = []
+        tracker.subscribe(events.append)
+        for now in range(0, 31, 5):
+            tracker.tick(float(now))
+        tracker.apply_gesture(GESTURE_ONE_FINGER, 32.0)
+        tracker.apply_gesture(GESTURE_OPEN_PALM, 40.0)
+        # The first tick only starts the clock: ticks at 10, 20 and 30 s.
+        self.assertEqual([e["type"] for e in events], ["tick"] * 3 + ["switch"] * 2)
+        self.assertEqual(events[2]["totals"]["studying"], 30.0)
+        self.assertEqual((events[3]["from"], events[3]["to"]), ("studying", "youtube"))
+        self.assertEqual(events[4]["to"], None)
+        self.assertEqual(events[4]["totals"]["youtube"], 8.0)
+        tracker.unsubscribe(events.append)
+        tracker.apply_gesture(GESTURE_ILY, 50.0)
+        self.assertEqual(len(events), 5)
+
+    def test_stop_sends_a_final_switch(self):
+        tracker = ActivityTracker()
+        events = []
+        tracker.subscribe(events.append)
+        self.assertFalse(tracker.stop(1.0))  # nothing running
+        tracker.apply_gesture(GESTURE_ILY, 2.0)
+        self.assertTrue(tracker.stop(5.0))
+        self.assertEqual((events[-1]["from"], events[-1]["to"]), ("studying", None))
+        self.assertTrue(events[-1]["final"])
+        self.assertNotIn("final", events[0])
+        self.assertEqual(tracker.totals["studying"], 3.0)
+
+
+class SinkDispatcherTests(unittest.TestCase):
+    def test_events_are_batched_in_order_and_ticks_coalesce(self):
+        sink = _ListSink()
+        dispatcher = SinkDispatcher([sink], batch_size=8, batch_seconds=0.2)
+        for i in range(20):
+            dispatcher.publish({"type": "switch", "n": i})
+        dispatcher.publish({"type": "tick", "n": 20})
+        dispatcher.publish({"type": "tick", "n": 21})
+        dispatcher.close()
+        self.assertEqual([e["n"] for e in sink.events], list(range(20)) + [21])
+        self.assertTrue(all(len(batch) <= 8 for batch in sink.batches))
+        self.assertEqual(dispatcher.stats()[0]["delivered"], 21)
+
+    def test_slow_sink_never_blocks_the_publisher(self):
+        slow, fast = _ListSink(delay=0.05), _ListSink()
+        dispatcher = SinkDispatcher(
+            [slow, fast, _BrokenSink()], queue_size=16, batch_size=4, batch_seconds=0.01
+        )
+        started = time.perf_counter()
+        for i in range(500):
+            dispatcher.publish({"type": "switch", "n": i})
+        elapsed = time.perf_counter() - started
+        dispatcher.close()
+        # 500 events into a sink that takes 50 ms per batch of four would take seconds.
+        self.assertLess(elapsed, 0.5)
+        slow_stats, fast_stats, broken_stats = dispatcher.stats()
+        self.assertGreater(slow_stats["dropped"], 0)
+        self.assertEqual(slow_stats["delivered"] + slow_stats["dropped"], 500)
+        self.assertEqual(slow.events[-1]["n"], 499)
+        self.assertIn("dropped", [e["type"] for e in slow.events])
+        self.assertEqual(fast_stats["delivered"] + fast_stats["dropped"], 500)
+        self.assertEqual(broken_stats["delivered"], 0)
+        self.assertGreater(broken_stats["failed"], 0)
+        self.assertIn("error=OSError: unreachable", dispatcher.summary())
+
+    def test_close_timeout_still_closes_the_sink(self):
+        stuck = [_ListSink(delay=0.5) for _ in range(3)]
+        dispatcher = SinkDispatcher(stuck, batch_size=1, batch_seconds=0.0)
+        for i in range(3):
+            dispatcher.publish({"type": "switch", "n": i})
+        time.sleep(0.05)  # each sink's first event is in write()
+        started = time.monotonic()
+        dispatcher.close(timeout=0.1)
+        # One shared deadline, not one timeout per sink.
+        self.assertLess(time.monotonic() - started, 0.25)
+        self.assertTrue(all(sink.closed for sink in stuck))
+        for stats in dispatcher.stats():
+            self.assertTrue(stats["timed_out"])
+            self.assertEqual(stats["abandoned"], 2)
+        self.assertEqual(dispatcher.summary().count("timed_out abandoned=2"), 3)
+
+    def test_file_socket_webhook_and_notify_sinks_deliver(self):
+        received = []
+
+        class _Hook(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                received.extend(json.loads(self.rfile.read(length))["events"])
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        webhook = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Hook)
+        threading.Thread(target=webhook.serve_forever, daemon=True).start()
+        listener = socket.create_server(("127.0.0.1", 0))
+        streamed = []
+
+        def accept():
+            conn, _ = listener.accept()
+            with conn, conn.makefile() as lines:
+                streamed.extend(json.loads(line) for line in lines)
+
+        reader = threading.Thread(target=accept)
+        reader.start()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.jsonl")
+            notified = os.path.join(tmp, "notified.txt")
+            notify = NotifySink(
+                [sys.executable, "-c", f"open({notified!r}, 'a').write(__import__('sys').argv[1])"]
+            )
+            dispatcher = SinkDispatcher(
+                [
+                    FileSink(path),
+                    SocketSink(f"127.0.0.1:{listener.getsockname()[1]}"),
+                    WebhookSink(f"http://127.0.0.1:{webhook.server_port}/events"),
+                    notify,
+                ],
+                batch_seconds=0.01,
+            )
+            tracker = ActivityTracker()
+            dispatcher.attach(tracker)
+            tracker.apply_gesture(GESTURE_ILY, 0.0)
+            tracker.tick(1.0)
+            tracker.tick(61.0)
+            tracker.apply_gesture(GESTURE_OPEN_PALM, 90.0)
+            dispatcher.close()
+            reader.join(timeout=5.0)
+            written = _read_lines(path)
+            with open(notified, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Started studyingStopped studying")
+        webhook.shutdown()
+        webhook.server_close()
+        listener.close()
+        types = ["switch", "tick", "switch"]
+        for events in (written, streamed, received):
+            self.assertEqual([e["type"] for e in events], types)
+        self.assertEqual(written[1]["totals"]["studying"], 61.0)
+        self.assertEqual(dispatcher.stats()[3]["delivered"], 2)
+
+    def test_sink_specs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            sink = parse_sink("file:" + os.path.join(tmp, "out", "events.jsonl"))
+            self.assertIsInstance(sink, FileSink)
+            sink.close()
+        self.assertIsInstance(parse_sink("socket:unix:/tmp/observer.sock"), SocketSink)
+        self.assertIsInstance(parse_sink("webhook:http://127.0.0.1:9000/hook"), WebhookSink)
+        for spec in ("file:", "webhook:ftp://host", "socket:host:port", "carrier:pigeon"):
+            with self.assertRaises(ValueError):
+                parse_sink(spec)
+        with self.assertRaises(ValueError):
+            parse_sink("notify:no-such-notifier-command")
+
+
+class EngineSinkTests(unittest.TestCase):
+    def test_engine_publishes_to_sinks(self):
+        ily = landmarks_to_array(_hand(GESTURE_ILY).landmarks)
+        opened = landmarks_to_array(_hand(GESTURE_OPEN_PALM).landmarks)
+        sink = _ListSink()
+        dispatcher = SinkDispatcher([sink], batch_seconds=0.01, tick_seconds=2.0)
+        source = SyntheticSource([ily, opened], count=270, hold_frames=135)
+        engine = FrameEngine(source, RuntimeConfig(hold_seconds=1.0, sinks=dispatcher))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            engine.run()
+        dispatcher.close()
+        switches = [(e["from"], e["to"]) for e in sink.events if e["type"] == "switch"]
+        self.assertEqual(switches, [(None, "studying"), ("studying", None)])
+        # Unpaced frames outrun the sender, so pending ticks coalesce.
+        self.assertGreaterEqual(sum(e["type"] == "tick" for e in sink.events), 1)
+        # The caller reports sinks once they are closed; the engine does not.
+        self.assertNotIn("SINKS", out.getvalue())
+
+    def test_end_of_stream_stops_the_running_activity(self):
+        ily = landmarks_to_array(_hand(GESTURE_ILY).landmarks)
+        sink = _ListSink()
+        dispatcher = SinkDispatcher([sink], batch_seconds=0.01)
+        source = SyntheticSource([ily], count=135, hold_frames=135)
+        engine = FrameEngine(source, RuntimeConfig(hold_seconds=1.0, sinks=dispatcher))
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            engine.run()
+        dispatcher.close()
+        switches = [e for e in sink.events if e["type"] == "switch"]
+        self.assertEqual(
+            [(e["from"], e["to"]) for e in switches], [(None, "studying"), ("studying", None)]
+        )
+        self.assertTrue(switches[-1]["final"])
+        self.assertIsNone(engine.tracker.active_activity)
+        # The console reports gesture switches only.
+        self.assertIn("ACTIVE: studying", out.getvalue())
+        self.assertNotIn("STOPPED", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import queue
+import time
+import unittest
+
+import numpy as np
+
+from observer.constants import GESTURE_ILY
+from observer.supervisor import CameraSupervisor, _run_worker, _worker_engine
+from test_engine import _CameraSource
+from test_hands import _hand
+
+
+def _beat(events, generation, camera_index):
+    totals = {"studying": 2.0 + camera_index}
+    events.put(("heartbeat", generation, time.time(), totals, "studying", 30.0))
+
+
+def _crash_once_worker(camera_index, generation, events, config):
+    events.put(("ready", generation, time.time()))
+    events.put(("switch", generation, time.time(), None, "studying"))
+    _beat(events, generation, camera_index)
+    if generation == 0:
+        raise SystemExit(3)
+    while True:
+        time.sleep(0.05)
+        _beat(events, generation, camera_index)
+
+
+def _stalling_worker(camera_index, generation, events, config):
+    events.put(("ready", generation, time.time()))
+    while True:
+        if camera_index == 0 and generation == 0:
+            # A camera read that never returns.
+            time.sleep(60)
+        time.sleep(0.05)
+        _beat(events, generation, camera_index)
+
+
+class _FakeCamera:
+    """Yields ``count`` blank frames a couple of milliseconds apart, then fails."""
+
+    def __init__(self, count: int) -> None:
+        self.count = count
+        self.released = False
+
+    def read(self, image=None):
+        if self.count == 0:
+            return False, None
+        self.count -= 1
+        time.sleep(0.002)
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def release(self) -> None:
+        self.released = True
+
+
+def _poll_until(supervisor, predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        supervisor.poll()
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class CameraSupervisorTests(unittest.TestCase):
+    def _supervisor(self, worker, events=None, **kwargs):
+        supervisor = CameraSupervisor(
+            [0, 1],
+            "unused.task",
+            restart_delay=0.05,
+            on_event=None if events is None else lambda camera, m: events.append((camera, m[0])),
+            worker=worker,
+            **kwargs,
+        )
+        supervisor.start()
+        self.addCleanup(supervisor.stop)
+        return supervisor
+
+    def test_crashed_workers_restart_and_totals_combine(self):
+        events = []
+        supervisor = self._supervisor(_crash_once_worker, events)
+        feeds = supervisor.feeds.values()
+        restarted = _poll_until(
+            supervisor, lambda: all(f.generation == 1 and f.current for f in feeds)
+        )
+        self.assertTrue(restarted)
+        self.assertEqual([f.restarts for f in feeds], [1, 1])
+        self.assertEqual([f.last_error for f in feeds], ["exit code 3", "exit code 3"])
+        self.assertIn((0, "switch"), events)
+        self.assertIn((1, "restart"), events)
+        # Each camera banks its first worker's 2s/3s and reports the same again.
+        self.assertEqual(supervisor.totals(), {"studying": 10.0})
+
+    def test_stalled_feed_is_replaced_without_touching_others(self):
+        supervisor = self._supervisor(_stalling_worker, stall_seconds=0.5)
+        stalled, healthy = supervisor.feeds[0], supervisor.feeds[1]
+        self.assertTrue(_poll_until(supervisor, lambda: stalled.generation == 1))
+        self.assertTrue(stalled.last_error.startswith("no heartbeat"))
+        self.assertEqual((healthy.generation, healthy.restarts), (0, 0))
+        self.assertTrue(_poll_until(supervisor, lambda: stalled.current != {}))
+        self.assertIn("CAMERA 1 up", supervisor.status_lines()[1])
+
+    def test_worker_reports_through_the_frame_engine(self):
+        config = {"hold_seconds": 0.05, "heartbeat_interval": 0.05, "smoothing": "weighted"}
+        engine = _worker_engine(_CameraSource(_hand(GESTURE_ILY, handedness="Left")), config)
+        camera = _FakeCamera(150)
+        events = queue.Queue()
+        with self.assertRaises(SystemExit):
+            _run_worker(engine, camera, 3, events, config)
+        messages = []
+        while not events.empty():
+            messages.append(events.get())
+        kinds = [m[0] for m in messages]
+        self.assertTrue(camera.released)
+        self.assertEqual(kinds[0], "ready")
+        self.assertEqual(kinds[-1], "error")
+        self.assertTrue(all(m[1] == 3 for m in messages))
+        gestures = [m[3] for m in messages if m[0] == "gesture"]
+        self.assertEqual(gestures[0], GESTURE_ILY)
+        self.assertLess(kinds.index("gesture"), kinds.index("switch"))
+        switch = messages[kinds.index("switch")]
+        self.assertEqual(switch[3:], (None, "studying"))
+        beats = [m for m in messages if m[0] == "heartbeat"]
+        self.assertTrue(beats)
+        self.assertEqual(beats[-1][4], "studying")
+        self.assertGreater(beats[-1][3]["studying"], 0.0)
+        self.assertGreater(beats[-1][5], 0.0)
+
+    def test_rejects_duplicate_cameras(self):
+        with self.assertRaises(ValueError):
+            CameraSupervisor([0, 0], "unused.task")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from benchmarks.soak import run_soak
+from observer.gestures import outside_of_hand_showing_batch
+from observer.rules import DEFAULT_RULESET
+from observer.synthetic import LandmarkStream
+
+
+def _collect(stream: LandmarkStream, seconds: float):
+    blocks = list(stream.blocks(seconds))
+    return np.concatenate([frames for frames, _ in blocks]), blocks
+
+
+class LandmarkStreamTests(unittest.TestCase):
+    def test_streams_are_seeded_and_continuous(self):
+        frames, blocks = _collect(LandmarkStream(seed=4, max_block=500), 600.0)
+        again, _ = _collect(LandmarkStream(seed=4, max_block=500), 600.0)
+        other, _ = _collect(LandmarkStream(seed=5, max_block=500), 600.0)
+        self.assertEqual(len(frames), 18000)
+        self.assertTrue(np.array_equal(frames, again))
+        self.assertFalse(np.array_equal(frames["landmarks"], other["landmarks"]))
+        self.assertLessEqual(max(len(block) for block, _ in blocks), 500)
+        self.assertTrue(np.allclose(np.diff(frames["t"]), 1.0 / 30.0))
+        segments = list(dict.fromkeys(segment for _, segment in blocks))
+        for previous, segment in zip(segments, segments[1:]):
+            self.assertAlmostEqual(previous.end, segment.start)
+        fast, _ = _collect(LandmarkStream(fps=2000.0, seed=4), 30.0)
+        self.assertEqual(len(fast), 60000)
+        self.assertTrue(np.allclose(np.diff(fast["t"]), 1.0 / 2000.0))
+
+    def test_dropouts_and_handedness_flips_follow_their_rates(self):
+        stream = LandmarkStream(seed=1, dropout_rate=0.05, flip_rate=0.02)
+        _, blocks = _collect(stream, 3600.0)
+        shown = np.concatenate([frames for frames, segment in blocks if segment.present])
+        hands = shown[shown["present"] == 1]
+        self.assertAlmostEqual(1.0 - len(hands) / len(shown), 0.05, delta=0.005)
+        self.assertAlmostEqual(np.mean(hands["handedness"] == 2), 0.02, delta=0.003)
+        away = [frames for frames, segment in blocks if not segment.present]
+        self.assertTrue(away)
+        self.assertFalse(any(frames["present"].any() for frames in away))
+
+    def test_segments_classify_as_generated(self):
+        stream = LandmarkStream(seed=2, dropout_rate=0.0, flip_rate=0.0)
+        settle = int(stream.transition_seconds * stream.fps)
+        checked = 0
+        for frames, segment in stream.blocks(1800.0):
+            if not segment.present or len(frames) <= settle:
+                continue
+            hands = frames["landmarks"][settle:]
+            outside = outside_of_hand_showing_batch(hands, frames["handedness"][settle:])
+            if segment.back:
+                self.assertTrue(outside.all())
+            elif segment.gesture is not None:
+                self.assertFalse(outside.any())
+                detected = DEFAULT_RULESET.detect_batch(hands)
+                self.assertGreater(detected.count(segment.gesture) / len(detected), 0.99)
+                checked += 1
+        self.assertGreater(checked, 20)
+
+
+class SoakTests(unittest.TestCase):
+    def test_multi_day_run_stays_flat_accurate_and_fast(self):
+        # One frame per second keeps two simulated days to a couple of seconds.
+        stream = LandmarkStream(fps=1.0, seed=3, dwell=(30.0, 900.0), start=1.7e9)
+        report = run_soak(stream, 2 * 86400.0, chunk_seconds=7200.0)
+        self.assertEqual(report.frames, 2 * 86400)
+        self.assertGreater(report.switches, 150)
+        self.assertLess(report.memory_growth(), 16 * 1024)
+        self.assertLess(report.timer_error(), 1e-5)
+        self.assertLess(report.expected_error(), 0.5 * report.switches)
+        first, last = report.quarter_fps()
+        self.assertGreater(last, 0.5 * first)
+
+    def test_engine_matches_batch_replay(self):
+        def soak(engine: bool):
+            stream = LandmarkStream(seed=6, start=1.7e9)
+            return run_soak(stream, 120.0, chunk_seconds=20.0, engine=engine, memory=engine)
+
+        replayed, engine = soak(False), soak(True)
+        self.assertEqual(engine.frames, 3600)
+        self.assertEqual(engine.totals, replayed.totals)
+        self.assertEqual(engine.switches, replayed.switches)
+        self.assertLess(engine.memory_growth(), 16 * 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
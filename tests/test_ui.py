@@ -0,0 +1,106 @@
+import unittest
+
+import numpy as np
+
+from observer.activity import ActivityTracker
+from observer.constants import GESTURE_ILY, GESTURE_ONE_FINGER
+from observer.hands import HandRegistry
+from observer.ui import HudRenderer, TextOverlay, draw_gesture_debug, draw_hud
+from test_hands import _hand
+
+
+def _canvas() -> np.ndarray:
+    canvas = np.zeros((480, 640, 3), dtype=np.uint8)
+    canvas[:] = (40, 90, 160)
+    return canvas
+
+
+class _CountingTracker(ActivityTracker):
+    def __init__(self) -> None:
+        super().__init__()
+        self.snapshots = 0
+
+    def snapshot(self, now: float) -> dict[str, float]:
+        self.snapshots += 1
+        return super().snapshot(now)
+
+
+class TextOverlayTests(unittest.TestCase):
+    def test_blended_tile_matches_put_text(self):
+        tracker = ActivityTracker()
+        tracker.apply_gesture(GESTURE_ILY, 0.0)
+        renderer = HudRenderer()
+        for now in (5.2, 5.4, 9.1):
+            expected, actual = _canvas(), _canvas()
+            draw_hud(expected, GESTURE_ILY, True, tracker, now)
+            renderer.draw_hud(actual, GESTURE_ILY, True, tracker, now)
+            diff = np.abs(expected.astype(int) - actual.astype(int))
+            self.assertLessEqual(diff.max(), 2)
+        # The first frame is drawn directly; the tile is built on the second.
+        self.assertGreater(renderer.hud.rasterized, 0)
+
+    def test_only_changed_lines_are_rasterized(self):
+        overlay = TextOverlay(10, 220, 20, 0.5, (255, 220, 120), 1)
+        lines = ["index: UP", "middle: DOWN", "ring: DOWN", "pinky: UP"]
+        overlay.draw(_canvas(), lines)
+        overlay.draw(_canvas(), lines)
+        self.assertEqual(overlay.rasterized, 4)
+        overlay.draw(_canvas(), lines[:3] + ["pinky: DOWN"])
+        self.assertEqual(overlay.rasterized, 5)
+        overlay.draw(_canvas(), lines[:3] + ["pinky: DOWN"])
+        self.assertEqual(overlay.rasterized, 5)
+
+    def test_mostly_changed_block_is_drawn_directly(self):
+        overlay = TextOverlay(10, 220, 20, 0.5, (255, 220, 120), 1)
+        for step in range(3):
+            lines = [f"tip_y={step / 10 + k:.3f}" for k in range(4)]
+            expected, actual = _canvas(), _canvas()
+            overlay.draw(actual, lines)
+        draw_gesture_debug(expected, lines)
+        self.assertEqual(overlay.rasterized, 0)
+        np.testing.assert_array_equal(expected, actual)
+
+    def test_clips_to_frame(self):
+        overlay = TextOverlay(600, 470, 30, 0.8, (0, 255, 0), 2)
+        canvas = _canvas()
+        for _ in range(2):
+            overlay.draw(canvas, ["Studying: 00:00:12", "Youtube : 00:00:03"])
+        self.assertEqual(canvas.shape, (480, 640, 3))
+
+
+class HudRendererTests(unittest.TestCase):
+    def test_hud_lines_are_rebuilt_once_per_second(self):
+        tracker = _CountingTracker()
+        tracker.apply_gesture(GESTURE_ILY, 0.0)
+        renderer = HudRenderer()
+        canvas = _canvas()
+        for step in range(30):
+            renderer.draw_hud(canvas, GESTURE_ILY, True, tracker, 0.5 + step / 30.0)
+        # One rebuild at 0.5s and one when the timer reaches 1s, two snapshots each.
+        self.assertEqual(tracker.snapshots, 4)
+        renderer.draw_hud(canvas, None, True, tracker, 1.5)
+        self.assertEqual(tracker.snapshots, 6)
+
+    def test_multi_hand_hud_is_cached_per_hand(self):
+        registry = HandRegistry(max_hands=2, hold_seconds=0.0)
+        for step in range(10):
+            now = step * 0.1
+            held, _ = registry.update(
+                [_hand(GESTURE_ILY, -0.3, "Left"), _hand(GESTURE_ONE_FINGER, 0.3, "Left")], now
+            )
+            for hand, gesture in held:
+                hand.tracker.apply_gesture(gesture, now)
+        self.assertEqual(registry.active_activity, "studying, youtube")
+        renderer = HudRenderer()
+        canvas = _canvas()
+        rebuilds = 0
+        for step in range(30):
+            lines = renderer._hud_lines
+            renderer.draw_hud(canvas, "#1:ILY", True, registry, 1.05 + step / 30.0)
+            rebuilds += renderer._hud_lines is not lines
+        # Each hand's timer crosses a whole second once in that second.
+        self.assertLessEqual(rebuilds, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()